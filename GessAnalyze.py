@@ -0,0 +1,186 @@
+# Description: This is the gess-analyze command, which runs the engine in GessEngine.py on a position and prints
+# what it found as JSON: the best line, the score, the number of positions searched, the transposition table hit rate
+# and where the time went.
+# A position can be given in the compact format of GessGame.to_compact, or as a list of moves from the start like
+# "j6 g9 i15 i13" (each move is a pair of coordinates, just like the parameters of make_move).
+# With --batch, every line of a file is analyzed by a pool of worker processes and printed as one JSON line.
+# For example: python GessAnalyze.py --depth 3 "j6 g9 i15 i13"
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+
+from GessGame import GessGame, MOVE_ERRORS, load_compact
+from GessEngine import GessEngine
+from GessEndgame import EndgameSolver
+
+
+
+def load_position(text, size=20):
+    '''
+    Returns the game for a position written either in the compact format or as a list of moves from the start.
+    Raises ValueError if a move in the list is invalid, saying which move and why.
+    '''
+
+    text = text.strip()
+    if ':' in text:
+        return load_compact(text)
+
+    game = GessGame(size)
+    squares = text.replace(',', ' ').split()
+    if len(squares) % 2 == 1:
+        raise ValueError("Each move needs a current and a new position.")
+
+    for number in range(0, len(squares), 2):
+        old_position = squares[number]
+        new_position = squares[number + 1]
+        delta = game.apply_move(game.get_row(old_position), game.get_column(old_position),
+                                game.get_row(new_position), game.get_column(new_position))
+        if delta is None:
+            reason = game.get_move_error()
+            raise ValueError("Move " + str(number // 2 + 1) + " (" + old_position + " " + new_position +
+                             ") is invalid: " + reason + " (" + MOVE_ERRORS[reason] + ")")
+
+    return game
+
+
+
+def analyze(text, depth=3, time_limit=None, table_size=1000000, engine=None):
+    '''
+    Loads the position, searches it and returns the report as a dictionary that can be written as JSON.
+    If the position can't be loaded, the report only has the position and the error.
+    '''
+
+    try:
+        game = load_position(text)
+    except ValueError as error:
+        return {"position": text.strip(), "error": str(error)}
+
+    if engine is None:
+        engine = GessEngine(table_size)
+
+    result = engine.search(game, depth, time_limit)
+
+    def written(move):
+        return [game.get_coordinates(move[0], move[1]), game.get_coordinates(move[2], move[3])]
+
+    return {
+        "position": game.to_compact(),
+        "player": game.get_player(),
+        "game_state": game.get_game_state(),
+        "depth": result.depth,
+        "best_move": written(result.best_move) if result.best_move is not None else None,
+        "best_line": [written(move) for move in result.line],
+        "score": result.score,
+        "nodes": result.nodes,
+        "nodes_per_second": round(result.get_nodes_per_second()),
+        "table_probes": result.table_probes,
+        "table_hits": result.table_hits,
+        "table_hit_rate": round(result.get_table_hit_rate(), 4),
+        "time": {
+            "total": round(result.elapsed, 6),
+            "move_generation": round(result.move_generation_time, 6),
+            "evaluation": round(result.evaluation_time, 6),
+            "search": round(result.elapsed - result.move_generation_time - result.evaluation_time, 6),
+        },
+    }
+
+
+
+_worker_settings = {}
+
+
+
+def _start_worker(depth, time_limit, table_size, endgame_table, endgame_stones, canonical=False):
+    '''
+    Saves the settings of the batch in each worker process, so only the positions have to be sent to the workers.
+    The workers share the endgame table on disk, so they only read it.
+    '''
+
+    _worker_settings["depth"] = depth
+    _worker_settings["time_limit"] = time_limit
+    _worker_settings["table_size"] = table_size
+    _worker_settings["canonical"] = canonical
+    _worker_settings["endgame"] = None
+    if endgame_stones:
+        _worker_settings["endgame"] = EndgameSolver(endgame_table, endgame_stones, read_only=True,
+                                                    canonical=canonical)
+
+
+
+def _analyze_in_worker(text):
+    '''
+    Analyzes one line of a batch file inside a worker process. Every position gets a fresh engine, so the results
+    don't depend on which worker got which positions.
+    '''
+
+    engine = GessEngine(_worker_settings["table_size"], _worker_settings["endgame"], _worker_settings["canonical"])
+
+    return analyze(text, _worker_settings["depth"], _worker_settings["time_limit"], engine=engine)
+
+
+
+def read_positions(path):
+    '''
+    Yields the positions of a batch file one at a time, skipping the empty lines and the lines starting with #.
+    '''
+
+    with open(path) as positions:
+        for line in positions:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+
+
+def main(arguments=None):
+    '''
+    Reads the command line, analyzes the position or the batch file, and prints the JSON reports.
+    Returns 0 if everything could be analyzed, otherwise 1.
+    '''
+
+    parser = argparse.ArgumentParser(prog="gess-analyze", description="Analyze Gess positions with the engine.")
+    parser.add_argument("position", nargs="?", help="a compact position or a list of moves from the start")
+    parser.add_argument("--depth", type=int, default=3, help="how many moves to look ahead (default 3)")
+    parser.add_argument("--time", type=float, default=None, help="the time limit per position in seconds")
+    parser.add_argument("--table-size", type=int, default=1000000, help="positions kept in the transposition table")
+    parser.add_argument("--endgame-table", help="the file of solved endgames (read only with --batch)")
+    parser.add_argument("--endgame-stones", type=int, default=0,
+                        help="solve positions with at most this many stones exactly (default 0, never)")
+    parser.add_argument("--canonical", action="store_true",
+                        help="keep only the canonical form of symmetric positions in the tables")
+    parser.add_argument("--batch", help="a file with one position per line, analyzed by a pool of workers")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes for --batch")
+    options = parser.parse_args(arguments)
+
+    if options.batch is None:
+        if options.position is None:
+            parser.error("give a position or --batch")
+        endgame = None
+        if options.endgame_stones:
+            endgame = EndgameSolver(options.endgame_table, options.endgame_stones, canonical=options.canonical)
+        report = analyze(options.position, options.depth, options.time, options.table_size,
+                         GessEngine(options.table_size, endgame, options.canonical))
+        if endgame is not None:
+            endgame.close()
+        print(json.dumps(report, indent=2))
+        return 1 if "error" in report else 0
+
+    failed = False
+    with multiprocessing.Pool(options.workers, _start_worker,
+                              (options.depth, options.time, options.table_size,
+                               options.endgame_table, options.endgame_stones, options.canonical)) as pool:
+        for report in pool.imap(_analyze_in_worker, read_positions(options.batch)):
+            print(json.dumps(report))
+            sys.stdout.flush()
+            if "error" in report:
+                failed = True
+
+    return 1 if failed else 0
+
+
+
+if __name__ == '__main__':
+    sys.exit(main())
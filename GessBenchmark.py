@@ -0,0 +1,96 @@
+# Description: These are the benchmarks of the engine in GessEngine.py, run on a few fixed positions so the numbers
+# can be compared from one change to the next.
+# The move ordering benchmark searches each position to the same depth with and without the move ordering (killer
+# moves, history scores and captures first) and reports how many fewer positions the search needed.
+# For example: python GessBenchmark.py --depth 3
+
+import argparse
+import json
+import sys
+import time
+
+from GessAnalyze import load_position
+from GessEngine import GessEngine
+
+
+
+POSITIONS = (                   # the start, and a few positions a couple of moves in, written as moves from the start
+    "",
+    "j6 g9 i15 i13",
+    "c3 c4 c18 c17 r6 r7",
+    "j6 g9 i15 i13 e9 h12",
+)
+
+
+
+def search_position(text, depth, move_ordering, quiescence_depth=4):
+    '''
+    Searches one position with a fresh engine and returns the SearchResult and the time it took.
+    '''
+
+    game = load_position(text)
+    engine = GessEngine(move_ordering=move_ordering, quiescence_depth=quiescence_depth)
+    started = time.perf_counter()
+    result = engine.search(game, depth)
+
+    return result, time.perf_counter() - started
+
+
+
+def compare_move_ordering(depth=2, positions=POSITIONS, quiescence_depth=4):
+    '''
+    Searches every position to the given depth with and without move ordering, and returns a list with the node
+    counts, the times and the node reduction of each position, and the totals at the end.
+    The quiescence_depth is given to the engine, so 0 compares the fixed-depth search alone.
+    '''
+
+    report = []
+    total_plain = 0
+    total_ordered = 0
+
+    for text in positions:
+        plain, plain_time = search_position(text, depth, False, quiescence_depth)
+        ordered, ordered_time = search_position(text, depth, True, quiescence_depth)
+        total_plain += plain.nodes
+        total_ordered += ordered.nodes
+        report.append({
+            "position": text or "start",
+            "nodes_without_ordering": plain.nodes,
+            "nodes_with_ordering": ordered.nodes,
+            "node_reduction": round(1 - ordered.nodes / plain.nodes, 4),
+            "seconds_without_ordering": round(plain_time, 3),
+            "seconds_with_ordering": round(ordered_time, 3),
+            "same_score": plain.score == ordered.score,
+        })
+
+    report.append({
+        "position": "total",
+        "nodes_without_ordering": total_plain,
+        "nodes_with_ordering": total_ordered,
+        "node_reduction": round(1 - total_ordered / total_plain, 4),
+    })
+
+    return report
+
+
+
+def main(arguments=None):
+    '''
+    Reads the command line, runs the benchmarks and prints the results as JSON lines.
+    '''
+
+    parser = argparse.ArgumentParser(prog="gess-benchmark", description="Benchmark the Gess engine.")
+    parser.add_argument("--depth", type=int, default=2, help="the fixed search depth (default 2)")
+    parser.add_argument("--quiescence-depth", type=int, default=4,
+                        help="captures followed after the fixed depth (default 4, 0 for none)")
+    options = parser.parse_args(arguments)
+
+    for line in compare_move_ordering(options.depth, POSITIONS, options.quiescence_depth):
+        print(json.dumps(line))
+
+    return 0
+
+
+
+if __name__ == '__main__':
+    sys.exit(main())
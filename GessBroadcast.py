@@ -0,0 +1,264 @@
+# Description: This sends the moves of a game to its spectators without sending them the whole board each time.
+# Each move is written once as a small frame with only the blocks it changed (two bytes each, whatever the size of
+# the board), and the same bytes are put in the asyncio queue of every spectator, so a move costs one short encode
+# and one cheap write per spectator.
+# Every keyframe_interval moves, a keyframe with the whole board (the fixed part of GessGame.pack) is sent instead,
+# and a spectator who joins late gets the latest keyframe and the moves after it, so they never need the game itself.
+# Each spectator's queue holds at most queue_size frames more than the ones they were given to catch up. A spectator
+# who falls that far behind is dropped: their queue is emptied and ends with None, so the server never waits on a slow
+# connection and never buffers without end.
+# SpectatorBoard is the spectator side, which turns the frames back into the board.
+# For example: broadcaster = Broadcaster(game); frames = broadcaster.subscribe()
+#              delta = game.apply_move(...)
+#              if delta is not None: broadcaster.publish(delta)     (None means the move was refused)
+#              frame = await frames.get()
+
+import asyncio
+import struct
+
+from GessGame import PACKED_HEADER, STATE_CODES, STATE_NAMES
+
+
+
+DELTA_FRAME = 0                                 # the kinds of frames
+KEYFRAME = 1
+
+FRAME_HEADER = struct.Struct('<BIB')            # the kind of frame, the number of the move and the game state code
+DELTA_CENTERS = struct.Struct('<HH')            # the old and new centers of the move (row * size + column)
+CELL = struct.Struct('<H')                      # a changed block: (row * size + column) * 4 + its new stone
+
+STONE_CODES = {'-': 0, 'B': 1, 'W': 2}
+STONE_NAMES = ('-', 'B', 'W')
+
+
+
+def encode_delta(sequence, delta, state, size):
+    '''
+    Returns the frame of one move from its MoveDelta: the header, the move's centers and each changed block.
+    '''
+
+    frame = bytearray(FRAME_HEADER.pack(DELTA_FRAME, sequence, STATE_CODES[state]))
+    frame += DELTA_CENTERS.pack(delta.old_center[0] * size + delta.old_center[1],
+                                delta.new_center[0] * size + delta.new_center[1])
+    for row, column, before, after in delta.changed:
+        frame += CELL.pack((row * size + column) * 4 + STONE_CODES[after])
+
+    return bytes(frame)
+
+
+
+def encode_keyframe(sequence, game):
+    '''
+    Returns the keyframe of the game: the header and the fixed part of GessGame.pack (the size, the state, the
+    player turn and each row as bitmasks), without the repetition history.
+    '''
+
+    size = game.get_size()
+    length = PACKED_HEADER.size + 2 * size * ((size + 7) // 8)
+
+    return FRAME_HEADER.pack(KEYFRAME, sequence, STATE_CODES[game.get_game_state()]) + game.pack()[:length]
+
+
+
+class Broadcaster:
+    '''
+    This is a class that contains the spectators of one game, each one's queue of frames, and the frames a new
+    spectator needs to catch up. It must be used from the thread of the asyncio event loop the spectators wait in.
+    The methods contained in this class are:
+    an init method
+    subscribe
+    unsubscribe
+    publish
+    send
+    drop
+    close
+    '''
+
+
+
+    def __init__(self, game, keyframe_interval=50, queue_size=64):
+        '''
+        Initializes the broadcaster for the game, which the moves are made on, starting with a keyframe of its
+        current position. Every keyframe_interval moves a keyframe is sent instead of a delta, and each spectator
+        can fall up to queue_size frames behind.
+        '''
+
+        self._game = game
+        self._keyframe_interval = keyframe_interval
+        self._queue_size = queue_size
+
+        self._sequence = 0
+        self._catch_up = [encode_keyframe(0, game)]    # the latest keyframe and every frame after it
+        self._subscribers = set()
+
+        self.frames_sent = 0
+        self.dropped = 0
+
+
+
+    def subscribe(self):
+        '''
+        Adds a spectator and returns their asyncio.Queue of frames, which already holds the latest keyframe and the
+        moves after it, and still has room for queue_size more frames. None in the queue means the spectator was
+        dropped or the game is closed.
+        '''
+
+        frames = asyncio.Queue(self._queue_size + len(self._catch_up))
+        for frame in self._catch_up:
+            frames.put_nowait(frame)
+        self._subscribers.add(frames)
+
+        return frames
+
+
+
+    def unsubscribe(self, frames):
+        '''
+        Removes a spectator, for example when their connection closes.
+        '''
+
+        self._subscribers.discard(frames)
+
+
+
+    def publish(self, delta):
+        '''
+        Sends the move of the MoveDelta, which was just made on the game, to every spectator. The frame is encoded
+        once, as a delta or, every keyframe_interval moves, as a keyframe. Returns the frame.
+        A ValueError is raised for None, which is what apply_move returns for a move that was refused.
+        '''
+
+        if delta is None:
+            raise ValueError("Only a move that was made can be published, and apply_move returned None.")
+
+        self._sequence += 1
+        if self._sequence % self._keyframe_interval == 0:
+            frame = encode_keyframe(self._sequence, self._game)
+            self._catch_up = [frame]
+        else:
+            frame = encode_delta(self._sequence, delta, self._game.get_game_state(), self._game.get_size())
+            self._catch_up.append(frame)
+
+        self.send(frame)
+
+        return frame
+
+
+
+    def send(self, frame):
+        '''
+        Puts the frame in every spectator's queue without waiting, dropping the spectators whose queues are full.
+        '''
+
+        full = []
+        for frames in self._subscribers:
+            try:
+                frames.put_nowait(frame)
+            except asyncio.QueueFull:
+                full.append(frames)
+
+        self.frames_sent += len(self._subscribers) - len(full)
+        for frames in full:
+            self.drop(frames)
+
+
+
+    def drop(self, frames):
+        '''
+        Removes a spectator, throwing away the frames still waiting for them and leaving None in their queue.
+        '''
+
+        self._subscribers.discard(frames)
+        while not frames.empty():
+            frames.get_nowait()
+        frames.put_nowait(None)
+        self.dropped += 1
+
+
+
+    def close(self):
+        '''
+        Ends the broadcast: every spectator gets None after the frames already waiting, or instead of them if their
+        queue is full.
+        '''
+
+        for frames in list(self._subscribers):
+            try:
+                frames.put_nowait(None)
+            except asyncio.QueueFull:
+                self.drop(frames)
+        self._subscribers.clear()
+
+
+
+class SpectatorBoard:
+    '''
+    This is a class that contains the board as a spectator sees it, rebuilt from the frames of a Broadcaster.
+    The methods contained in this class are:
+    an init method
+    apply_frame
+    get_rows
+    '''
+
+
+
+    def __init__(self):
+        '''
+        Initializes a spectator who hasn't had a keyframe yet.
+        '''
+
+        self.board = None               # a list of rows, each a list of 'B', 'W' and '-'
+        self.size = 0
+        self.sequence = None            # the number of the last move applied
+        self.game_state = None
+        self.last_move = None           # the old and new centers of the last move, as (row, column)
+
+
+
+    def apply_frame(self, frame):
+        '''
+        Applies one frame. Returns False if it is a delta that can't be applied, because there was no keyframe yet or
+        a frame is missing; the spectator then waits for the next keyframe.
+        '''
+
+        kind, sequence, state = FRAME_HEADER.unpack_from(frame, 0)
+        offset = FRAME_HEADER.size
+
+        if kind == KEYFRAME:
+            size = frame[offset]
+            row_bytes = (size + 7) // 8
+            offset += PACKED_HEADER.size
+            board = []
+            for i in range(size):
+                black = int.from_bytes(frame[offset:offset + row_bytes], 'little')
+                white = int.from_bytes(frame[offset + row_bytes:offset + 2 * row_bytes], 'little')
+                offset += 2 * row_bytes
+                board.append(['B' if black >> j & 1 else 'W' if white >> j & 1 else '-' for j in range(size)])
+            self.board = board
+            self.size = size
+            self.last_move = None
+
+        else:
+            if self.board is None or sequence != self.sequence + 1:
+                return False
+            size = self.size
+            old_center, new_center = DELTA_CENTERS.unpack_from(frame, offset)
+            self.last_move = (divmod(old_center, size), divmod(new_center, size))
+            for offset in range(offset + DELTA_CENTERS.size, len(frame), CELL.size):
+                cell = CELL.unpack_from(frame, offset)[0]
+                row, column = divmod(cell >> 2, size)
+                self.board[row][column] = STONE_NAMES[cell & 3]
+
+        self.sequence = sequence
+        self.game_state = STATE_NAMES[state]
+
+        return True
+
+
+
+    def get_rows(self):
+        '''
+        Returns the board as a list of strings, one per row.
+        '''
+
+        return [''.join(row) for row in self.board]
@@ -0,0 +1,152 @@
+# Description: This is the time management of the engine in GessEngine.py for games played on a clock, and the
+# cancellation token that lets another thread stop a search.
+# A TimeManager splits the time left on the clock (plus the increment) between the moves still to play, and gives
+# the search a target, after which it doesn't start another depth, and a maximum, after which it stops right away.
+# When the best move changes from one depth to the next, the position is unclear, so the target grows, up to the
+# maximum.
+# A CancelToken is checked by the search (and by the endgame solver) at every position, so cancelling it from a server
+# thread stops the search within about one position, and the search still returns the best move it had found.
+# For example: GessEngine().search(game, 64, clock=TimeManager(remaining=60, increment=1), cancel=token)
+
+import time
+
+
+
+MOVES_TO_GO = 30            # how many more moves a game is expected to last when the clock doesn't say
+INCREMENT_SHARE = 0.8       # the share of the increment spent on each move
+MAXIMUM_SHARE = 0.25        # the most of the time left a single move can use
+MAXIMUM_TARGETS = 4         # and how many times the target that is at most
+INSTABILITY_FACTOR = 1.5    # how much the target grows each time the best move changes
+NEXT_DEPTH_SHARE = 0.5      # another depth isn't started once this share of the target is used, since it would
+                            # likely take longer than all the depths before it
+
+
+
+class SearchTimeout(Exception):
+    '''
+    This is raised inside a search when the time is up or the search is cancelled, so the search can stop right
+    away from any depth. It is caught by the search that was given the deadline or the token.
+    '''
+
+
+
+class CancelToken:
+    '''
+    This is a class that contains whether a search has been cancelled. It is cancelled from any thread, and the
+    search checks it at every position.
+    The methods contained in this class are:
+    an init method
+    cancel
+    reset
+    is_cancelled
+    '''
+
+
+
+    def __init__(self):
+        '''
+        Initializes a token that isn't cancelled.
+        '''
+
+        self.cancelled = False
+
+
+
+    def cancel(self):
+        '''
+        Asks the search using the token to stop as soon as it can.
+        '''
+
+        self.cancelled = True
+
+
+
+    def reset(self):
+        '''
+        Makes the token usable for another search.
+        '''
+
+        self.cancelled = False
+
+
+
+    def is_cancelled(self):
+        '''
+        Returns True if the token has been cancelled.
+        '''
+
+        return self.cancelled
+
+
+
+class TimeManager:
+    '''
+    This is a class that contains the time given to one move and how it changes while the move is searched.
+    The methods contained in this class are:
+    an init method
+    start
+    get_deadline
+    note_depth
+    should_stop
+    '''
+
+
+
+    def __init__(self, remaining, increment=0.0, moves_to_go=None, overhead=0.05):
+        '''
+        Works out the time for the next move from the time left on the clock and the increment added after each
+        move, in seconds. The moves_to_go is how many moves are left until the clock gets more time, if it does.
+        The overhead is kept back from the time left for sending the move.
+        '''
+
+        if moves_to_go is None:
+            moves_to_go = MOVES_TO_GO
+
+        available = max(remaining - overhead, 0.0)
+        self.target = min(available / max(moves_to_go, 1) + increment * INCREMENT_SHARE, available)
+        self.maximum = min(available * MAXIMUM_SHARE + increment * INCREMENT_SHARE, self.target * MAXIMUM_TARGETS,
+                           available)
+        self.maximum = max(self.maximum, self.target)
+
+        self._started = None
+        self._best_move = None
+
+
+
+    def start(self):
+        '''
+        Starts the time of the move. Called by the search.
+        '''
+
+        self._started = time.perf_counter()
+        self._best_move = None
+
+
+
+    def get_deadline(self):
+        '''
+        Returns the perf_counter time at which the search must stop.
+        '''
+
+        return self._started + self.maximum
+
+
+
+    def note_depth(self, best_move):
+        '''
+        Called after each depth the search finishes with its best move. If it is different from the best move of
+        the depth before, the target grows.
+        '''
+
+        if self._best_move is not None and best_move != self._best_move:
+            self.target = min(self.target * INSTABILITY_FACTOR, self.maximum)
+        self._best_move = best_move
+
+
+
+    def should_stop(self):
+        '''
+        Returns True if there isn't enough of the target left to start another depth.
+        '''
+
+        return time.perf_counter() - self._started >= self.target * NEXT_DEPTH_SHARE
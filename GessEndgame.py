@@ -0,0 +1,283 @@
+# Description: This is an exact solver for the end of a game of Gess, when there are only a few stones left.
+# Instead of scoring positions like GessEngine.py does, it searches every move until one of the players takes the
+# last ring of the other (the same win as in GessGame.finish_move), so what it finds is a proven win or loss
+# (or draw, in a game with draw rules).
+# Every position it solves is saved in a table on disk keyed by the compact position, so an endgame that was solved
+# once is answered right away the next time it comes up, even in a different game or a different process.
+# With canonical=True, only the canonical form of each position (GessGame.to_canonical_compact) is saved, so a position
+# and its mirror image or color-swapped twin are solved once.
+# Each solve searches at most node_limit positions, so a position with many moves gives up (UNKNOWN) in a few seconds
+# instead of searching for minutes.
+# For example, EndgameSolver('endgame.db').solve(game) gives (WIN, 3, move) if the player to move wins within 3 moves.
+
+import dbm
+import time
+
+from GessClock import SearchTimeout
+from GessGame import transform_move
+
+
+
+WIN = 'W'                   # the player to move can force a win
+LOSS = 'L'                  # the player to move loses whatever they play
+DRAW = 'D'                  # the best the player to move can do is a draw (only in games with draw rules)
+UNKNOWN = 'U'               # nothing was proven within the number of moves searched
+
+
+
+class BudgetExceeded(Exception):
+    '''
+    This is raised inside the solver when a solve has searched node_limit positions.
+    '''
+
+
+
+class EndgameSolver:
+    '''
+    This is a class that contains the exact endgame search and the table of solved positions.
+    The results are (outcome, distance, move) tuples. The outcome is WIN, LOSS, DRAW or UNKNOWN for the player to
+    move, the distance is the number of moves until the end of the game (or the number of moves searched for
+    UNKNOWN), and the move is the best move as a (old_row, old_column, new_row, new_column) tuple.
+    The methods contained in this class are:
+    an init method
+    close
+    is_endgame
+    get_key
+    lookup
+    store
+    solve
+    prove
+    '''
+
+
+
+    def __init__(self, path=None, stone_limit=24, max_depth=3, read_only=False, canonical=False, node_limit=20000):
+        '''
+        Initializes the solver. If a path is given, the solved positions are also saved in a table on disk at that
+        path and the ones already there are used, otherwise they are only kept in memory.
+        With read_only, the table on disk is only read (if it exists), which is what several processes sharing one
+        table should do, because the table can only have one writer at a time.
+        The solver is used for positions with at most stone_limit stones on the board, and looks at most
+        max_depth moves ahead, searching at most node_limit positions per solve (a few seconds; with 100 or more
+        moves per position even 3 moves deep can take millions).
+        With canonical, the table keys are canonical positions and the saved moves are turned the same way.
+        '''
+
+        self._stone_limit = stone_limit
+        self._max_depth = max_depth
+        self._node_limit = node_limit
+        self._node_budget = None            # the node count at which the solve being run stops
+        self._memory = {}
+        self._solve_memory = None           # the results of the solve being run, for a game with draw rules
+        self._disk = None
+        self._read_only = read_only
+        self._canonical = canonical
+        if path is not None:
+            if not read_only:
+                self._disk = dbm.open(path, 'c')
+            elif dbm.whichdb(path) is not None:
+                self._disk = dbm.open(path, 'r')
+
+        self.nodes = 0
+
+
+
+    def close(self):
+        '''
+        Closes the table on disk, making sure everything solved is written.
+        '''
+
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+
+
+    def is_endgame(self, game):
+        '''
+        Returns True if there are few enough stones left on the board for the solver to be used.
+        '''
+
+        return game.get_stone_count('B') + game.get_stone_count('W') <= self._stone_limit
+
+
+
+    def get_key(self, game):
+        '''
+        Returns (key, symmetry) for the position in the table. The key is the compact position without the player
+        turn counter, because in a game without draw rules the same position has the same result whatever move
+        number it came up at. In a game with draw rules (GessGame.has_draw_rules) the result also depends on the
+        turn counter (max_plies) and on the positions before (repetition_limit), so the key keeps the turn counter;
+        those results are only kept for one solve (see solve), and the positions before are left out of the key,
+        as usual inside one search.
+        The symmetry is 0 unless the solver is canonical, and turns the moves of the position into the moves saved in
+        the table and back.
+        '''
+
+        if self._canonical:
+            compact, symmetry = game.to_canonical_compact()
+        else:
+            compact, symmetry = game.to_compact(), 0
+
+        size, player, turn, rows = compact.split(':')
+
+        if game.has_draw_rules():
+            return compact, symmetry
+
+        return size + ':' + player + ':' + rows, symmetry
+
+
+
+    def lookup(self, key):
+        '''
+        Returns the saved (outcome, distance, move) of the position with the given key, or None if it isn't saved.
+        '''
+
+        if self._solve_memory is not None:
+            return self._solve_memory.get(key)
+
+        entry = self._memory.get(key)
+        if entry is None and self._disk is not None:
+            value = self._disk.get(key)
+            if value is not None:
+                outcome, distance, move = value.decode().split(' ')
+                move = tuple(int(number) for number in move.split(',')) if move != '-' else None
+                entry = (outcome, int(distance), move)
+                self._memory[key] = entry
+
+        return entry
+
+
+
+    def store(self, key, outcome, distance, move):
+        '''
+        Saves the result of a position in memory, and on disk if the solver has a table there.
+        The results that aren't proven are only kept in memory, because a deeper search could still prove them.
+        During the solve of a game with draw rules, the results are only kept until the end of the solve.
+        '''
+
+        if self._solve_memory is not None:
+            self._solve_memory[key] = (outcome, distance, move)
+            return
+
+        self._memory[key] = (outcome, distance, move)
+
+        if self._disk is not None and not self._read_only and outcome != UNKNOWN:
+            written_move = ','.join(str(number) for number in move) if move is not None else '-'
+            self._disk[key] = outcome + ' ' + str(distance) + ' ' + written_move
+
+
+
+    def solve(self, game, max_depth=None, node_limit=None, deadline=None, cancel=None):
+        '''
+        Solves the position of the game, trying 1 move ahead, then 2, and so on up to max_depth moves, so a win is
+        always found in as few moves as possible. Returns (outcome, distance, move). The game is left as it was.
+        If node_limit positions (the solver's node_limit if none is given) are searched first, the result of the
+        last depth finished is returned, which is UNKNOWN.
+        The deadline (a time.perf_counter time) and the cancel (a GessClock.CancelToken) are checked at every
+        position, and SearchTimeout is raised when either says to stop, like in the engine's search.
+        '''
+
+        if max_depth is None:
+            max_depth = self._max_depth
+        if node_limit is None:
+            node_limit = self._node_limit
+
+        result = (UNKNOWN, 0, None)
+        self._node_budget = self.nodes + node_limit
+        if game.has_draw_rules():
+            self._solve_memory = {}
+
+        try:
+            for depth in range(1, max_depth + 1):
+                result = self.prove(game, depth, deadline, cancel)
+                if result[0] != UNKNOWN:
+                    break
+        except BudgetExceeded:
+            pass
+        finally:
+            self._node_budget = None
+            self._solve_memory = None
+
+        return result
+
+
+
+    def prove(self, game, depth, deadline=None, cancel=None):
+        '''
+        This is a recursive method that tries to prove a win or a loss for the player to move within depth moves.
+        The player to move wins if any move leads to a loss for the opponent, loses if every move leads to a win
+        for the opponent, and draws if every move leads to a win or a draw for the opponent, with at least one draw.
+        A game that is over is a loss for the player to move, because the player who just moved took the last ring,
+        unless it ended in a draw.
+        SearchTimeout is raised when the deadline has passed or the cancel token is cancelled.
+        '''
+
+        self.nodes += 1
+        if self._node_budget is not None and self.nodes > self._node_budget:
+            raise BudgetExceeded()
+        if cancel is not None and cancel.cancelled:
+            raise SearchTimeout()
+        if deadline is not None and time.perf_counter() > deadline:
+            raise SearchTimeout()
+
+        state = game.get_game_state()
+        if state != "UNFINISHED":
+            if state == "DRAW":
+                return (DRAW, 0, None)
+            return (LOSS, 0, None)
+
+        key, symmetry = self.get_key(game)
+        size = game.get_size()
+        entry = self.lookup(key)
+        if entry is not None and (entry[0] != UNKNOWN or entry[1] >= depth):
+            if symmetry and entry[2] is not None:
+                return (entry[0], entry[1], transform_move(entry[2], symmetry, size))
+            return entry
+
+        if depth == 0:
+            return (UNKNOWN, 0, None)
+
+        moves = game.generate_moves()
+        if not moves:                               # a player who can't move can't lose a ring either
+            return (UNKNOWN, depth, None)
+
+        all_lost = True
+        all_decided = True                          # every move leads to a win or a draw for the opponent
+        longest_loss = 0
+        best_move = moves[0]
+        draw = None                                 # the (distance, move) of the first move that draws
+
+        for move in moves:
+            delta = game.apply_trusted_move(move[0], move[1], move[2], move[3])
+            try:
+                outcome, distance, reply = self.prove(game, depth - 1, deadline, cancel)
+            finally:
+                game.undo_move(delta)
+
+            if outcome == LOSS:                     # the opponent can't escape, so this move wins
+                self.store(key, WIN, distance + 1, transform_move(move, symmetry, size))
+                return (WIN, distance + 1, move)
+
+            if outcome == WIN:                      # play the move that holds on the longest
+                if distance + 1 > longest_loss:
+                    longest_loss = distance + 1
+                    best_move = move
+            elif outcome == DRAW:
+                all_lost = False
+                if draw is None:
+                    draw = (distance + 1, move)
+            else:
+                all_lost = False
+                all_decided = False
+
+        if all_lost:
+            self.store(key, LOSS, longest_loss, transform_move(best_move, symmetry, size))
+            return (LOSS, longest_loss, best_move)
+
+        if all_decided:
+            self.store(key, DRAW, draw[0], transform_move(draw[1], symmetry, size))
+            return (DRAW, draw[0], draw[1])
+
+        self.store(key, UNKNOWN, depth, None)
+        return (UNKNOWN, depth, None)
@@ -0,0 +1,568 @@
+# Description: This is a game-tree search engine for the game in GessGame.py.
+# It looks ahead with an alpha-beta search over the moves listed by GessGame.generate_move_codes, making and taking
+# back each move with apply_trusted_move and undo_move so the game never has to be copied.
+# Inside the search a move is one 16-bit number (see GessGame.encode_move), and the moves it returns are tuples.
+# The moves of each position are tried in order: the best move saved in the table, then the captures (the most stones
+# first), then the killer moves of the same depth, then the rest by their history score.
+# At the end of the search, the captures are still followed (a quiescence search), so a position isn't scored in the
+# middle of an exchange of stones.
+# Positions that were already searched are remembered in a transposition table keyed by the hash of the position.
+# With canonical=True the table is keyed by GessGame.get_canonical_hash instead, so a position and its mirror image
+# (or the same position with the colors swapped) share one entry.
+# The time of a search can be given as a fixed limit or as a GessClock.TimeManager for games on a clock, and the search
+# can be stopped from another thread with a GessClock.CancelToken; either way it returns the best move found so far.
+# When the engine is given an EndgameSolver from GessEndgame.py, positions with only a few stones left are solved
+# exactly instead of searched.
+# For example, GessEngine().search(game, 3).best_move gives the best move found 3 moves deep.
+
+import time
+
+from GessClock import SearchTimeout
+from GessEndgame import DRAW, WIN, UNKNOWN
+from GessGame import decode_move, transform_move_code
+
+
+
+WIN_SCORE = 100000          # the score of a won game, minus the number of moves it takes to win
+RING_VALUE = 50             # how much an intact ring is worth compared to a single stone
+STONE_VALUE = 1
+
+EXACT = 0                   # the kinds of scores kept in the transposition table
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+DELTA_MARGIN = 2            # a capture is skipped at the end of the search if even this much more than the stones it
+                            # takes and a ring could not bring the score up to alpha
+
+KILLER_SLOTS = 2            # how many quiet moves that caused a cutoff are remembered for each ply
+CAPTURE_ORDER = 1 << 40     # the sort keys of the moves: a capture is always tried before the killers, and the
+KILLER_ORDER = 1 << 30      # killers before the other moves, which go by their history score
+
+
+
+class SearchResult:
+    '''
+    This is a class that contains what a search found and how much work it took.
+    The best move is a (old_row, old_column, new_row, new_column) tuple, or None if there was no valid move, and the
+    line is the list of moves the engine expects to be played from the position.
+    The score is from the point of view of the player to move, so a positive score is good for that player.
+    '''
+
+
+
+    def __init__(self):
+        '''
+        Initializes an empty result. The search fills it in after each depth it finishes.
+        '''
+
+        self.best_move = None
+        self.line = []
+        self.score = 0
+        self.depth = 0
+        self.nodes = 0
+        self.table_probes = 0
+        self.table_hits = 0
+        self.elapsed = 0.0
+        self.move_generation_time = 0.0
+        self.evaluation_time = 0.0
+
+
+
+    def get_table_hit_rate(self):
+        '''
+        Returns the share of transposition table lookups that found the position, from 0 to 1.
+        '''
+
+        if self.table_probes == 0:
+            return 0.0
+
+        return self.table_hits / self.table_probes
+
+
+
+    def get_nodes_per_second(self):
+        '''
+        Returns the number of positions searched per second.
+        '''
+
+        if self.elapsed == 0:
+            return 0.0
+
+        return self.nodes / self.elapsed
+
+
+
+class GessEngine:
+    '''
+    This is a class that contains the search and the evaluation of the engine, and the transposition table it keeps
+    between searches.
+    The methods contained in this class are:
+    an init method
+    clear
+    evaluate
+    adjudicate
+    search
+    get_table_key
+    order_moves
+    remember_cutoff
+    negamax
+    quiescence
+    get_line
+    '''
+
+
+
+    def __init__(self, table_size=1000000, endgame=None, canonical=False, move_ordering=True, quiescence_depth=4):
+        '''
+        Initializes the engine with an empty transposition table that holds up to table_size positions.
+        When the table is full it is emptied and filled up again.
+        The endgame parameter is an optional EndgameSolver used once there are few enough stones left.
+        With canonical, only the canonical form of each position is saved in the table, with its best move turned
+        the same way.
+        Without move_ordering, only the best move saved in the table is moved to the front, and the other moves are
+        tried in the order of generate_move_codes, which is useful to measure what the ordering saves.
+        The quiescence_depth is how many captures in a row are followed after the end of the search (0 for none).
+        '''
+
+        self._table = {}
+        self._table_size = table_size
+        self._endgame = endgame
+        self._canonical = canonical
+        self._move_ordering = move_ordering
+        self._quiescence_depth = quiescence_depth
+
+        self._killers = []                      # the killer moves of each ply, newest first
+        self._history = {'B': {}, 'W': {}}      # the history score of each move (by its number) of each color
+
+        self._nodes = 0
+        self._table_probes = 0
+        self._table_hits = 0
+        self._deadline = None
+        self._cancel = None
+        self._root_move = None                  # the best move (and score) at the root of the depth being searched
+        self._move_generation_time = 0.0
+        self._evaluation_time = 0.0
+
+
+
+    def clear(self):
+        '''
+        Forgets every position in the transposition table, the killer moves and the history scores.
+        '''
+
+        self._table.clear()
+        self._killers = []
+        self._history = {'B': {}, 'W': {}}
+
+
+
+    def evaluate(self, game):
+        '''
+        Returns the score of the position for the player to move, without looking ahead.
+        Each intact ring is worth RING_VALUE and each stone is worth STONE_VALUE, and the opponent's count against it.
+        '''
+
+        player = game.get_player()
+        opponent = 'W' if player == 'B' else 'B'
+
+        return (
+            RING_VALUE * (len(game.get_rings(player)) - len(game.get_rings(opponent))) +
+            STONE_VALUE * (game.get_stone_count(player) - game.get_stone_count(opponent))
+        )
+
+
+
+    def adjudicate(self, game, margin, depth=0):
+        '''
+        Ends the game early if the player to move is at least margin ahead or behind, so games that are already
+        decided don't have to be played to the end. The score comes from evaluate, or from a search depth moves
+        deep if a depth is given. Returns the new game state, or None if the game goes on.
+        '''
+
+        if game.get_game_state() != "UNFINISHED":
+            return None
+
+        if depth > 0:
+            score = self.search(game, depth).score
+        else:
+            score = self.evaluate(game)
+
+        if score == 0 or abs(score) < margin:
+            return None
+
+        if (score > 0) == (game.get_player() == 'B'):
+            return game.adjudicate_game("BLACK_WON")
+
+        return game.adjudicate_game("WHITE_WON")
+
+
+
+    def search(self, game, depth=3, time_limit=None, clock=None, cancel=None):
+        '''
+        Searches the position of the game one depth at a time up to the given depth, and returns a SearchResult.
+        If a time limit in seconds is given and it runs out, the search stops and returns the result of the last
+        depth it finished, or the best move of the unfinished depth if it already found one (the best move of the
+        depth before is searched first, so any move that beat it is better).
+        A clock is a TimeManager from GessClock.py: the search stops at its maximum, doesn't start another depth
+        after its target, and tells it the best move of each depth. A cancel is a CancelToken, and cancelling it
+        stops the search the same way as running out of time. The game is left exactly as it was.
+        '''
+
+        result = SearchResult()
+        start = time.perf_counter()
+
+        self._nodes = 0
+        self._table_probes = 0
+        self._table_hits = 0
+        self._move_generation_time = 0.0
+        self._evaluation_time = 0.0
+        self._deadline = None
+        if time_limit is not None:
+            self._deadline = start + time_limit
+        if clock is not None:
+            clock.start()
+            if self._deadline is None or clock.get_deadline() < self._deadline:
+                self._deadline = clock.get_deadline()
+        self._cancel = cancel
+
+        self._killers = []                      # the killers are only good for the position they were found in
+        for history in self._history.values():  # and the history scores of earlier searches count half as much
+            for move in list(history):
+                history[move] >>= 1
+                if not history[move]:
+                    del history[move]
+
+        if self._endgame is not None and game.get_game_state() == "UNFINISHED" and self._endgame.is_endgame(game):
+            nodes = self._endgame.nodes
+            try:
+                outcome, distance, move = self._endgame.solve(game, deadline=self._deadline, cancel=cancel)
+            except SearchTimeout:               # out of time while solving: the search below gives what it can
+                outcome, distance, move = UNKNOWN, 0, None
+            self._nodes += self._endgame.nodes - nodes
+
+            if outcome != UNKNOWN and move is not None:     # a proven result doesn't need any searching
+                result.best_move = move
+                result.line = [move]
+                result.depth = distance
+                if outcome == DRAW:
+                    result.score = 0
+                else:
+                    result.score = WIN_SCORE - distance if outcome == WIN else -WIN_SCORE + distance
+                depth = 0
+
+        for current_depth in range(1, depth + 1):
+            self._root_move = None
+            try:
+                score = self.negamax(game, current_depth, -WIN_SCORE - 1, WIN_SCORE + 1, 0)
+            except SearchTimeout:
+                if self._root_move is not None:
+                    result.best_move = decode_move(self._root_move[0], game.get_size())
+                    result.score = self._root_move[1]
+                    result.line = [result.best_move]
+                break
+
+            result.score = score
+            result.depth = current_depth
+            result.line = self.get_line(game, current_depth)
+            if result.line:
+                result.best_move = result.line[0]
+
+            if clock is not None:
+                clock.note_depth(result.best_move)
+                if clock.should_stop():
+                    break
+
+        if result.best_move is None and game.get_game_state() == "UNFINISHED":
+            moves = game.generate_moves()       # ran out of time before finishing even one move deep
+            if moves:
+                result.best_move = moves[0]
+                result.line = [moves[0]]
+
+        self._cancel = None
+
+        result.nodes = self._nodes
+        result.table_probes = self._table_probes
+        result.table_hits = self._table_hits
+        result.move_generation_time = self._move_generation_time
+        result.evaluation_time = self._evaluation_time
+        result.elapsed = time.perf_counter() - start
+
+        return result
+
+
+
+    def get_table_key(self, game):
+        '''
+        Returns (key, symmetry) for the position in the transposition table. The symmetry is 0 unless the table only
+        keeps canonical positions, and turns the moves of the position into the moves saved in the table and back.
+        '''
+
+        if self._canonical:
+            return game.get_canonical_hash()
+
+        return game.get_position_hash(), 0
+
+
+
+    def order_moves(self, game, moves, best_move, ply):
+        '''
+        Returns the moves in the order they should be tried: the best move from the table first, then the captures
+        with the most stones taken first, then the killer moves of this ply, then the other moves with the highest
+        history score first.
+        '''
+
+        history = self._history[game.get_player()]
+        killers = self._killers[ply] if ply < len(self._killers) else ()
+        keys = []
+
+        for move, captured in zip(moves, game.get_capture_counts(moves)):
+            if move == best_move:
+                key = CAPTURE_ORDER * 100
+            elif captured:
+                key = CAPTURE_ORDER * captured
+            elif move in killers:
+                key = KILLER_ORDER
+            else:
+                key = history.get(move, 0)
+            keys.append((key, move))
+
+        keys.sort(reverse=True)
+
+        return [move for key, move in keys]
+
+
+
+    def remember_cutoff(self, game, move, depth, ply):
+        '''
+        This method is called when a move was good enough to stop the search of a position (a beta cutoff).
+        Captures are already tried early, so only quiet moves become killer moves of the ply and get a history score,
+        which grows with the square of the depth left because a cutoff high in the tree saves the most.
+        '''
+
+        if game.get_capture_counts((move,))[0]:
+            return
+
+        while len(self._killers) <= ply:
+            self._killers.append([])
+        killers = self._killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[KILLER_SLOTS:]
+
+        history = self._history[game.get_player()]
+        history[move] = history.get(move, 0) + depth * depth
+
+
+
+    def negamax(self, game, depth, alpha, beta, ply):
+        '''
+        This is a recursive method that returns the score of the position for the player to move, looking depth moves
+        ahead. It only needs the exact score when it is between alpha and beta, so it stops trying moves as soon as
+        one of them is good enough that the opponent would never allow it (alpha-beta pruning).
+        The ply is how many moves deep the search already is, which is used to prefer faster wins.
+        Every position searched is saved in the transposition table with its best move, so the next time the same
+        position comes up, either its score is used right away or its best move is tried first.
+        '''
+
+        self._nodes += 1
+        if self._cancel is not None and self._cancel.cancelled:
+            raise SearchTimeout()
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        state = game.get_game_state()
+        if state != "UNFINISHED":
+            if state == "DRAW":                         # a repeated position or the move limit
+                return 0
+            return -WIN_SCORE + ply                     # the player who just moved won the game
+
+        if depth <= 0:
+            if self._quiescence_depth > 0:
+                return self.quiescence(game, alpha, beta, ply, self._quiescence_depth)
+            started = time.perf_counter()
+            score = self.evaluate(game)
+            self._evaluation_time += time.perf_counter() - started
+            return score
+
+        key, symmetry = self.get_table_key(game)
+        entry = self._table.get(key)
+        self._table_probes += 1
+        best_move = None
+
+        if entry is not None:
+            self._table_hits += 1
+            entry_depth, entry_score, entry_kind, best_move = entry
+            if symmetry and best_move is not None:
+                best_move = transform_move_code(best_move, symmetry, game.get_size())
+
+            if entry_score > WIN_SCORE - 1000:          # the wins are saved counting from this position
+                entry_score -= ply
+            elif entry_score < -WIN_SCORE + 1000:
+                entry_score += ply
+
+            if entry_depth >= depth:
+                if entry_kind == EXACT:
+                    return entry_score
+                if entry_kind == LOWER_BOUND and entry_score >= beta:
+                    return entry_score
+                if entry_kind == UPPER_BOUND and entry_score <= alpha:
+                    return entry_score
+
+        started = time.perf_counter()
+        moves = game.generate_move_codes()
+        self._move_generation_time += time.perf_counter() - started
+
+        if not moves:                                   # a player who can't move doesn't lose any more stones
+            return 0
+
+        if self._move_ordering:
+            moves = self.order_moves(game, moves, best_move, ply)
+        elif best_move is not None and best_move in moves:
+            moves.remove(best_move)                     # try the best move from last time first
+            moves.insert(0, best_move)
+
+        original_alpha = alpha
+        best_score = -WIN_SCORE - 1
+
+        size = game.get_size()
+
+        for move in moves:
+            old_row, old_column, new_row, new_column = decode_move(move, size)
+            delta = game.apply_trusted_move(old_row, old_column, new_row, new_column)
+            try:
+                score = -self.negamax(game, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                game.undo_move(delta)
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if ply == 0:
+                    self._root_move = (move, score)
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if self._move_ordering:
+                            self.remember_cutoff(game, move, depth, ply)
+                        break
+
+        if best_score <= original_alpha:
+            kind = UPPER_BOUND
+        elif best_score >= beta:
+            kind = LOWER_BOUND
+        else:
+            kind = EXACT
+
+        saved_score = best_score
+        if saved_score > WIN_SCORE - 1000:
+            saved_score += ply
+        elif saved_score < -WIN_SCORE + 1000:
+            saved_score -= ply
+
+        if len(self._table) >= self._table_size:
+            self._table.clear()
+        if symmetry:
+            best_move = transform_move_code(best_move, symmetry, size)
+        self._table[key] = (depth, saved_score, kind, best_move)
+
+        return best_score
+
+
+
+    def quiescence(self, game, alpha, beta, ply, depth):
+        '''
+        This is a recursive method that scores a position at the end of the search by only following the moves that
+        capture stones or could break a ring (GessGame.generate_capture_codes), up to depth captures in a row.
+        The player to move doesn't have to capture, so the score without any capture (standing pat) is the least
+        the position is worth, and if it is already at least beta the opponent would never allow it.
+        A capture is skipped if even the stones it takes, a ring and DELTA_MARGIN could not bring the score up to
+        alpha (delta pruning), unless the opponent has only one ring left and the capture lands on it, because
+        breaking it wins the game. Those captures are tried first.
+        '''
+
+        self._nodes += 1
+        if self._cancel is not None and self._cancel.cancelled:
+            raise SearchTimeout()
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        state = game.get_game_state()
+        if state != "UNFINISHED":
+            if state == "DRAW":
+                return 0
+            return -WIN_SCORE + ply
+
+        started = time.perf_counter()
+        standing = self.evaluate(game)
+        self._evaluation_time += time.perf_counter() - started
+
+        if standing >= beta or depth <= 0:
+            return standing
+        if standing > alpha:
+            alpha = standing
+
+        started = time.perf_counter()
+        moves = game.generate_capture_codes()
+        captures = game.get_capture_counts(moves)
+        self._move_generation_time += time.perf_counter() - started
+
+        size = game.get_size()
+        opponent_rings = game.get_rings('W' if game.get_player() == 'B' else 'B')
+        last_ring = next(iter(opponent_rings)) if len(opponent_rings) == 1 else None
+
+        ordered = []
+        for captured, move in zip(captures, moves):
+            old_row, old_column, new_row, new_column = decode_move(move, size)
+            could_win = (last_ring is not None and abs(new_row - last_ring[0]) <= 2 and     # the footprint covers
+                         abs(new_column - last_ring[1]) <= 2)                               # part of the last ring
+            ordered.append((could_win, captured, old_row, old_column, new_row, new_column))
+
+        for could_win, captured, old_row, old_column, new_row, new_column in sorted(ordered, reverse=True):
+            if not could_win and standing + captured * STONE_VALUE + RING_VALUE + DELTA_MARGIN <= alpha:
+                break                                   # the rest take even fewer stones and can't win
+
+            delta = game.apply_trusted_move(old_row, old_column, new_row, new_column)
+            try:
+                score = -self.quiescence(game, -beta, -alpha, ply + 1, depth - 1)
+            finally:
+                game.undo_move(delta)
+
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+
+        return alpha
+
+
+
+    def get_line(self, game, depth):
+        '''
+        Returns the list of best moves from the position by following the best moves saved in the transposition
+        table, up to depth moves. The moves are made on the game to follow the line and then taken back. Each move is
+        checked against the moves of its center first, so a refused move never changes the game's get_move_error.
+        '''
+
+        line = []
+        deltas = []
+        seen = set()
+
+        while len(line) < depth and game.get_game_state() == "UNFINISHED":
+            key, symmetry = self.get_table_key(game)
+            entry = self._table.get(key)
+            if entry is None or entry[3] is None or key in seen:
+                break
+            seen.add(key)
+
+            code = transform_move_code(entry[3], symmetry, game.get_size())
+            move = decode_move(code, game.get_size())
+            if code not in (game.find_center_moves(move[0], move[1], True) or ()):
+                break                                   # a different position with the same hash
+            delta = game.apply_trusted_move(move[0], move[1], move[2], move[3])
+            deltas.append(delta)
+            line.append(move)
+
+        for delta in reversed(deltas):
+            game.undo_move(delta)
+
+        return line
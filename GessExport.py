@@ -0,0 +1,416 @@
+# Description: This writes positions from games as training data for evaluation models, and reads it back in batches.
+# Each position is a fixed stack of uint8 planes of the size of the board (see PLANES), seen from the player to move,
+# and the planes are written into shards of .npy files opened as memory maps, so a loader can read any batch straight
+# from disk. Next to each shard is a table with the game, the move number, the move that was played (a number from
+# GessGame.encode_move) and how the game ended for the player to move.
+# All the planes are worked out from the stones alone with whole-batch numpy operations (see planes_from_stones), so
+# the loader can also turn packed games (GessGame.pack) into batches without a Python loop per position.
+# numpy is only needed here, not to play the game.
+# For example: exporter = TrainingExporter('data'); exporter.add_game(moves); exporter.close()
+#              planes, table = TrainingData('data').get_batch(range(256))
+
+import json
+import os
+
+try:
+    import numpy
+except ImportError:             # the rest of the game doesn't need numpy, so only this module asks for it
+    numpy = None
+
+from GessGame import GessGame, MIRROR, COLOR_FLIP, PACKED_HEADER, encode_move, transform_move_code
+
+
+
+PLANES = (                      # the planes of each position, in order, all seen from the player to move
+    "own_stones",
+    "opponent_stones",
+    "own_rings",                # the centers of the intact rings
+    "opponent_rings",
+    "movable_centers",          # the centers of the player's footprints that have at least one valid move
+    "white_to_move",            # all ones when white is to move, so the colors can still be told apart
+)
+
+TABLE_COLUMNS = ("game", "move_number", "move", "result")   # the result is 1 for a win of the player to move, -1 for
+                                                            # a loss and 0 for a draw or a game that wasn't finished
+
+
+
+def require_numpy():
+    '''
+    Raises ImportError if numpy isn't installed.
+    '''
+
+    if numpy is None:
+        raise ImportError("The training data export needs numpy.")
+
+
+
+def window_sum(planes, radius):
+    '''
+    Returns, for every inner block of a batch of (count, size, size) planes, the sum of the planes over the square of
+    the given radius around it (radius 1 for a footprint). The result has the shape (count, size - 2, size - 2), and
+    the squares are cut off at the edges of the board.
+    '''
+
+    size = planes.shape[-1]
+    padded = numpy.zeros((planes.shape[0], size + 2 * radius, size + 2 * radius), numpy.int16)
+    padded[:, radius:radius + size, radius:radius + size] = planes
+    total = numpy.zeros((planes.shape[0], size - 2, size - 2), numpy.int16)
+
+    for row_offset in range(-radius, radius + 1):
+        for column_offset in range(-radius, radius + 1):
+            total += padded[:, radius + 1 + row_offset:radius + size - 1 + row_offset,
+                            radius + 1 + column_offset:radius + size - 1 + column_offset]
+
+    return total
+
+
+
+def planes_from_stones(black, white, white_to_move):
+    '''
+    Turns a batch of positions into planes. The black and white arrays are (count, size, size) with 1 where the
+    player has a stone, and white_to_move is 1 for the positions where it's white player's turn.
+    Returns a uint8 array of (count, len(PLANES), size, size).
+    A footprint has a valid move exactly when it has no opponent's stones, has a stone pointing somewhere (one step
+    that way is always valid) and isn't stopped by the last ring rule, so the movable centers are worked out from
+    window sums, the same way for every position in the batch.
+    '''
+
+    require_numpy()
+
+    count, size = black.shape[0], black.shape[-1]
+    turn = numpy.asarray(white_to_move, bool).reshape(count, 1, 1)
+    own = numpy.where(turn, white, black).astype(numpy.int16)
+    opponent = numpy.where(turn, black, white).astype(numpy.int16)
+
+    planes = numpy.zeros((count, len(PLANES), size, size), numpy.uint8)
+    planes[:, 0] = own
+    planes[:, 1] = opponent
+
+    empty_center = (own[:, 1:-1, 1:-1] == 0) & (opponent[:, 1:-1, 1:-1] == 0)
+    own_around = window_sum(own, 1) - own[:, 1:-1, 1:-1]
+    own_rings = empty_center & (own_around == 8)
+    opponent_rings = empty_center & (window_sum(opponent, 1) == 8)
+    planes[:, 2, 1:-1, 1:-1] = own_rings
+    planes[:, 3, 1:-1, 1:-1] = opponent_rings
+
+    ring_plane = numpy.zeros((count, size, size), numpy.int16)
+    ring_plane[:, 1:-1, 1:-1] = own_rings
+    far_rings = own_rings.sum(axis=(1, 2)).reshape(count, 1, 1) - window_sum(ring_plane, 2)
+    movable = (window_sum(opponent, 1) == 0) & (own_around > 0) & (own_rings | (far_rings > 0))
+    planes[:, 4, 1:-1, 1:-1] = movable
+
+    planes[:, 5] = turn
+
+    return planes
+
+
+
+def transform_stones(black, white, white_to_move, symmetries):
+    '''
+    Turns each position of a batch by its symmetry (see GessGame.SYMMETRIES), all at once.
+    Returns the new black, white and white_to_move arrays.
+    '''
+
+    symmetries = numpy.asarray(symmetries).reshape(-1, 1, 1)
+    mirror = (symmetries & MIRROR) != 0
+    flip = (symmetries & COLOR_FLIP) != 0
+
+    black = numpy.where(mirror, black[:, :, ::-1], black)
+    white = numpy.where(mirror, white[:, :, ::-1], white)
+    black, white = numpy.where(flip, white[:, ::-1, :], black), numpy.where(flip, black[:, ::-1, :], white)
+    white_to_move = numpy.where(flip.reshape(-1), 1 - numpy.asarray(white_to_move), white_to_move)
+
+    return black, white, white_to_move
+
+
+
+def stones_from_masks(masks, size):
+    '''
+    Turns an array of row bitmasks of (count, size) into an array of (count, size, size) with 1 for each stone.
+    '''
+
+    masks = numpy.asarray(masks, numpy.int64).reshape(-1, size, 1)
+
+    return ((masks >> numpy.arange(size)) & 1).astype(numpy.uint8)
+
+
+
+def decode_packed(games):
+    '''
+    Turns a list of games packed with GessGame.pack (all on the same size of board) straight into a batch of planes,
+    without making a GessGame for any of them. Only the fixed part of each packed game is read, all at once.
+    Returns the planes and the array of each game's state code.
+    '''
+
+    require_numpy()
+
+    size = games[0][0]
+    row_bytes = (size + 7) // 8
+    length = PACKED_HEADER.size + 2 * size * row_bytes
+
+    data = numpy.frombuffer(b''.join(packed[:length] for packed in games), numpy.uint8).reshape(len(games), length)
+    states = data[:, 1]
+    turns = data[:, 2:6].copy().view('<u4').reshape(-1)
+
+    rows = data[:, PACKED_HEADER.size:].reshape(len(games), size, 2, row_bytes)
+    stones = numpy.unpackbits(rows, axis=-1, bitorder='little')[..., :size]
+
+    return planes_from_stones(stones[:, :, 0], stones[:, :, 1], turns % 2), states
+
+
+
+class TrainingExporter:
+    '''
+    This is a class that contains the shards being written and the positions waiting to be written to them.
+    The methods contained in this class are:
+    an init method
+    add_game
+    add_position
+    flush
+    close
+    '''
+
+
+
+    def __init__(self, directory, size=20, shard_size=65536, buffer_size=4096, canonical=False):
+        '''
+        Starts writing training data into the directory, for games on a board of the given size.
+        Each shard holds shard_size positions, and positions are written buffer_size at a time.
+        With canonical, each position is written in its canonical form (GessGame.get_canonical_hash), with the
+        played move turned the same way, so symmetric positions look the same to the model.
+        '''
+
+        require_numpy()
+
+        self._directory = directory
+        self._size = size
+        self._shard_size = shard_size
+        self._buffer_size = buffer_size
+        self._canonical = canonical
+        os.makedirs(directory, exist_ok=True)
+
+        self._shards = []                   # [planes file, table file, positions written] for each shard
+        self._planes = None                 # the memory maps of the shard being written
+        self._table = None
+        self._waiting = []                  # (black masks, white masks, white to move, symmetry, table row)
+        self._games = 0
+
+
+
+    def add_game(self, moves, result=None, game_number=None):
+        '''
+        Replays a game from the start with apply_trusted_move and adds every position before each move, with the
+        move that was played. The moves are (old_row, old_column, new_row, new_column) tuples that are known to be
+        valid, like the ones from GessImport.read_store. The result is the final game state ("BLACK_WON",
+        "WHITE_WON", "DRAW" or "UNFINISHED"), taken from the replay if it isn't given.
+        Returns the number of positions added.
+        '''
+
+        if game_number is None:
+            game_number = self._games
+        self._games += 1
+
+        game = GessGame(self._size)
+        positions = []
+        for move in moves:
+            positions.append((game.get_row_masks('B'), game.get_row_masks('W'), game.get_player() == 'W',
+                              game.get_canonical_hash()[1] if self._canonical else 0,
+                              encode_move(move[0], move[1], move[2], move[3], self._size)))
+            game.apply_trusted_move(move[0], move[1], move[2], move[3])
+
+        if result is None:
+            result = game.get_game_state()
+
+        for number, (black, white, white_to_move, symmetry, move) in enumerate(positions, 1):
+            if result == "BLACK_WON":
+                outcome = -1 if white_to_move else 1
+            elif result == "WHITE_WON":
+                outcome = 1 if white_to_move else -1
+            else:
+                outcome = 0
+            self.add_position(black, white, white_to_move, symmetry,
+                              (game_number, number, transform_move_code(move, symmetry, self._size), outcome))
+
+        return len(positions)
+
+
+
+    def add_position(self, black, white, white_to_move, symmetry, row):
+        '''
+        Adds one position, given as the row bitmasks of each player (GessGame.get_row_masks), whose turn it is, the
+        symmetry to write it in and its row of the table (see TABLE_COLUMNS).
+        '''
+
+        self._waiting.append((black, white, white_to_move, symmetry, row))
+        if len(self._waiting) >= self._buffer_size:
+            self.flush()
+
+
+
+    def flush(self):
+        '''
+        Works out the planes of the waiting positions all at once and writes them to the shards, starting a new
+        shard whenever one is full.
+        '''
+
+        if not self._waiting:
+            return
+
+        size = self._size
+        waiting = self._waiting
+        self._waiting = []
+
+        black = stones_from_masks([position[0] for position in waiting], size)
+        white = stones_from_masks([position[1] for position in waiting], size)
+        white_to_move = numpy.array([position[2] for position in waiting], numpy.uint8)
+        black, white, white_to_move = transform_stones(black, white, white_to_move,
+                                                       [position[3] for position in waiting])
+        planes = planes_from_stones(black, white, white_to_move)
+        table = numpy.array([position[4] for position in waiting], numpy.int32)
+
+        written = 0
+        while written < len(waiting):
+            if self._planes is None or self._shards[-1][2] == self._shard_size:
+                self.start_shard()
+            shard = self._shards[-1]
+            count = min(self._shard_size - shard[2], len(waiting) - written)
+            self._planes[shard[2]:shard[2] + count] = planes[written:written + count]
+            self._table[shard[2]:shard[2] + count] = table[written:written + count]
+            shard[2] += count
+            written += count
+
+
+
+    def start_shard(self):
+        '''
+        Closes the shard being written (if any) and opens the next one as memory maps.
+        '''
+
+        self.close_shard()
+
+        number = len(self._shards) + 1
+        planes_file = 'shard-%06d-planes.npy' % number
+        table_file = 'shard-%06d-table.npy' % number
+        self._planes = numpy.lib.format.open_memmap(
+            os.path.join(self._directory, planes_file), 'w+', numpy.uint8,
+            (self._shard_size, len(PLANES), self._size, self._size))
+        self._table = numpy.lib.format.open_memmap(
+            os.path.join(self._directory, table_file), 'w+', numpy.int32, (self._shard_size, len(TABLE_COLUMNS)))
+        self._shards.append([planes_file, table_file, 0])
+
+
+
+    def close_shard(self):
+        '''
+        Writes the shard being written to disk.
+        '''
+
+        if self._planes is not None:
+            self._planes.flush()
+            self._table.flush()
+            self._planes = None
+            self._table = None
+
+
+
+    def close(self):
+        '''
+        Writes everything still waiting, closes the last shard and writes the index of the shards (index.json),
+        which says how many positions of each shard are used.
+        '''
+
+        self.flush()
+        self.close_shard()
+
+        index = {
+            "size": self._size,
+            "planes": list(PLANES),
+            "table_columns": list(TABLE_COLUMNS),
+            "canonical": self._canonical,
+            "shards": [{"planes": planes, "table": table, "positions": count} for planes, table, count in self._shards],
+        }
+        with open(os.path.join(self._directory, 'index.json'), 'w') as written:
+            json.dump(index, written, indent=2)
+
+
+
+class TrainingData:
+    '''
+    This is a class that contains the shards of a training data directory opened as read-only memory maps, and reads
+    batches of positions from them.
+    The methods contained in this class are:
+    an init method
+    get_count
+    get_batch
+    batches
+    '''
+
+
+
+    def __init__(self, directory):
+        '''
+        Opens every shard listed in the index of the directory.
+        '''
+
+        require_numpy()
+
+        with open(os.path.join(directory, 'index.json')) as index_file:
+            self.index = json.load(index_file)
+
+        self._planes = []
+        self._tables = []
+        counts = []
+        for shard in self.index["shards"]:
+            self._planes.append(numpy.load(os.path.join(directory, shard["planes"]), mmap_mode='r'))
+            self._tables.append(numpy.load(os.path.join(directory, shard["table"]), mmap_mode='r'))
+            counts.append(shard["positions"])
+
+        self._starts = numpy.concatenate(([0], numpy.cumsum(counts)))    # where each shard starts in the whole
+
+
+
+    def get_count(self):
+        '''
+        Returns the number of positions in all the shards.
+        '''
+
+        return int(self._starts[-1])
+
+
+
+    def get_batch(self, positions):
+        '''
+        Returns (planes, table) for the positions with the given numbers, counting across all the shards.
+        The positions are read with one fancy index per shard, not one at a time.
+        '''
+
+        positions = numpy.asarray(positions, numpy.int64)
+        shards = numpy.searchsorted(self._starts, positions, side='right') - 1
+
+        size = self.index["size"]
+        planes = numpy.empty((len(positions), len(PLANES), size, size), numpy.uint8)
+        table = numpy.empty((len(positions), len(TABLE_COLUMNS)), numpy.int32)
+
+        for shard in numpy.unique(shards):
+            chosen = shards == shard
+            offsets = positions[chosen] - self._starts[shard]
+            planes[chosen] = self._planes[shard][offsets]
+            table[chosen] = self._tables[shard][offsets]
+
+        return planes, table
+
+
+
+    def batches(self, batch_size, shuffle=False, seed=None):
+        '''
+        Yields (planes, table) batches of batch_size positions (the last one can be smaller) covering every position
+        once, in order or shuffled with the given seed.
+        '''
+
+        order = numpy.arange(self.get_count())
+        if shuffle:
+            numpy.random.default_rng(seed).shuffle(order)
+
+        for start in range(0, len(order), batch_size):
+            yield self.get_batch(order[start:start + batch_size])
@@ -10,6 +10,500 @@
 # and contains all the private data members of the board.
 # For a sample game play, uncomment the print statements at the bottom of the code.
 
+import random
+import struct
+from array import array
+
+
+
+COLUMN_LETTERS = 'abcdefghijklmnopqrstuvwxyz'       # the columns are named with letters, so 26 is the largest board
+MIN_BOARD_SIZE = 10                                 # the smallest board that still fits both sides' stones
+
+STANDARD_LAYOUT = (                                 # the usual starting position of the 20x20 board
+    '--------------------',
+    '--W-W-WWWWWWWW-W-W--',
+    '-WWW-W-WWWW-W-W-WWW-',
+    '--W-W-WWWWWWWW-W-W--',
+    '--------------------',
+    '--------------------',
+    '--W--W--W--W--W--W--',
+    '--------------------',
+    '--------------------',
+    '--------------------',
+    '--------------------',
+    '--------------------',
+    '--------------------',
+    '--B--B--B--B--B--B--',
+    '--------------------',
+    '--------------------',
+    '--B-B-BBBBBBBB-B-B--',
+    '-BBB-B-BBBB-B-B-BBB-',
+    '--B-B-BBBBBBBB-B-B--',
+    '--------------------',
+)
+
+DIRECTIONS = (                                      # the name of each direction and its (row, column) step
+    ("north", -1, 0),
+    ("south", 1, 0),
+    ("east", 0, 1),
+    ("west", 0, -1),
+    ("north_east", -1, 1),
+    ("north_west", -1, -1),
+    ("south_east", 1, 1),
+    ("south_west", 1, -1),
+)
+
+DIRECTION_NUMBERS = dict(                            # the number of each direction in DIRECTIONS, by its step
+    ((row_step, column_step), number) for number, (name, row_step, column_step) in enumerate(DIRECTIONS)
+)
+
+FOOTPRINT = (                                       # the (row, column) offsets of a 3x3 footprint from its center
+    (0, 0), (-1, 0), (1, 0), (0, 1), (0, -1), (-1, 1), (-1, -1), (1, 1), (1, -1)
+)
+
+MIRROR = 1                                          # the symmetries of the game are numbered by two bits: MIRROR swaps
+COLOR_FLIP = 2                                      # left and right, COLOR_FLIP turns the board upside down and swaps
+SYMMETRIES = (0, MIRROR, COLOR_FLIP, MIRROR | COLOR_FLIP)   # the colors (and the player to move). Doing the same
+                                                    # symmetry twice gives back the same position.
+
+DIRECTION_SYMMETRIES = (                            # what each direction becomes under each symmetry
+    dict((name, name) for name, row_step, column_step in DIRECTIONS),
+    dict((name, name.replace('east', '?').replace('west', 'east').replace('?', 'west'))
+         for name, row_step, column_step in DIRECTIONS),
+    dict((name, name.replace('north', '?').replace('south', 'north').replace('?', 'south'))
+         for name, row_step, column_step in DIRECTIONS),
+    dict((name, name.replace('east', '?').replace('west', 'east').replace('?', 'west')
+          .replace('north', '?').replace('south', 'north').replace('?', 'south'))
+         for name, row_step, column_step in DIRECTIONS),
+)
+
+SWAPPED_STONES = {'B': 'W', 'W': 'B', '-': '-'}
+
+STONE_COUNTS = (0, 1, 1, 2, 1, 2, 2, 3)             # the number of stones in 3 blocks of a row bitmask
+
+RINGS = "rings"                                     # stands for the player's rings among the blocks a center's moves
+                                                    # depend on (see GessGame.get_legal_moves)
+
+STATE_CODES = {"UNFINISHED": 0, "BLACK_WON": 1, "WHITE_WON": 2, "DRAW": 3}     # the game states as small numbers,
+STATE_NAMES = {code: state for state, code in STATE_CODES.items()}             # for packed games and stores
+
+PACKED_HEADER = struct.Struct('<BBIHII')    # size, state code, player turn, repetition limit, max plies and the
+PACKED_HISTORY = struct.Struct('<QH')       # number of history entries, then the rows, then each (hash, count)
+
+CENTER_BIT = 1 << 4                                 # a footprint's stones of one color make a 9-bit pattern, the
+RING_PATTERN = 0b111101111                          # bits go row by row from the north-west block, so the center is
+                                                    # bit 4 and a ring is every bit but the center
+
+
+
+def build_patterns():
+    '''
+    Returns the table of what a footprint can do for each of the 512 patterns of one player's stones in it.
+    Each entry is a tuple of:
+    the directions the footprint can go to, as a bitmask with bit k set for DIRECTIONS[k],
+    True if it has a center stone,
+    the furthest it can go (3 without a center stone, otherwise as far as the board goes),
+    and True if the pattern is a ring.
+    '''
+
+    patterns = []
+    for pattern in range(512):
+        allowed = 0
+        for number, (direction, row_step, column_step) in enumerate(DIRECTIONS):
+            if pattern & (1 << ((row_step + 1) * 3 + column_step + 1)):     # the stone pointing to the direction
+                allowed |= 1 << number
+        has_center = bool(pattern & CENTER_BIT)
+        patterns.append((allowed, has_center, len(COLUMN_LETTERS) if has_center else 3, pattern == RING_PATTERN))
+
+    return tuple(patterns)
+
+
+
+PATTERNS = build_patterns()
+
+MOVE_ERRORS = {                                     # the reason codes of invalid moves and the message of each one
+    "GAME_OVER": "Game was over",
+    "OUT_OF_BOUNDS": "Center can't be out of bounds. Try again!",
+    "OPPONENT_STONE": "Your 3x3 footprint contains an opponent's stone. Try again!",
+    "WRONG_DIRECTION": "Check your stones for directions and try again!",
+    "CANNOT_CAPTURE": "Can't catch further.",
+    "OUT_OF_RANGE": "Out of range. Try again!",
+    "OBSTACLE": "Obstacle ahead, can't get through.",
+    "LAST_RING": "Cannot execute move. You'll lose your last ring!",
+}
+
+
+
+def default_layout(size):
+    '''
+    Returns the starting layout for a board of the given size as a list of strings.
+    Each side keeps its own rows from the standard 20x20 layout, so a smaller board loses the empty middle rows and a
+    bigger board gets more empty rows in the middle. The columns of the standard layout are centered on the board,
+    so a smaller board loses some columns on both sides (but keeps both rings) and a bigger board gets empty columns
+    on both sides.
+    On a board with an odd size the middle row is left empty, so each side still gets the same stones, and turning
+    the board upside down while swapping the colors (COLOR_FLIP) gives back the same layout.
+    '''
+
+    column_offset = (20 - size) // 2
+
+    def standard_row(index):
+        mirrored = size - 1 - index
+        if index < mirrored:                    # the top half copies the top of the standard layout,
+            return min(index, 9)
+        if index > mirrored:                    # and the bottom half copies the bottom.
+            return 19 - min(mirrored, 9)
+        return None                             # the middle row of an odd board
+
+    layout = []
+    for i in range(size):
+        row_index = standard_row(i)
+        if row_index is None:
+            layout.append('-' * size)
+            continue
+        row = STANDARD_LAYOUT[row_index]
+        layout.append(''.join(
+            row[j + column_offset] if 0 <= j + column_offset < 20 else '-' for j in range(size)
+        ))
+
+    return layout
+
+
+
+class BoardGeometry:
+    '''
+    This is a class that contains the tables that only depend on the size of the board, so they are built only once
+    for each size and shared by every game played on that size (see get_geometry).
+    The tables are:
+    the inner range of rows and columns that can be used as centers,
+    the cells of the off-bound edges,
+    the cells of the footprint around each center,
+    the cells of each footprint that fall on the off-bound edges,
+    the centers that can hold a ring, and the ones close enough to each center to overlap its footprint,
+    the rays that a footprint sweeps when moving from a center in a direction,
+    the number of each move in the 16-bit encoding of encode_move, for every step of the rays,
+    the blocks of each footprint as a bitmask of the whole board (bit row * size + column), for the attack maps,
+    the centers whose footprint covers each block,
+    and the random keys used for hashing positions, also as seen through each of the SYMMETRIES.
+    '''
+
+
+
+    def __init__(self, size):
+        '''
+        Builds all the tables for a board of the given size.
+        The rays are stored for every center and direction as a tuple of steps. Each step is the new center
+        reached at that distance, with the blocks that have to be empty on the way for the footprint to get there.
+        For one step nothing has to be empty, because one step can capture any stones. For the next steps, the blocks
+        of the footprint at the previous step that were not swept yet have to be empty.
+        '''
+
+        if size < MIN_BOARD_SIZE or size > len(COLUMN_LETTERS):
+            raise ValueError("The size of the board must be between " + str(MIN_BOARD_SIZE) + " and " +
+                             str(len(COLUMN_LETTERS)) + ".")
+
+        self.size = size
+        self.last = size - 1                            # the index of the bottom row and the right column
+        self.columns = COLUMN_LETTERS[:size]
+        self.inner = range(1, size - 1)                 # the rows and columns a center can be placed at
+
+        self.edge_cells = tuple(
+            (i, j) for i in range(size) for j in range(size) if i in (0, self.last) or j in (0, self.last)
+        )
+
+        self.footprints = {}                            # the blocks of each footprint, in the order of FOOTPRINT
+        for i in self.inner:
+            for j in self.inner:
+                self.footprints[(i, j)] = tuple((i + x, j + y) for x, y in FOOTPRINT)
+
+        self.edge_footprints = {}                       # only the centers next to an edge have any edge blocks
+        for i in self.inner:
+            for j in self.inner:
+                cells = tuple(
+                    (i + x, j + y) for x, y in FOOTPRINT if i + x in (0, self.last) or j + y in (0, self.last)
+                )
+                if cells:
+                    self.edge_footprints[(i, j)] = cells
+
+        self.ring_centers = tuple((i, j) for i in self.inner for j in self.inner)
+
+        self.ring_neighbors = {}                        # the rings that a footprint at each center can touch
+        for i, j in self.ring_centers:
+            self.ring_neighbors[(i, j)] = tuple(
+                (x, y) for x, y in self.ring_centers if abs(x - i) <= 2 and abs(y - j) <= 2
+            )
+
+        self.rays = {}
+        for i in self.inner:
+            for j in self.inner:
+                for direction, row_step, column_step in DIRECTIONS:
+                    swept = set((i + x, j + y) for x, y in FOOTPRINT)      # the lifted footprint is always empty
+                    steps = []
+                    distance = 1
+                    while (i + row_step * distance) in self.inner and (j + column_step * distance) in self.inner:
+                        cells = ()
+                        if distance > 1:
+                            previous_row = i + row_step * (distance - 1)
+                            previous_column = j + column_step * (distance - 1)
+                            cells = tuple(
+                                (previous_row + x, previous_column + y) for x, y in FOOTPRINT
+                                if (previous_row + x, previous_column + y) not in swept
+                            )
+                            swept.update(cells)
+                        steps.append((i + row_step * distance, j + column_step * distance, cells))
+                        distance += 1
+                    self.rays[(i, j, direction)] = tuple(steps)
+
+        self.move_typecode = 'H'                        # move numbers fit in 16 bits on boards up to 22x22
+        if encode_move(size - 2, size - 2, size - 2, 1, size) > 0xffff:
+            self.move_typecode = 'I'
+
+        self.ray_codes = {}                             # the move number of each step of each ray
+        for i, j, direction in self.rays:
+            self.ray_codes[(i, j, direction)] = tuple(
+                encode_move(i, j, new_row, new_column, size) for new_row, new_column, cells in self.rays[
+                    (i, j, direction)]
+            )
+
+        self.footprint_bits = {}                        # the blocks of each footprint as a bitmask of the board
+        for (i, j), cells in self.footprints.items():
+            bits = 0
+            for x, y in cells:
+                bits |= 1 << (x * size + y)
+            self.footprint_bits[(i, j)] = bits
+
+        self._attack_dependents = None                  # built the first time an attack map is needed
+
+        self._move_targets = None                       # built the first time captures are counted
+
+        self.covering_centers = {}                      # the centers whose footprint covers each block
+        for center, cells in self.footprints.items():
+            for cell in cells:
+                self.covering_centers.setdefault(cell, []).append(center)
+
+        keys = random.Random(size)                      # seeded, so every process gets the same hashes for a size
+        self.zobrist = {
+            'B': [[keys.getrandbits(64) for j in range(size)] for i in range(size)],
+            'W': [[keys.getrandbits(64) for j in range(size)] for i in range(size)],
+        }
+        self.side_key = keys.getrandbits(64)            # mixed in when it's white player's turn
+
+        self.symmetric_zobrist = []                     # the key each stone gets when the board is seen through
+        for symmetry in SYMMETRIES:                     # a symmetry, so every symmetric hash can be kept up to date
+            symmetric = {}
+            for stone in ('B', 'W'):
+                symmetric[stone] = [[0] * size for i in range(size)]
+                for i in range(size):
+                    for j in range(size):
+                        row, column = transform_square(i, j, symmetry, size)
+                        symmetric[stone][i][j] = self.zobrist[transform_stone(stone, symmetry)][row][column]
+            self.symmetric_zobrist.append(symmetric)
+
+
+
+    def __deepcopy__(self, memo):
+        '''
+        The tables never change once they are built, so a deep copy of a game shares them instead of copying them.
+        '''
+
+        return self
+
+
+
+    def get_attack_dependents(self):
+        '''
+        Returns a dictionary of block -> the centers whose moves can change when that block changes: the centers
+        whose footprint covers the block, and the centers that have to sweep over the block on the way to a move.
+        It is only built the first time, since only the attack maps need it.
+        '''
+
+        if self._attack_dependents is None:
+            dependents = {}
+            for (i, j), cells in self.footprints.items():
+                touched = set(cells)
+                for direction, row_step, column_step in DIRECTIONS:
+                    for new_row, new_column, swept in self.rays[(i, j, direction)]:
+                        touched.update(swept)
+                for cell in touched:
+                    dependents.setdefault(cell, []).append((i, j))
+            self._attack_dependents = dict((cell, tuple(centers)) for cell, centers in dependents.items())
+
+        return self._attack_dependents
+
+
+
+    def get_move_targets(self):
+        '''
+        Returns a list of the new center of every move number from encode_move, so the new center of a move can be
+        looked up without decoding it. It is only built the first time.
+        '''
+
+        if self._move_targets is None:
+            targets = [None] * (max(max(codes) for codes in self.ray_codes.values() if codes) + 1)
+            for (i, j, direction), steps in self.rays.items():
+                for (new_row, new_column, cells), code in zip(steps, self.ray_codes[(i, j, direction)]):
+                    targets[code] = (new_row, new_column)
+            self._move_targets = targets
+
+        return self._move_targets
+
+
+
+    def is_inner(self, row, column):
+        '''
+        Returns True if the row and column can be used as the center of a footprint, otherwise False.
+        '''
+
+        return 0 < row < self.last and 0 < column < self.last
+
+
+
+def encode_move(old_row, old_column, new_row, new_column, size):
+    '''
+    Returns the move as one number, so lists of moves can be kept in an array of 16-bit numbers.
+    Both centers can't fit in 16 bits on the usual board (its 324 centers give 104976 pairs), but a move always
+    goes in a straight line, so the number is made of the old center, the direction (its number in DIRECTIONS) and
+    the distance, which is less than 65536 on boards up to 22x22.
+    Raises ValueError if the move doesn't go in a straight line.
+    '''
+
+    row_step = new_row - old_row
+    column_step = new_column - old_column
+    distance = max(abs(row_step), abs(column_step))
+
+    if distance == 0 or row_step not in (0, distance, -distance) or column_step not in (0, distance, -distance):
+        raise ValueError("A move must go some distance in a straight line.")
+
+    number = DIRECTION_NUMBERS[(row_step // distance, column_step // distance)]
+    start = (old_row - 1) * (size - 2) + old_column - 1
+
+    return (start * 8 + number) * (size - 3) + distance - 1
+
+
+
+def decode_move(code, size):
+    '''
+    Turns a number from encode_move back into (old_row, old_column, new_row, new_column).
+    '''
+
+    code, distance = divmod(code, size - 3)
+    start, number = divmod(code, 8)
+    old_row, old_column = divmod(start, size - 2)
+    name, row_step, column_step = DIRECTIONS[number]
+    distance += 1
+
+    return (old_row + 1, old_column + 1, old_row + 1 + row_step * distance, old_column + 1 + column_step * distance)
+
+
+
+def transform_square(row, column, symmetry, size):
+    '''
+    Returns where the block at the row and column goes under the symmetry, on a board of the given size.
+    '''
+
+    if symmetry & MIRROR:
+        column = size - 1 - column
+    if symmetry & COLOR_FLIP:
+        row = size - 1 - row
+
+    return row, column
+
+
+
+def transform_stone(stone, symmetry):
+    '''
+    Returns what a stone ('B', 'W' or '-') becomes under the symmetry.
+    '''
+
+    if symmetry & COLOR_FLIP:
+        return SWAPPED_STONES[stone]
+
+    return stone
+
+
+
+def transform_move(move, symmetry, size):
+    '''
+    Returns the (old_row, old_column, new_row, new_column) move as it is played in the position seen through the
+    symmetry. The stones pointing the way are moved along with the footprint, so the direction of the move changes
+    the same way as in DIRECTION_SYMMETRIES and the move stays valid.
+    '''
+
+    if not symmetry:
+        return move
+
+    old_row, old_column = transform_square(move[0], move[1], symmetry, size)
+    new_row, new_column = transform_square(move[2], move[3], symmetry, size)
+
+    return (old_row, old_column, new_row, new_column)
+
+
+
+def transform_move_code(code, symmetry, size):
+    '''
+    Does the same as transform_move for a move encoded with encode_move.
+    '''
+
+    if not symmetry:
+        return code
+
+    return encode_move(*transform_move(decode_move(code, size), symmetry, size), size=size)
+
+
+
+_geometries = {}
+
+
+
+def get_geometry(size):
+    '''
+    Returns the BoardGeometry for the given size, building it the first time the size is used.
+    '''
+
+    geometry = _geometries.get(size)
+    if geometry is None:
+        geometry = BoardGeometry(size)
+        _geometries[size] = geometry
+
+    return geometry
+
+
+
+class MoveDelta:
+    '''
+    This is a class that describes what a successful move did, so that whoever needs to know does not have to compare
+    the whole board before and after the move. The last move of a game can be found with get_last_move.
+    '''
+
+    __slots__ = ('player', 'old_center', 'new_center', 'changed', 'captured', 'stones_off_board', 'rings_created',
+                 'rings_destroyed', 'previous_state', 'previous_move', 'previous_error')
+
+
+
+    def __init__(self, player, old_row, old_column, new_row, new_column):
+        '''
+        Initializes the description of a move made by the player ("B" or "W") from the old center to the new center.
+        The rest is filled in while the move is being made:
+        changed is a list of (row, column, before, after) for every block that changed,
+        captured counts the stones of each color that were under the new footprint,
+        stones_off_board counts the player's own stones that landed on the edges and were taken off,
+        rings_created and rings_destroyed are lists of (player, center) for the rings the move made or broke,
+        and previous_state is the game state before the move, previous_move the MoveDelta of the move before it (or
+        None) and previous_error the reason of the last refused move before it, so the move can be taken back.
+        '''
+
+        self.player = player
+        self.old_center = (old_row, old_column)
+        self.new_center = (new_row, new_column)
+        self.changed = []
+        self.captured = {'B': 0, 'W': 0}
+        self.stones_off_board = 0
+        self.rings_created = []
+        self.rings_destroyed = []
+        self.previous_state = "UNFINISHED"
+        self.previous_move = None
+        self.previous_error = None
+
 
 
 class GessGame:
@@ -19,121 +513,174 @@ class GessGame:
     The methods contained in this class are:
     an init method
     get_game_state
-    update_game_status
+    get_player
+    get_last_move
     resign_game
+    adjudicate_game
+    get_repetition_count
+    has_draw_rules
     get_column
     get_row
+    get_size
+    get_coordinates
+    to_compact
+    get_patterns
     check_stones
     check_boundary
-    check_own_rings
     check_empty_center
     check_directions
-    rec_check_if_path_clear
     check_if_path_clear
     check_if_can_capture
-    clear_current_piece
     clear_edges
+    clear_footprint_edges
     move_footprint
+    lift_footprint
+    place_footprint
+    finish_move
+    apply_trusted_move
+    put_back
+    find_rings
+    is_ring
+    update_rings
+    undo_move
+    compute_hash
+    update_hash
+    get_position_hash
+    get_canonical_hash
+    to_canonical_compact
+    get_stone_count
+    get_rings
+    get_row_masks
+    generate_moves
+    find_center_moves
+    generate_move_codes
+    generate_capture_codes
+    get_legal_moves
+    note_move_changes
+    get_capture_counts
+    get_move_code
+    get_move_positions
+    get_move_error
+    apply_move
     make_move
+    pack
+    clone
+    own_rows
+    find_center_attacks
+    note_attack_changes
+    get_attack_map
+    is_attacked
+    get_threatened_rings
     '''
 
+    __slots__ = ('_geometry', '_game_state', '_player_turn', '_board', '_last_move', '_move_error', '_masks', '_rings',
+                 '_stones', '_hashes', '_repetition_limit', '_max_plies', '_history', '_shared', '_attacks',
+                 '_attack_changes', '_move_lists', '_move_changes')
+                                    # no __dict__, so a game that is only kept takes less memory
+
 
 
-    def __init__(self):
+    def __init__(self, size=20, layout=None, repetition_limit=None, max_plies=None):
         '''
         Initializes the board filled with the player's respective stones on their initial positions.
         "B" for the black stones and "W" for the white stones. And '-' for empty.
+        The size of the board includes the off-bound edges, so the default of 20 gives the usual 18x18 playing area.
+        If no layout is given, the standard starting position is stretched or shrunk to fit the size of the board
+        (see default_layout). A layout can be a list of strings or a list of lists, one per row.
         The state of the game is initialized as "UNFINISHED".
         The player turn is initialized to 0 (which is even, because black player goes first).
+        The game has no draws unless it is asked for: with repetition_limit, the game is a "DRAW" once the same
+        position (with the same player to move) has come up that many times, and with max_plies, the game is a
+        "DRAW" once the player turn counter reaches it without anyone winning.
         '''
 
+        self._geometry = get_geometry(size)     # the tables that only depend on the size are shared by every game
+
         self._game_state = "UNFINISHED"
 
         self._player_turn = 0       # This is incremented each turn. If it's even, it's black player's turn.
                                     # if it is odd, then it's white player's turn.
 
-        self._board = [
-            ['-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-'],
-            ['-', '-', 'W', '-', 'W', '-', 'W', 'W', 'W', 'W', 'W', 'W', 'W', 'W', '-', 'W', '-', 'W', '-', '-'],
-            ['-', 'W', 'W', 'W', '-', 'W', '-', 'W', 'W', 'W', 'W', '-', 'W', '-', 'W', '-', 'W', 'W', 'W', '-'],
-            ['-', '-', 'W', '-', 'W', '-', 'W', 'W', 'W', 'W', 'W', 'W', 'W', 'W', '-', 'W', '-', 'W', '-', '-'],
-            ['-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-'],
-            ['-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-'],
-            ['-', '-', 'W', '-', '-', 'W', '-', '-', 'W', '-', '-', 'W', '-', '-', 'W', '-', '-', 'W', '-', '-'],
-            ['-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-'],
-            ['-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-'],
-            ['-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-'],
-            ['-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-'],
-            ['-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-'],
-            ['-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-'],
-            ['-', '-', 'B', '-', '-', 'B', '-', '-', 'B', '-', '-', 'B', '-', '-', 'B', '-', '-', 'B', '-', '-'],
-            ['-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-'],
-            ['-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-'],
-            ['-', '-', 'B', '-', 'B', '-', 'B', 'B', 'B', 'B', 'B', 'B', 'B', 'B', '-', 'B', '-', 'B', '-', '-'],
-            ['-', 'B', 'B', 'B', '-', 'B', '-', 'B', 'B', 'B', 'B', '-', 'B', '-', 'B', '-', 'B', 'B', 'B', '-'],
-            ['-', '-', 'B', '-', 'B', '-', 'B', 'B', 'B', 'B', 'B', 'B', 'B', 'B', '-', 'B', '-', 'B', '-', '-'],
-            ['-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-', '-']
-        ]
+        if layout is None:
+            layout = default_layout(size)
+
+        if len(layout) != size:
+            raise ValueError("The layout must have " + str(size) + " rows.")
+
+        self._shared = set()        # the rows of the board shared with a copy-on-write clone (see clone)
+
+        self._board = []
+        for row in layout:
+            if len(row) != size:
+                raise ValueError("Each row of the layout must have " + str(size) + " blocks.")
+            for block in row:
+                if block not in ('-', 'B', 'W'):
+                    raise ValueError("The layout can only contain 'B', 'W' and '-'.")
+            self._board.append(list(row))
+
+        self.clear_edges()          # stones can never start on the off-bound edges
+
+        self._last_move = None      # the MoveDelta of the last successful move
+        self._move_error = None     # the reason code of the last move that was refused
+
+        self._masks = {'B': [0] * size, 'W': [0] * size}    # each row of each player's stones as a bitmask, with
+        for i, row in enumerate(self._board):                  # bit j set if there is a stone in column j
+            for j, block in enumerate(row):
+                if block != '-':
+                    self._masks[block][i] |= 1 << j
+
+        self._rings = {'B': self.find_rings('B'), 'W': self.find_rings('W')}     # the centers of the intact rings
+
+        self._stones = {'B': 0, 'W': 0}                 # the number of stones of each player on the board
+        for row in self._board:
+            self._stones['B'] += row.count('B')
+            self._stones['W'] += row.count('W')
+
+        self._hashes = [self.compute_hash(symmetry) for symmetry in SYMMETRIES]     # the hash of the position and
+                                                        # of the position seen through each symmetry, kept up to date
+                                                        # by every move
+
+        self._repetition_limit = repetition_limit
+        self._max_plies = max_plies
+        self._history = {self._hashes[0]: 1}           # how many times each position hash has come up in the game
+
+        self._attacks = None            # the attack maps, only kept up to date once they have been asked for (see
+        self._attack_changes = None     # get_attack_map), and the blocks changed since they were last brought up to
+                                        # date
+
+        self._move_lists = None         # the same for the valid moves of each center (see get_legal_moves)
+        self._move_changes = None
 
 
 
     def get_game_state(self):
         '''
         Returns the current game state.
-        It can be "UNFINISHED", "BLACK_WON", or "WHITE_WON"
+        It can be "UNFINISHED", "BLACK_WON", "WHITE_WON" or "DRAW"
         '''
 
         return self._game_state
 
 
 
-    def update_game_status(self):
+    def get_player(self):
         '''
-        This is a method that is called after a move is made to check if a player has just broken the opponent's
-        last ring. If so, announce the winner if the player captures his or her opponent's last ring.
-        If the opponent still has at least one intact ring, continue game.
+        Returns the stone of the player whose turn it is, "B" for black or "W" for white.
         '''
 
-        if self._player_turn % 2 == 0:  # if it's black player's turn
+        if self._player_turn % 2 == 0:      # if it's black player's turn
+            return 'B'
 
-            for i in range(1, 19):      # if the opponent (white) still has at least one ring intact on the board,
-                for j in range(1, 19):  # continue game. If no more, then BLACK_WON
-                    if (
-                            (self._board[i][j] == '-') and
-                            (self._board[i - 1][j] == 'W') and
-                            (self._board[i + 1][j] == 'W') and
-                            (self._board[i][j + 1] == 'W') and
-                            (self._board[i][j - 1] == 'W') and
-                            (self._board[i - 1][j + 1] == 'W') and
-                            (self._board[i - 1][j - 1] == 'W') and
-                            (self._board[i + 1][j + 1] == 'W') and
-                            (self._board[i + 1][j - 1] == 'W')
-                    ):
-                        return True
+        return 'W'
 
-            self._game_state = "BLACK_WON"
-            return self._game_state
-
-
-        if self._player_turn % 2 == 1:  # if it's white player's turn
-
-            for i in range(1, 19):      # if the opponent (black) still has at least one ring intact on the board,
-                for j in range(1, 19):  # continue game. If no more, then WHITE_WON
-                    if (
-                            (self._board[i][j] == '-') and
-                            (self._board[i - 1][j] == 'B') and
-                            (self._board[i + 1][j] == 'B') and
-                            (self._board[i][j + 1] == 'B') and
-                            (self._board[i][j - 1] == 'B') and
-                            (self._board[i - 1][j + 1] == 'B') and
-                            (self._board[i - 1][j - 1] == 'B') and
-                            (self._board[i + 1][j + 1] == 'B') and
-                            (self._board[i + 1][j - 1] == 'B')
-                    ):
-                        return True
 
-            self._game_state = "WHITE_WON"
-            return self._game_state
+
+    def get_last_move(self):
+        '''
+        Returns the MoveDelta of the last successful move, or None if no move has been made yet.
+        '''
+
+        return self._last_move
 
 
 
@@ -157,15 +704,50 @@ class GessGame:
 
 
 
+    def adjudicate_game(self, state):
+        '''
+        This method ends an unfinished game with the given result without any more moves, for example when one of
+        the players is so far ahead that playing on is a waste of time. The state can be "BLACK_WON", "WHITE_WON"
+        or "DRAW". Returns the game state.
+        '''
+
+        if state not in ("BLACK_WON", "WHITE_WON", "DRAW"):
+            raise ValueError("A game can only be adjudicated as BLACK_WON, WHITE_WON or DRAW.")
+
+        if self._game_state == "UNFINISHED":
+            self._game_state = state
+
+        return self._game_state
+
+
+
+    def get_repetition_count(self):
+        '''
+        Returns how many times the current position (with the same player to move) has come up in the game,
+        counting this time.
+        '''
+
+        return self._history.get(self._hashes[0], 0)
+
+
+
+    def has_draw_rules(self):
+        '''
+        Returns True if the game can end in a draw (it has a repetition_limit or a max_plies), in which case how it
+        ends also depends on the moves that led to the position, not only on the board.
+        '''
+
+        return self._repetition_limit is not None or self._max_plies is not None
+
+
+
     def get_column(self, string):
         '''
         This method breaks down the string coordinates passed as a parameter and is turns it into an integer for the
         columns. The returned integer is then used to match the list indexes of the game board.
         '''
 
-        column_string = 'abcdefghijklmnopqrst'
-
-        return int(column_string.find(string[0]))       # return the index number instead of a letter.
+        return int(self._geometry.columns.find(string[0]))  # return the index number instead of a letter.
 
 
 
@@ -175,80 +757,96 @@ class GessGame:
         rows. The returned integer is then used to match the list indexes of the game board.
         '''
 
-        return int(20 - int(string[1:]))                # returns the opposite number because it's in the opposite
-                                                        # order of the columns of the board.
+        return int(self._geometry.size - int(string[1:]))   # returns the opposite number because it's in the
+                                                            # opposite order of the columns of the board.
 
 
 
-    def check_stones(self, old_row, old_column):
+    def get_size(self):
         '''
-        This method checks whether the 3x3 footprint contains any stones of the opposite player.
-        If it does, it returns False. If all is cleared, then it returns True.
-        The parts are divided to each player's turn, so the player cannot move the opponent's stones at all.
-        So if there is any opponent's stone at the footprint being moved, return False. Otherwise, True.
+        Returns the size of the board, counting the off-bound edges.
         '''
 
-        if self._player_turn % 2 == 0:    # if it's black player's turn.
-                                          # if the 3x3 footprint being moved contains an opponent's stone, return False
+        return self._geometry.size
 
-            if self._board[old_row][old_column] == 'W':
-                return False
-
-            if self._board[old_row - 1][old_column] == 'W':
-                return False
 
-            if self._board[old_row + 1][old_column] == 'W':
-                return False
 
-            if self._board[old_row][old_column + 1] == 'W':
-                return False
+    def get_coordinates(self, row, column):
+        '''
+        This method does the opposite of get_row and get_column, it turns row and column indexes back into string
+        coordinates like 'e14'.
+        '''
 
-            if self._board[old_row][old_column - 1] == 'W':
-                return False
+        return self._geometry.columns[column] + str(self._geometry.size - row)
 
-            if self._board[old_row - 1][old_column + 1] == 'W':
-                return False
 
-            if self._board[old_row - 1][old_column - 1] == 'W':
-                return False
 
-            if self._board[old_row + 1][old_column + 1] == 'W':
-                return False
+    def to_compact(self):
+        '''
+        Returns the position as one short line of text that load_compact can turn back into a game.
+        It is made of the size of the board, the player to move, the player turn counter and the rows, separated by
+        colons. The rows are separated by slashes and each run of empty blocks is written as its length,
+        so the starting position is "20:b:0:20/2W1W1WWWWWWWW1W1W2/...".
+        '''
 
-            if self._board[old_row + 1][old_column - 1] == 'W':
-                return False
+        rows = []
+        for row in self._board:
+            text = ''
+            empty = 0
+            for block in row:
+                if block == '-':
+                    empty += 1
+                else:
+                    if empty:
+                        text += str(empty)
+                        empty = 0
+                    text += block
+            if empty:
+                text += str(empty)
+            rows.append(text)
 
+        return ':'.join((str(self._geometry.size), self.get_player().lower(), str(self._player_turn), '/'.join(rows)))
 
-        if self._player_turn % 2 == 1:    # if it's white player's turn.
-                                          # if the 3x3 footprint being moved contains an opponent's stone, return False
 
-            if self._board[old_row][old_column] == 'B':
-                return False
 
-            if self._board[old_row - 1][old_column] == 'B':
-                return False
+    def get_patterns(self, row, column):
+        '''
+        Returns the patterns of the player's stones and of the opponent's stones in the footprint around the given
+        center, as 9-bit numbers that can be looked up in PATTERNS. They are cut straight out of the row bitmasks of
+        each player, three bits from each of the three rows.
+        '''
 
-            if self._board[old_row + 1][old_column] == 'B':
-                return False
+        shift = column - 1
 
-            if self._board[old_row][old_column + 1] == 'B':
-                return False
+        if self._player_turn % 2 == 0:      # if it's black player's turn
+            own = self._masks['B']
+            opponent = self._masks['W']
+        else:
+            own = self._masks['W']
+            opponent = self._masks['B']
 
-            if self._board[old_row][old_column - 1] == 'B':
-                return False
+        return (
+            ((own[row - 1] >> shift) & 7) | (((own[row] >> shift) & 7) << 3) | (((own[row + 1] >> shift) & 7) << 6),
+            ((opponent[row - 1] >> shift) & 7) | (((opponent[row] >> shift) & 7) << 3) |
+            (((opponent[row + 1] >> shift) & 7) << 6)
+        )
 
-            if self._board[old_row - 1][old_column + 1] == 'B':
-                return False
 
-            if self._board[old_row - 1][old_column - 1] == 'B':
-                return False
 
-            if self._board[old_row + 1][old_column + 1] == 'B':
-                return False
+    def check_stones(self, old_row, old_column):
+        '''
+        This method checks whether the 3x3 footprint contains any stones of the opposite player.
+        If it does, it returns False. If all is cleared, then it returns True.
+        The parts are divided to each player's turn, so the player cannot move the opponent's stones at all.
+        So if there is any opponent's stone at the footprint being moved, return False. Otherwise, True.
+        The opponent's stones in the footprint are read all at once as a pattern (see get_patterns), so there is
+        nothing to compare block by block.
+        '''
 
-            if self._board[old_row + 1][old_column - 1] == 'B':
-                return False
+        own_pattern, opponent_pattern = self.get_patterns(old_row, old_column)
 
+        if opponent_pattern:              # if the 3x3 footprint being moved contains an opponent's stone, return False
+            return False
 
         return True                       # If the footprint being moved doesn't contain any opponent's stone,
                                           # return True.
@@ -260,19 +858,13 @@ class GessGame:
         This method is used to check if one of the blocks at the off-boundary edges are being used as a center of a
         footprint when attempting a move, or, when attempting to place a center into one of the blocks at the
         off-boundary edges. So if the center is going to be off of the inner 18x18 board, return False.
+        Coordinates that are not on the board at all (like a letter past the last column) are refused too.
         '''
 
         if (
 
-            old_row == 0 or             # if the current center is being placed at the top row.
-            old_row == 19 or            # if the current center is being placed at the bottom row.
-            old_column == 0 or          # if the current center is being placed at the left column.
-            old_column == 19 or         # if the current center is being placed at the right column.
-
-            new_row == 0 or             # if the new center is being placed at the top row.
-            new_row == 19 or            # if the new center is being placed at the bottom row.
-            new_column == 0 or          # if the new center is being placed at the left column.
-            new_column == 19            # if the new center is being placed at the right column.
+            not self._geometry.is_inner(old_row, old_column) or     # if the current center is on an edge.
+            not self._geometry.is_inner(new_row, new_column)        # if the new center is on an edge.
 
         ):
 
@@ -280,58 +872,6 @@ class GessGame:
 
 
 
-    def check_own_rings(self):
-        '''
-        This is the way to see if the player will still have at least one ring intact on the board when attempting a
-        move. The way this works is that it checks each and every block of the board. If it finds a player's ring that
-        is still intact, then it returns True and the player stays on the game. If it doesn't find any intact rings on
-        the board, then either invalidate the move being attempted (because the player might be moving the ring off the
-        board), or, announce a winner because someone just took out his or her opponent's last ring.
-        '''
-
-        if self._player_turn % 2 == 0:  # if it's black player's turn
-
-            for i in range(1, 19):      # if black player still has at least one ring intact on the board, return True.
-                for j in range(1, 19):  # otherwise, return False and invalidate the move.
-                    if (
-                            (self._board[i][j] == '-') and
-                            (self._board[i-1][j] == 'B') and
-                            (self._board[i+1][j] == 'B') and
-                            (self._board[i][j+1] == 'B') and
-                            (self._board[i][j-1] == 'B') and
-                            (self._board[i-1][j+1] == 'B') and
-                            (self._board[i-1][j-1] == 'B') and
-                            (self._board[i+1][j+1] == 'B') and
-                            (self._board[i+1][j-1] == 'B')
-                    ):
-                        return True
-
-            print("Cannot execute move. You'll lose your last ring!")
-            return False
-
-
-        if self._player_turn % 2 == 1:  # if it's white player's turn
-
-            for i in range(1, 19):      # if white player still has at least one ring intact on the board, return True.
-                for j in range(1, 19):  # otherwise, return False and invalidate the move.
-                    if (
-                            (self._board[i][j] == '-') and
-                            (self._board[i-1][j] == 'W') and
-                            (self._board[i+1][j] == 'W') and
-                            (self._board[i][j+1] == 'W') and
-                            (self._board[i][j-1] == 'W') and
-                            (self._board[i-1][j+1] == 'W') and
-                            (self._board[i-1][j-1] == 'W') and
-                            (self._board[i+1][j+1] == 'W') and
-                            (self._board[i+1][j-1] == 'W')
-                    ):
-                        return True
-
-            print("Cannot execute move. You'll lose your last ring!")
-            return False
-
-
-
     def check_empty_center(self, old_row, old_column):
         '''
         This method takes the current center as a parameter and
@@ -341,19 +881,13 @@ class GessGame:
         Returns True if it exists, otherwise False.
         '''
 
-        if self._player_turn % 2 == 0:      # if it's black player's turn
+        own_pattern, opponent_pattern = self.get_patterns(old_row, old_column)
 
-            if self._board[old_row][old_column] == '-':     # if the current center has no player's stone
-                return True
-            else:
-                return False
+        if (own_pattern | opponent_pattern) & CENTER_BIT:   # if the current center has a stone
+            return False
 
-        if self._player_turn % 2 == 1:      # if it's white player's turn
+        return True
 
-            if self._board[old_row][old_column] == '-':     # if the current center has no player's stone
-                return True
-            else:
-                return False
 
 
     def check_directions(self, old_row, old_column, new_row, new_column):
@@ -366,692 +900,970 @@ class GessGame:
         the new position from the old position and then getting the "vector" that gives us not just distance, but also
         their positive or negative signs to determine their directions. It also has to strictly go diagonally so
         we have to make sure that their x and y distances are equal to yield a straight diagonal in our 20x20 board.
+        The directions the footprint can go to are looked up in PATTERNS from the pattern of the player's stones.
         If the move can go to a certain direction, returns True, otherwise False.
         '''
 
         horizontal_distance = new_column - old_column                   # gets the "vector" for horizontal distance
         vertical_distance = new_row - old_row                           # gets the "vector" for vertical distance
+        distance = max(abs(horizontal_distance), abs(vertical_distance))
 
+        if distance == 0:                                               # if the move will be at the same spot
+            return False
 
-        ### if it's black player's turn ###
-
-        if self._player_turn % 2 == 0:
+        own_pattern, opponent_pattern = self.get_patterns(old_row, old_column)
+        allowed = PATTERNS[own_pattern][0]
 
-            if vertical_distance < 0 and horizontal_distance == 0:      # if trying to go north
-                if self._board[old_row-1][old_column] == 'B':
+        for number, (direction, row_step, column_step) in enumerate(DIRECTIONS):
+            if row_step * distance == vertical_distance and column_step * distance == horizontal_distance:
+                if allowed & (1 << number):                             # if a stone is pointing to that direction
                     return True
-                else:
-                    return False
+                return False
 
-            if vertical_distance > 0 and horizontal_distance == 0:      # if trying to go south
-                if self._board[old_row+1][old_column] == 'B':
-                    return True
-                else:
-                    return False
+        return False                                                    # if it's not strictly straight or diagonal
 
-            if vertical_distance == 0 and horizontal_distance > 0:      # if trying to go east
-                if self._board[old_row][old_column+1] == 'B':
-                    return True
-                else:
-                    return False
 
-            if vertical_distance == 0 and horizontal_distance < 0:      # if trying to go west
-                if self._board[old_row][old_column-1] == 'B':
-                    return True
-                else:
-                    return False
 
+    def check_if_path_clear(self, old_row, old_column, new_row, new_column):
+        '''
+        This method checks if a path is clear when moving a footprint, so that it doesn't just "jump over" or skip
+        obstacles on its way, by walking the ray that the board geometry has already worked out for this center and
+        direction.
+        Each step of the ray lists the blocks that the footprint sweeps over to get there, so we only have to look
+        at those blocks instead of the whole footprint at every step.
+        One step is always clear because one step can capture any stones.
+        Returns True if the path is clear, otherwise False.
+        '''
 
-            if vertical_distance < 0 and horizontal_distance > 0:      # if trying to go north-east
-                if abs(vertical_distance) == abs(horizontal_distance):  # if it's strictly diagonal
-                    if self._board[old_row-1][old_column+1] == 'B':
-                        return True
-                    else:
-                        return False
-                else:
-                    return False
+        horizontal_distance = new_column - old_column                    # getting the distances
+        vertical_distance = new_row - old_row
+        distance = max(abs(horizontal_distance), abs(vertical_distance))
 
-            if vertical_distance < 0 and horizontal_distance < 0:      # if trying to go north-west
-                if abs(vertical_distance) == abs(horizontal_distance):  # if it's strictly diagonal
-                    if self._board[old_row-1][old_column-1] == 'B':
-                        return True
-                    else:
-                        return False
-                else:
-                    return False
+        for direction, row_step, column_step in DIRECTIONS:             # finds the name of the direction going to
+            if row_step * distance == vertical_distance and column_step * distance == horizontal_distance:
+                break
+        else:
+            return False                                                # not a straight or a diagonal line
 
-            if vertical_distance > 0 and horizontal_distance > 0:      # if trying to go south-east
-                if abs(vertical_distance) == abs(horizontal_distance):  # if it's strictly diagonal
-                    if self._board[old_row+1][old_column+1] == 'B':
-                        return True
-                    else:
-                        return False
-                else:
-                    return False
+        ray = self._geometry.rays[(old_row, old_column, direction)]
 
-            if vertical_distance > 0 and horizontal_distance < 0:      # if trying to go south-west
-                if abs(vertical_distance) == abs(horizontal_distance):  # if it's strictly diagonal
-                    if self._board[old_row+1][old_column-1] == 'B':
-                        return True
-                    else:
-                        return False
-                else:
+        for step in range(distance):
+            for i, j in ray[step][2]:                                   # the blocks swept over to reach this step
+                if self._board[i][j] != '-':
                     return False
 
-            if vertical_distance == 0 and horizontal_distance == 0:      # if the move will be at the same spot
-                return False
+        return True
 
 
-        ### if it's white player's turn ###
 
-        if self._player_turn % 2 == 1:
 
-            if vertical_distance < 0 and horizontal_distance == 0:  # if trying to go north
-                if self._board[old_row - 1][old_column] == 'W':
-                    return True
-                else:
-                    return False
+    def check_if_can_capture(self, old_row, old_column, new_row, new_column):
+        '''
+        This method takes the current position and the next position as parameters to determine the direction.
+        We also need to know where the footprint is going because apparently the rules for capturing stones
+        when moving diagonal and moving straight, are different.
+        When moving straight (north, south, east, west), we can capture stones only by the front row of our 3x3.
+        If our "middle layer" (the center and the two sides beside it, depending on the direction) overlaps on
+        obstacle, then it will return False because it can't catch further.
+        As for diagonal moves, we can capture stones as long as the center of the footprint doesn't overlap with
+        an obstacle, so the "wings" and the "head" all can capture stones.
+        Also, we make an exception when moving only one block because the way this method mainly works is that it
+        tries to see the new location if it has any obstacles and see if the center can safely land there. In the
+        case of moving one block, however, if there are any stone in the front row of our 3x3 footprint, then
+        it sees that there's an "obstacle" although it's probably just looking at its own stone.
+        So this returns False for any illegal overlaps.
+        '''
 
-            if vertical_distance > 0 and horizontal_distance == 0:  # if trying to go south
-                if self._board[old_row + 1][old_column] == 'W':
-                    return True
-                else:
-                    return False
+        horizontal_distance = new_column - old_column
+        vertical_distance = new_row - old_row
 
-            if vertical_distance == 0 and horizontal_distance > 0:  # if trying to go east
-                if self._board[old_row][old_column + 1] == 'W':
-                    return True
-                else:
-                    return False
 
-            if vertical_distance == 0 and horizontal_distance < 0:  # if trying to go west
-                if self._board[old_row][old_column - 1] == 'W':
-                    return True
-                else:
-                    return False
+        if vertical_distance < 0 and horizontal_distance == 0:    # if trying to go north
+            if self._board[new_row][new_column] == '-':           # if the next center has no obstacle, but
+                if self._board[new_row][new_column-1] != '-' or self._board[new_row][new_column+1] != '-':
+                    return False                                  # if there is an obstacle at the side wings
+            if self._board[new_row][new_column] != '-':           # then cannot catch further.
+                if vertical_distance == -1:                       # if only moving one step, because it's safe to catch
+                    return True                                   # with just the "frontline"
+                return False
 
-            if vertical_distance < 0 and horizontal_distance > 0:      # if trying to go north-east
-                if abs(vertical_distance) == abs(horizontal_distance):  # if it's strictly diagonal
-                    if self._board[old_row-1][old_column+1] == 'W':
-                        return True
-                    else:
-                        return False
-                else:
-                    return False
+        elif vertical_distance > 0 and horizontal_distance == 0:  # if trying to go south
+            if self._board[new_row][new_column] == '-':           # if the next center has no obstacle, but
+                if self._board[new_row][new_column-1] != '-' or self._board[new_row][new_column+1] != '-':
+                    return False                                  # if there is an obstacle at the side wings
+            if self._board[new_row][new_column] != '-':           # then cannot catch further.
+                if vertical_distance == 1:                        # if only moving one step, because it's safe to catch
+                    return True                                   # with just the "frontline"
+                return False
 
-            if vertical_distance < 0 and horizontal_distance < 0:      # if trying to go north-west
-                if abs(vertical_distance) == abs(horizontal_distance):  # if it's strictly diagonal
-                    if self._board[old_row-1][old_column-1] == 'W':
-                        return True
-                    else:
-                        return False
-                else:
-                    return False
+        elif vertical_distance == 0 and horizontal_distance > 0:  # if trying to go east
+            if self._board[new_row][new_column] == '-':           # if the next center has no obstacle, but
+                if self._board[new_row-1][new_column] != '-' or self._board[new_row+1][new_column] != '-':
+                    return False                                  # if there is an obstacle at the side wings
+            if self._board[new_row][new_column] != '-':           # then cannot catch further.
+                if horizontal_distance == 1:                      # if only moving one step, because it's safe to catch
+                    return True                                   # with just the "frontline"
+                return False
 
-            if vertical_distance > 0 and horizontal_distance > 0:      # if trying to go south-east
-                if abs(vertical_distance) == abs(horizontal_distance):  # if it's strictly diagonal
-                    if self._board[old_row+1][old_column+1] == 'W':
-                        return True
-                    else:
-                        return False
-                else:
-                    return False
+        elif vertical_distance == 0 and horizontal_distance < 0:  # if trying to go west
+            if self._board[new_row][new_column] == '-':           # if the next center has no obstacle, but
+                if self._board[new_row-1][new_column] != '-' or self._board[new_row+1][new_column] != '-':
+                    return False                                  # if there is an obstacle at the side wings
+            if self._board[new_row][new_column] != '-':           # then cannot catch further.
+                if horizontal_distance == -1:                     # if only moving one step, because it's safe to catch
+                    return True                                   # with just the "frontline"
+                return False
 
-            if vertical_distance > 0 and horizontal_distance < 0:      # if trying to go south-west
-                if abs(vertical_distance) == abs(horizontal_distance):  # if it's strictly diagonal
-                    if self._board[old_row+1][old_column-1] == 'W':
-                        return True
-                    else:
-                        return False
-                else:
-                    return False
+        else:                                                               # if it's going diagonal. Where it can
+            if self._board[new_row][new_column] != '-':                     # capture with the "wings" and the "head"
 
-            if vertical_distance == 0 and horizontal_distance == 0:      # if the move will be at the same spot
+                if vertical_distance == -1 and horizontal_distance == 1:    # if only moving one step north-east
+                    return True
+                if vertical_distance == -1 and horizontal_distance == -1:   # if only moving one step north-west
+                    return True
+                if vertical_distance == 1 and horizontal_distance == 1:     # if only moving one step south-east
+                    return True
+                if vertical_distance == 1 and horizontal_distance == -1:    # if only moving one step south-west
+                    return True
                 return False
 
 
 
-    def rec_check_if_path_clear(self, old_row, old_column, distance, counter, direction, new_row, new_column):
+    def clear_edges(self):
         '''
-        This is a recursive method that takes the parameters for the current and next positions, distance, direction,
-        and counter to know when to stop.
-        This recursing method checks to see if a path is clear when moving a footprint, so that it doesn't just
-        "jump over" or skip  obstacles on its way, which is not a legal move. So the way this will work is that it will
-        recurse through each block the piece is about to head to and check if the path contains an obstacle.
-        It will keep recursing until either it hits an obstacle or it reaches the distance the player has requested.
-        If any parts of the footprint hits an obstacle on the way, then return False, unless the distance given is just
-        about right to capture stones.
+        This method clears the edges of the board. Even though the board has to be 20x20, as per rule of the game,
+        only the middle 18x18 can be used. If part of a piece gets off of the 18x18 board, then that piece is gone.
+        So the way this works is that by the end of each make_move turn, it always clear the edges of the board,
+        just in case any parts of pieces were placed on the edges. Also, this is used for before a test of whether if
+        the player is trying to move his or her last ring off the board or not.
         '''
 
+        if self._shared:
+            self.own_rows(range(self._geometry.size))
 
-        ### This is a base case to stop when the next center lands on an obstacle ###
+        for i, j in self._geometry.edge_cells:     # clears the top and bottom rows and the left and right columns
+            self._board[i][j] = '-'
 
-        if self._board[new_row][new_column] != '-':                         # if the next center is occupied by a stone
-            return False
 
 
-        ### These are the base cases for stopping when the sides of the footprint hit an obstacle on the way ###
+    def clear_footprint_edges(self, new_row, new_column):
+        '''
+        This method does the same job as clear_edges, but only for the footprint that was just placed at the new
+        center. The edges are always empty before a move and the only stones that can land on them are the ones of the
+        footprint being placed, so there is no need to sweep the whole border after every move.
+        Returns the number of stones that were taken off the board.
+        '''
 
-        if self._board[old_row - 1][old_column] != '-':                      # the north side
-            if counter == distance:  # It means that the path was clear.
-                return True          # Can also capture a stone.
-            return False
+        removed = 0
 
-        if self._board[old_row + 1][old_column] != '-':                      # the south side
-            if counter == distance:  # It means that the path was clear.
-                return True          # Can also capture a stone.
-            return False
+        for i, j in self._geometry.edge_footprints.get((new_row, new_column), ()):
+            if self._board[i][j] != '-':
+                self._board[i][j] = '-'
+                removed += 1
 
-        if self._board[old_row][old_column + 1] != '-':                      # the east side
-            if counter == distance:  # It means that the path was clear.
-                return True          # Can also capture a stone.
-            return False
+        return removed
 
-        if self._board[old_row][old_column - 1] != '-':                      # the west side
-            if counter == distance:  # It means that the path was clear.
-                return True          # Can also capture a stone.
-            return False
 
-        if self._board[old_row - 1][old_column + 1] != '-':                  # the north-east side
-            if counter == distance:  # It means that the path was clear.
-                return True          # Can also capture a stone.
-            return False
 
-        if self._board[old_row - 1][old_column - 1] != '-':                  # the north-west side
-            if counter == distance:  # It means that the path was clear.
-                return True          # Can also capture a stone.
-            return False
+    def move_footprint(self, old_row, old_column, new_row, new_column):
+        '''
+        This method is kind of like the extension of the function apply_move.
+        Here, first we help check for obstacles ahead by "lifting our stones" so that we can see clear and don't mistake
+        our footprint stones around us as obstacles.
+        Second, we check our rings.
+        So after attempting to move a piece, if it was a ring being moved and if it was moved off bounds, then
+        invalidate the move and put everything back to where it was.
+        Then we also check whether we have broken a ring when we lift a piece. If we broke our last ring, put
+        everything back to where it was and invalidate the move.
+        After checking all the restrictions and if it passes all of that then it can move depending on the restrictions.
+        When moving, it saves the original footprint, clears the old footprints location, then places it into
+        the new location. It then clears the edges of debris, checks if each player's rings are still intact, if not,
+        then declare a winner, otherwise it increments the counter for player_turn to pass the turn to the next player.
+        Everything the move changes is written down in a MoveDelta while it happens, which is returned if the move
+        was made. If the move was invalid, the board is left as it was, the reason is saved for get_move_error and
+        None is returned.
+        '''
 
-        if self._board[old_row + 1][old_column + 1] != '-':                  # the south-east side
-            if counter == distance:  # It means that the path was clear.
-                return True          # Can also capture a stone.
-            return False
+        if self._shared:                                                # a copy-on-write clone copies the rows the
+            self.own_rows((old_row - 1, old_row, old_row + 1, new_row - 1, new_row, new_row + 1))   # move touches
 
-        if self._board[old_row + 1][old_column - 1] != '-':                  # the south-west side
-            if counter == distance:  # It means that the path was clear.
-                return True          # Can also capture a stone.
-            return False
+        player = self.get_player()
+        delta = MoveDelta(player, old_row, old_column, new_row, new_column)
+        delta.previous_state = self._game_state
+        before = {}                                                     # the original value of each block touched
+
+        piece = self.lift_footprint(old_row, old_column, before)        # saves the current footprint and "lifts the
+                                                                        # stones up" / clears their positions.
 
+        if self.check_if_path_clear(old_row, old_column, new_row, new_column) is False:
+            self.put_back(before)                                       # We use "lift the stones" first before checking
+            self._move_error = "OBSTACLE"                               # for obstacles ahead. If we didn't lift, we
+            return None                                                 # might step on our own foot, or our own stones.
+                                                                        # But if there is still indeed an obstacle ahead
+                                                                        # then do not go ahead with the plan
+                                                                        # and put the stones back.
 
-        ### This is a base case to stop checking when everthing was clear up to the new position. ###
+        is_ring = piece[0] == '-' and piece.count(player) == 8          # if the piece being moved is a ring
 
-        if self._board[new_row][new_column] == '-':
-            if counter == distance:
-                return True
 
+        if not is_ring:                                                 # if after we lift our stones up we noticed
+            for i, j in self._rings[player]:                            # that we broke our last ring, then put the
+                if abs(i - old_row) > 2 or abs(j - old_column) > 2:     # stones back. Lifting can only break the rings
+                    break                                               # that overlap the footprint.
+            else:
+                self.put_back(before)
+                self._move_error = "LAST_RING"
+                return None
 
-        ### These are for recursing, based on the direction going, when each block passed is clear. ###
 
-        if direction == "north":
-            return self.rec_check_if_path_clear(old_row - 1, old_column, distance, counter + 1, direction,
-                                                new_row, new_column)
+        self.place_footprint(delta, piece, before)                      # places the saved footprint into the new
+                                                                        # location, capturing whatever was there.
 
-        if direction == "south":
-            return self.rec_check_if_path_clear(old_row + 1, old_column, distance, counter + 1, direction,
-                                                new_row, new_column)
+        if is_ring and not self._rings[player]:                         # But if after the edges have been cleared,
+            self.undo_move(delta, False)                                # and we find that our ring is broken, then that
+            self._move_error = "LAST_RING"                              # must have meant that the player moved it off
+            return None                                                 # the board, so put back everything.
 
-        if direction == "east":
-            return self.rec_check_if_path_clear(old_row, old_column + 1, distance, counter + 1, direction,
-                                                new_row, new_column)
+        return self.finish_move(delta)
 
-        if direction == "west":
-            return self.rec_check_if_path_clear(old_row, old_column - 1, distance, counter + 1, direction,
-                                                new_row, new_column)
 
 
-        if direction == "north_east":
-            return self.rec_check_if_path_clear(old_row - 1, old_column + 1, distance, counter + 1, direction,
-                                                new_row, new_column)
+    def lift_footprint(self, old_row, old_column, before):
+        '''
+        This method saves the footprint at the old center and "lifts the stones up" / clears their positions.
+        The original value of each stone lifted is saved in before, so it can be put back.
+        Returns the saved footprint as a list of 9 blocks in the order of FOOTPRINT.
+        '''
 
-        if direction == "north_west":
-            return self.rec_check_if_path_clear(old_row - 1, old_column - 1, distance, counter + 1, direction,
-                                                new_row, new_column)
+        board = self._board
+        piece = []
 
-        if direction == "south_east":
-            return self.rec_check_if_path_clear(old_row + 1, old_column + 1, distance, counter + 1, direction,
-                                                new_row, new_column)
+        for i, j in self._geometry.footprints[(old_row, old_column)]:
+            stone = board[i][j]
+            piece.append(stone)
+            if stone != '-':
+                before[(i, j)] = stone
+                board[i][j] = '-'
 
-        if direction == "south_west":
-            return self.rec_check_if_path_clear(old_row + 1, old_column - 1, distance, counter + 1, direction,
-                                                new_row, new_column)
+        return piece
 
 
 
-    def check_if_path_clear(self, old_row, old_column, new_row, new_column):
+    def place_footprint(self, delta, piece, before):
         '''
-        This is a helper function for the recursive funtion: rec_check_if_path_clear.
-        It takes the current and the next positions as parameters, then pass them to the recursive funtion to
-        give the details of the footprint and the scene at the destination.
-        We also calculate the distance needed for our base case here.
-        Then we initialize a counter and pass the direction it's supposed to go to.
+        This method places the lifted footprint at the new center of the move, capturing whatever was there, and
+        clears the stones that landed on the edges. Then it writes down the blocks that really changed in the
+        MoveDelta, updates the row bitmasks and the rings.
         '''
 
+        board = self._board
+        new_row, new_column = delta.new_center
 
-        horizontal_distance = new_column - old_column                    # getting the distances
-        vertical_distance = new_row - old_row
+        for (i, j), stone in zip(self._geometry.footprints[(new_row, new_column)], piece):
+            taken = board[i][j]
+            if taken != '-':
+                delta.captured[taken] += 1
+            if taken != stone:
+                if (i, j) not in before:
+                    before[(i, j)] = taken
+                board[i][j] = stone
 
-        diagonal_distance = 0
-        if abs(horizontal_distance) == abs(vertical_distance):
-            diagonal_distance = abs(horizontal_distance)
+        delta.stones_off_board = self.clear_footprint_edges(new_row, new_column)
 
-                                                                        # here we make an exception to the recursion
-                                                                        # because one step can capture any stones.
+        masks = self._masks
+        for (i, j), stone in before.items():                            # only keeps the blocks that really changed
+            placed = board[i][j]
+            if placed != stone:
+                delta.changed.append((i, j, stone, placed))
+                if stone != '-':
+                    masks[stone][i] ^= 1 << j
+                if placed != '-':
+                    masks[placed][i] ^= 1 << j
 
-        if diagonal_distance == 1:                                      # if going only one step diagonally
-            return True
+        self.update_rings(delta, delta.old_center[0], delta.old_center[1], new_row, new_column)
 
-        if abs(vertical_distance) == 1 and horizontal_distance == 0:    # if going only one step north or south
-            return True
 
-        if vertical_distance == 0 and abs(horizontal_distance) == 1:    # if going only one step south or east
-            return True
 
+    def finish_move(self, delta):
+        '''
+        This method ends a move that has been placed: if the opponent has no more rings, the player just won the game.
+        Then it updates the hash and the stone counts, and passes the turn to the next player.
+        If nobody won, the game can still be a draw because of the repetition_limit or the max_plies of the game.
+        Returns the MoveDelta of the move.
+        '''
 
+        player = delta.player
 
-        distance = diagonal_distance                                    # I made the variable value closer for access
-        counter = 0                                                     # initializes counter
+        if not self._rings['W' if player == 'B' else 'B']:              # if the opponent has no more rings, the player
+            self._game_state = "BLACK_WON" if player == 'B' else "WHITE_WON"     # just won the game.
 
+        self.update_hash(delta)
 
-        ### Here we list the right recursive functions based on the direction of where our piece is supposed to go ###
+        self._stones[player] -= delta.stones_off_board
+        self._stones['B'] -= delta.captured['B']
+        self._stones['W'] -= delta.captured['W']
 
-        if horizontal_distance == 0 and vertical_distance < 0:          # if trying to go north
-            direction = "north"
-            return self.rec_check_if_path_clear(old_row, old_column, abs(vertical_distance), counter, direction,
-                                                new_row, new_column)
+        self._player_turn += 1
 
-        if horizontal_distance == 0 and vertical_distance > 0:          # if trying to go south
-            direction = "south"
-            return self.rec_check_if_path_clear(old_row, old_column, abs(vertical_distance), counter, direction,
-                                                new_row, new_column)
+        position_hash = self._hashes[0]
+        seen = self._history.get(position_hash, 0) + 1
+        self._history[position_hash] = seen
 
+        if self._game_state == "UNFINISHED":
+            if self._repetition_limit is not None and seen >= self._repetition_limit:
+                self._game_state = "DRAW"
+            elif self._max_plies is not None and self._player_turn >= self._max_plies:
+                self._game_state = "DRAW"
+        delta.previous_move = self._last_move
+        delta.previous_error = self._move_error
+        self._last_move = delta
+        self._move_error = None
 
-        if vertical_distance == 0 and horizontal_distance > 0:          # if trying to go east
-            direction = "east"
-            return self.rec_check_if_path_clear(old_row, old_column, abs(horizontal_distance), counter, direction,
-                                                new_row, new_column)
+        if self._attacks is not None:
+            self.note_attack_changes(delta)
+        if self._move_lists is not None:
+            self.note_move_changes(delta)
 
-        if vertical_distance == 0 and horizontal_distance < 0:          # if trying to go west
-            direction = "west"
-            return self.rec_check_if_path_clear(old_row, old_column, abs(horizontal_distance), counter, direction,
-                                                new_row, new_column)
+        return delta
 
 
-        if vertical_distance < 0 and horizontal_distance > 0:           # if trying to go north-east
-            direction = "north_east"
-            return self.rec_check_if_path_clear(old_row, old_column, distance, counter, direction,
-                                                new_row, new_column)
 
-        if vertical_distance < 0 and horizontal_distance < 0:           # if trying to go north-west
-            direction = "north_west"
-            return self.rec_check_if_path_clear(old_row, old_column, distance, counter, direction,
-                                                new_row, new_column)
+    def apply_trusted_move(self, old_row, old_column, new_row, new_column):
+        '''
+        This method makes a move that is already known to be valid, like a move from generate_moves or from a game
+        that was checked before, without checking any of the restrictions. It only lifts the footprint, places it,
+        clears the edges and updates the game state, so it is much faster than apply_move.
+        Making a move that isn't valid this way leaves the game in a position the rules could never reach.
+        Returns the MoveDelta of the move.
+        '''
 
-        if vertical_distance > 0 and horizontal_distance > 0:           # if trying to go south-east
-            direction = "south_east"
-            return self.rec_check_if_path_clear(old_row, old_column, distance, counter, direction,
-                                                new_row, new_column)
+        if self._shared:
+            self.own_rows((old_row - 1, old_row, old_row + 1, new_row - 1, new_row, new_row + 1))
 
+        delta = MoveDelta(self.get_player(), old_row, old_column, new_row, new_column)
+        delta.previous_state = self._game_state
+        before = {}
 
-        if vertical_distance > 0 and horizontal_distance < 0:           # if trying to go south-west
-            direction = "south_west"
-            return self.rec_check_if_path_clear(old_row, old_column, distance, counter, direction,
-                                                new_row, new_column)
+        piece = self.lift_footprint(old_row, old_column, before)
+        self.place_footprint(delta, piece, before)
 
+        return self.finish_move(delta)
 
 
 
-    def check_if_can_capture(self, old_row, old_column, new_row, new_column):
+    def put_back(self, before):
         '''
-        This method takes the current position and the next position as parameters to determine the direction.
-        We also need to know where the footprint is going because apparently the rules for capturing stones
-        when moving diagonal and moving straight, are different.
-        When moving straight (north, south, east, west), we can capture stones only by the front row of our 3x3.
-        If our "middle layer" (the center and the two sides beside it, depending on the direction) overlaps on
-        obstacle, then it will return False because it can't catch further.
-        As for diagonal moves, we can capture stones as long as the center of the footprint doesn't overlap with
-        an obstacle, so the "wings" and the "head" all can capture stones.
-        Also, we make an exception when moving only one block because the way this method mainly works is that it
-        tries to see the new location if it has any obstacles and see if the center can safely land there. In the
-        case of moving one block, however, if there are any stone in the front row of our 3x3 footprint, then
-        it sees that there's an "obstacle" although it's probably just looking at its own stone.
-        So this returns False for any illegal overlaps.
+        This is a method used for putting the lifted stones back when a move turns out to be invalid.
+        It takes the saved original values of the blocks and writes them back on the board.
         '''
 
-        horizontal_distance = new_column - old_column
-        vertical_distance = new_row - old_row
+        for (i, j), stone in before.items():
+            self._board[i][j] = stone
 
 
-        if vertical_distance < 0 and horizontal_distance == 0:    # if trying to go north
-            if self._board[new_row][new_column] == '-':           # if the next center has no obstacle, but
-                if self._board[new_row][new_column-1] != '-' or self._board[new_row][new_column+1] != '-':
-                    return False                                  # if there is an obstacle at the side wings
-            if self._board[new_row][new_column] != '-':           # then cannot catch further.
-                if vertical_distance == -1:                       # if only moving one step, because it's safe to catch
-                    return True                                   # with just the "frontline"
-                return False
 
-        elif vertical_distance > 0 and horizontal_distance == 0:  # if trying to go south
-            if self._board[new_row][new_column] == '-':           # if the next center has no obstacle, but
-                if self._board[new_row][new_column-1] != '-' or self._board[new_row][new_column+1] != '-':
-                    return False                                  # if there is an obstacle at the side wings
-            if self._board[new_row][new_column] != '-':           # then cannot catch further.
-                if vertical_distance == 1:                        # if only moving one step, because it's safe to catch
-                    return True                                   # with just the "frontline"
-                return False
+    def find_rings(self, player):
+        '''
+        This method scans the whole board and returns the set of centers of the player's intact rings.
+        It is used when a game is set up, after that the rings are kept up to date by update_rings.
+        '''
 
-        elif vertical_distance == 0 and horizontal_distance > 0:  # if trying to go east
-            if self._board[new_row][new_column] == '-':           # if the next center has no obstacle, but
-                if self._board[new_row-1][new_column] != '-' or self._board[new_row+1][new_column] != '-':
-                    return False                                  # if there is an obstacle at the side wings
-            if self._board[new_row][new_column] != '-':           # then cannot catch further.
-                if horizontal_distance == 1:                      # if only moving one step, because it's safe to catch
-                    return True                                   # with just the "frontline"
-                return False
+        rings = set()
+        for i, j in self._geometry.ring_centers:
+            if self.is_ring(i, j, player):
+                rings.add((i, j))
 
-        elif vertical_distance == 0 and horizontal_distance < 0:  # if trying to go west
-            if self._board[new_row][new_column] == '-':           # if the next center has no obstacle, but
-                if self._board[new_row-1][new_column] != '-' or self._board[new_row+1][new_column] != '-':
-                    return False                                  # if there is an obstacle at the side wings
-            if self._board[new_row][new_column] != '-':           # then cannot catch further.
-                if horizontal_distance == -1:                     # if only moving one step, because it's safe to catch
-                    return True                                   # with just the "frontline"
-                return False
+        return rings
 
-        else:                                                               # if it's going diagonal. Where it can
-            if self._board[new_row][new_column] != '-':                     # capture with the "wings" and the "head"
 
-                if vertical_distance == -1 and horizontal_distance == 1:    # if only moving one step north-east
-                    return True
-                if vertical_distance == -1 and horizontal_distance == -1:   # if only moving one step north-west
-                    return True
-                if vertical_distance == 1 and horizontal_distance == 1:     # if only moving one step south-east
-                    return True
-                if vertical_distance == 1 and horizontal_distance == -1:    # if only moving one step south-west
-                    return True
-                return False
+
+    def is_ring(self, row, column, player):
+        '''
+        Returns True if there is a ring of the player's stones around the given center, otherwise False.
+        A ring is an empty center surrounded by eight of the player's stones.
+        '''
+
+        board = self._board
+
+        return (
+            board[row][column] == '-' and
+            board[row - 1][column] == player and
+            board[row + 1][column] == player and
+            board[row][column + 1] == player and
+            board[row][column - 1] == player and
+            board[row - 1][column + 1] == player and
+            board[row - 1][column - 1] == player and
+            board[row + 1][column + 1] == player and
+            board[row + 1][column - 1] == player
+        )
 
 
 
-    def clear_current_piece(self, old_row, old_column):
+    def update_rings(self, delta, old_row, old_column, new_row, new_column):
         '''
-        This is a method used while "moving" a piece. When moving a piece, it saves the original 3x3 footprint,
-        clears its old position, then the saved footprint is then placed in the new location.
-        So this method is used for clearing those old positions of the footprint .
-        It's like when you lift your stones with your hands,
-        then there's nothing at their respective positions on the board.
+        This method keeps the sets of ring centers up to date after a move.
+        Only the rings that overlap the old or the new footprint can be made or broken by a move, so only the
+        centers near them are checked again, by comparing the pattern of each player's stones around them with
+        RING_PATTERN. The rings that were made or broken are written down in the MoveDelta.
         '''
 
-        self._board[old_row][old_column] = '-'                  # clears the center
-        self._board[old_row - 1][old_column] = '-'              # clears the north side
-        self._board[old_row + 1][old_column] = '-'              # clears the south side
-        self._board[old_row][old_column + 1] = '-'              # clears the east side
-        self._board[old_row][old_column - 1] = '-'              # clears the west side
-        self._board[old_row - 1][old_column + 1] = '-'          # clears the north-east side
-        self._board[old_row - 1][old_column - 1] = '-'          # clears the north-west side
-        self._board[old_row + 1][old_column + 1] = '-'          # clears the south-east side
-        self._board[old_row + 1][old_column - 1] = '-'          # clears the south-west side
+        nearby = self._geometry.ring_neighbors
+        centers = set(nearby[(old_row, old_column)])
+        centers.update(nearby[(new_row, new_column)])
 
+        black = self._masks['B']
+        white = self._masks['W']
 
+        for center in centers:
+            row, column = center
+            shift = column - 1
+            black_pattern = (((black[row - 1] >> shift) & 7) | (((black[row] >> shift) & 7) << 3) |
+                             (((black[row + 1] >> shift) & 7) << 6))
+            white_pattern = (((white[row - 1] >> shift) & 7) | (((white[row] >> shift) & 7) << 3) |
+                             (((white[row + 1] >> shift) & 7) << 6))
 
-    def clear_edges(self):
+            for player, pattern, other in (('B', black_pattern, white_pattern), ('W', white_pattern, black_pattern)):
+                rings = self._rings[player]
+                if pattern == RING_PATTERN and not other & CENTER_BIT:
+                    if center not in rings:
+                        rings.add(center)
+                        delta.rings_created.append((player, center))
+                elif center in rings:
+                    rings.discard(center)
+                    delta.rings_destroyed.append((player, center))
+
+
+
+    def undo_move(self, delta, pass_turn=True):
         '''
-        This method clears the edges of the board. Even though the board has to be 20x20, as per rule of the game,
-        only the middle 18x18 can be used. If part of a piece gets off of the 18x18 board, then that piece is gone.
-        So the way this works is that by the end of each make_move turn, it always clear the edges of the board,
-        just in case any parts of pieces were placed on the edges. Also, this is used for before a test of whether if
-        the player is trying to move his or her last ring off the board or not.
+        This method takes back a move using its MoveDelta, so engines can try a move and take it back without
+        copying the whole game. It puts back every changed block, the rings, the game state, the last move and the
+        reason of the last refused move.
+        The pass_turn parameter is only False while taking back a move that never passed the turn.
         '''
 
-        for i in range(0, 20):  # clears top row
-            self._board[0][i] = '-'
+        if self._shared:
+            old_row = delta.old_center[0]
+            new_row = delta.new_center[0]
+            self.own_rows((old_row - 1, old_row, old_row + 1, new_row - 1, new_row, new_row + 1))
 
-        for i in range(0, 20):  # clears bottom row
-            self._board[19][i] = '-'
+        masks = self._masks
+        for i, j, stone, placed in delta.changed:
+            self._board[i][j] = stone
+            if stone != '-':
+                masks[stone][i] ^= 1 << j
+            if placed != '-':
+                masks[placed][i] ^= 1 << j
 
-        for i in range(0, 20):  # clears left column
-            self._board[i][0] = '-'
+        for player, center in delta.rings_created:
+            self._rings[player].discard(center)
 
-        for i in range(0, 20):  # clears right column
-            self._board[i][19] = '-'
+        for player, center in delta.rings_destroyed:
+            self._rings[player].add(center)
 
+        self._game_state = delta.previous_state
 
+        if pass_turn:
+            position_hash = self._hashes[0]             # the position being taken back came up one time less
+            seen = self._history[position_hash] - 1
+            if seen:
+                self._history[position_hash] = seen
+            else:
+                del self._history[position_hash]
 
-    def move_footprint(self, old_row, old_column, new_row, new_column):
+            self.update_hash(delta)
+
+            self._stones[delta.player] += delta.stones_off_board
+            self._stones['B'] += delta.captured['B']
+            self._stones['W'] += delta.captured['W']
+
+            self._player_turn -= 1
+            self._last_move = delta.previous_move
+            self._move_error = delta.previous_error
+
+            if self._attacks is not None:
+                self.note_attack_changes(delta)
+            if self._move_lists is not None:
+                self.note_move_changes(delta)
+
+
+
+    def compute_hash(self, symmetry=0):
         '''
-        This method is kind of like the extension of the function make_move.
-        Here, first we help check for obstacles ahead by "lifting our stones" so that we can see clear and don't mistake
-        our footprint stones around us as obstacles.
-        Second, we check our rings.
-        So after attempting to move a piece, if it was a ring being moved and if it was moved off bounds, then
-        invalidate the move and put everything back to where it was.
-        Then we also check whether we have broken a ring when we lift a piece. If we broke our last ring, put
-        everything back to where it was and invalidate the move by returning False.
-        After checking all the restrictions and if it passes all of that then it can move depending on the restrictions.
-        When moving, it saves the original footprint into temp, clears the old footprints location, then places it into
-        the new location. It then clears the edges of debris, checks if each player's rings are still intact, if not,
-        then declare a winner, otherwise it increments the counter for player_turn to pass the turn to the next player.
+        This method works out the hash of the position from scratch, by mixing the random key of every stone on the
+        board and the key of the player to move. Moves keep the hash up to date with update_hash, so this is only
+        needed when a game is set up.
+        With a symmetry, it gives the hash of the position seen through that symmetry instead.
         '''
 
+        keys = self._geometry.symmetric_zobrist[symmetry]
+        position_hash = 0
+
+        for i, row in enumerate(self._board):
+            for j, stone in enumerate(row):
+                if stone != '-':
+                    position_hash ^= keys[stone][i][j]
 
-        ### Saves the current footprint to temp. ###
+        white_to_move = self._player_turn % 2 == 1      # if it's white player's turn
+        if symmetry & COLOR_FLIP:
+            white_to_move = not white_to_move
+        if white_to_move:
+            position_hash ^= self._geometry.side_key
 
-        center = self._board[old_row][old_column]
-        north = self._board[old_row - 1][old_column]
-        south = self._board[old_row + 1][old_column]
-        east = self._board[old_row][old_column + 1]
-        west = self._board[old_row][old_column - 1]
-        north_east = self._board[old_row - 1][old_column + 1]
-        north_west = self._board[old_row - 1][old_column - 1]
-        south_east = self._board[old_row + 1][old_column + 1]
-        south_west = self._board[old_row + 1][old_column - 1]
+        return position_hash
 
 
-        ### Saves the prospective footprint to another temp. ###
 
-        new_center = self._board[new_row][new_column]
-        new_north = self._board[new_row - 1][new_column]
-        new_south = self._board[new_row + 1][new_column]
-        new_east = self._board[new_row][new_column + 1]
-        new_west = self._board[new_row][new_column - 1]
-        new_north_east = self._board[new_row - 1][new_column + 1]
-        new_north_west = self._board[new_row - 1][new_column - 1]
-        new_south_east = self._board[new_row + 1][new_column + 1]
-        new_south_west = self._board[new_row + 1][new_column - 1]
+    def update_hash(self, delta):
+        '''
+        This method mixes the blocks a move changed and the change of turn into the hash of the position, and into
+        the hashes of the position seen through each symmetry.
+        Mixing the same move in again takes it back out, so it is used for both making and taking back a move.
+        '''
 
+        side_key = self._geometry.side_key
+        keys, mirror_keys, flip_keys, both_keys = self._geometry.symmetric_zobrist
+        position_hash, mirror_hash, flip_hash, both_hash = self._hashes
 
-        self.clear_current_piece(old_row, old_column)                   # "lift the stones up" / clear their positions
+        position_hash ^= side_key
+        mirror_hash ^= side_key
+        flip_hash ^= side_key
+        both_hash ^= side_key
 
+        for i, j, stone, placed in delta.changed:
+            if stone != '-':
+                position_hash ^= keys[stone][i][j]
+                mirror_hash ^= mirror_keys[stone][i][j]
+                flip_hash ^= flip_keys[stone][i][j]
+                both_hash ^= both_keys[stone][i][j]
+            if placed != '-':
+                position_hash ^= keys[placed][i][j]
+                mirror_hash ^= mirror_keys[placed][i][j]
+                flip_hash ^= flip_keys[placed][i][j]
+                both_hash ^= both_keys[placed][i][j]
 
-        if self.check_if_path_clear(old_row, old_column, new_row, new_column) is False:
+        self._hashes = [position_hash, mirror_hash, flip_hash, both_hash]
 
-            self._board[old_row][old_column] = center                   # We use "lift the stones" first before checking
-            self._board[old_row - 1][old_column] = north                # for obstacles ahead. If we didn't lift, we
-            self._board[old_row + 1][old_column] = south                # might step on our own foot, or our own stones.
-            self._board[old_row][old_column + 1] = east                 # But if there is still indeed an obstacle ahead
-            self._board[old_row][old_column - 1] = west                 # then do not go ahead with the plan
-            self._board[old_row - 1][old_column + 1] = north_east       # and put the stones back.
-            self._board[old_row - 1][old_column - 1] = north_west
-            self._board[old_row + 1][old_column + 1] = south_east
-            self._board[old_row + 1][old_column - 1] = south_west
-
-            print("Obstacle ahead, can't get through.")
-            return False
 
 
-        ### if it's the black player's turn. ###
-
-        if self._player_turn % 2 == 0:
-            if (
-                    (center == '-') and                                 # if the piece being moved is a ring
-                    (north == 'B') and
-                    (south == 'B') and
-                    (east == 'B') and
-                    (west == 'B') and
-                    (north_east == 'B') and
-                    (north_west == 'B') and
-                    (south_east == 'B') and
-                    (south_west == 'B')
-            ):
-
-                self._board[new_row][new_column] = center               # Go ahead first and put it to the new position.
-                self._board[new_row - 1][new_column] = north
-                self._board[new_row + 1][new_column] = south
-                self._board[new_row][new_column + 1] = east
-                self._board[new_row][new_column - 1] = west
-                self._board[new_row - 1][new_column + 1] = north_east
-                self._board[new_row - 1][new_column - 1] = north_west
-                self._board[new_row + 1][new_column + 1] = south_east
-                self._board[new_row + 1][new_column - 1] = south_west
-
-                self.clear_edges()                                      # But if after the edges have been cleared,
-                                                                        # and we find that our ring is broken, then that
-                if self.check_own_rings() == False:                     # must have meant that the player moved it off
-                                                                        # the board.
-                    self._board[old_row][old_column] = center           # If so, put back everything in its original
-                    self._board[old_row - 1][old_column] = north        # position and return False.
-                    self._board[old_row + 1][old_column] = south        # If it didn't go off the board, execute the
-                    self._board[old_row][old_column + 1] = east         # move, update the game status, pass the turn
-                    self._board[old_row][old_column - 1] = west         # to the next player, then return True.
-                    self._board[old_row - 1][old_column + 1] = north_east
-                    self._board[old_row - 1][old_column - 1] = north_west
-                    self._board[old_row + 1][old_column + 1] = south_east
-                    self._board[old_row + 1][old_column - 1] = south_west
-
-                    self._board[new_row][new_column] = new_center
-                    self._board[new_row - 1][new_column] = new_north
-                    self._board[new_row + 1][new_column] = new_south
-                    self._board[new_row][new_column + 1] = new_east
-                    self._board[new_row][new_column - 1] = new_west
-                    self._board[new_row - 1][new_column + 1] = new_north_east
-                    self._board[new_row - 1][new_column - 1] = new_north_west
-                    self._board[new_row + 1][new_column + 1] = new_south_east
-                    self._board[new_row + 1][new_column - 1] = new_south_west
+    def get_position_hash(self):
+        '''
+        Returns the 64-bit hash of the position, which includes the player to move.
+        '''
 
-                    return False
+        return self._hashes[0]
 
-                self.update_game_status()
-
-                self._player_turn += 1
-
-                for i in game._board:
-                    print(i)
-
-                return True
-
-
-        ### if it's the white player's turn. ###
-
-        if self._player_turn % 2 == 1:
-            if (
-                    (center == '-') and                                 # if the piece being moved is a ring
-                    (north == 'W') and
-                    (south == 'W') and
-                    (east == 'W') and
-                    (west == 'W') and
-                    (north_east == 'W') and
-                    (north_west == 'W') and
-                    (south_east == 'W') and
-                    (south_west == 'W')
-            ):
-
-                self._board[new_row][new_column] = center               # Go ahead first and put it to the new position
-                self._board[new_row - 1][new_column] = north
-                self._board[new_row + 1][new_column] = south
-                self._board[new_row][new_column + 1] = east
-                self._board[new_row][new_column - 1] = west
-                self._board[new_row - 1][new_column + 1] = north_east
-                self._board[new_row - 1][new_column - 1] = north_west
-                self._board[new_row + 1][new_column + 1] = south_east
-                self._board[new_row + 1][new_column - 1] = south_west
-
-                self.clear_edges()                                      # But if after the edges have been cleared,
-                                                                        # and we find that our ring is broken, then that
-                if self.check_own_rings() == False:                     # must have meant that the player moved it off
-                                                                        # the board.
-                    self._board[old_row][old_column] = center           # If so, put back everything in its original
-                    self._board[old_row - 1][old_column] = north        # position and return False.
-                    self._board[old_row + 1][old_column] = south        # If it didn't go off the board, execute the
-                    self._board[old_row][old_column + 1] = east         # move, update the game status, pass the turn
-                    self._board[old_row][old_column - 1] = west         # to the next player, then return True.
-                    self._board[old_row - 1][old_column + 1] = north_east
-                    self._board[old_row - 1][old_column - 1] = north_west
-                    self._board[old_row + 1][old_column + 1] = south_east
-                    self._board[old_row + 1][old_column - 1] = south_west
-
-                    self._board[new_row][new_column] = new_center
-                    self._board[new_row - 1][new_column] = new_north
-                    self._board[new_row + 1][new_column] = new_south
-                    self._board[new_row][new_column + 1] = new_east
-                    self._board[new_row][new_column - 1] = new_west
-                    self._board[new_row - 1][new_column + 1] = new_north_east
-                    self._board[new_row - 1][new_column - 1] = new_north_west
-                    self._board[new_row + 1][new_column + 1] = new_south_east
-                    self._board[new_row + 1][new_column - 1] = new_south_west
 
-                    return False
 
-                self.update_game_status()
+    def get_canonical_hash(self):
+        '''
+        Returns (hash, symmetry) for the smallest of the hashes of the position seen through each symmetry.
+        Positions that are the same up to a symmetry get the same canonical hash, so tables keyed by it only keep
+        one of them. The symmetry tells how to turn moves of this position into moves of the canonical one
+        (with transform_move), and back, since each symmetry undoes itself.
+        '''
 
-                self._player_turn += 1
+        hashes = self._hashes
+        symmetry = 0
+        for number in (1, 2, 3):
+            if hashes[number] < hashes[symmetry]:
+                symmetry = number
 
-                for i in game._board:
-                    print(i)
+        return hashes[symmetry], symmetry
 
-                return True
 
 
-        if self._player_turn % 2 == 0:                                  # if it's black player's turn
+    def to_canonical_compact(self, symmetry=None):
+        '''
+        Returns (compact, symmetry) for the position seen through the symmetry of get_canonical_hash (or the given
+        symmetry), in the format of to_compact. When the colors are flipped, the player turn counter is moved by one
+        so it still matches the player to move.
+        '''
 
-            if self.check_own_rings() == False:                         # if after we lift our stones up and then we
-                                                                        # we noticed that we broke our ring,
-                self._board[old_row][old_column] = center               # then put the stones back and return False
-                self._board[old_row - 1][old_column] = north
-                self._board[old_row + 1][old_column] = south
-                self._board[old_row][old_column + 1] = east
-                self._board[old_row][old_column - 1] = west
-                self._board[old_row - 1][old_column + 1] = north_east
-                self._board[old_row - 1][old_column - 1] = north_west
-                self._board[old_row + 1][old_column + 1] = south_east
-                self._board[old_row + 1][old_column - 1] = south_west
+        if symmetry is None:
+            symmetry = self.get_canonical_hash()[1]
 
-                return False
+        compact = self.to_compact()
+        if not symmetry:
+            return compact, symmetry
 
-        if self._player_turn % 2 == 1:                                  # if it's white player's turn
+        size, player, turn, rows = compact.split(':')
+        rows = rows.split('/')
+        if symmetry & COLOR_FLIP:
+            rows.reverse()
+            rows = [row.replace('B', '?').replace('W', 'B').replace('?', 'W') for row in rows]
+            player = 'w' if player == 'b' else 'b'
+            turn = str(int(turn) + 1)
+        if symmetry & MIRROR:
+            rows = [mirror_compact_row(row) for row in rows]
 
-            if self.check_own_rings() == False:                         # if after we lift our stones up and then we
-                                                                        # we noticed that we broke our ring,
-                self._board[old_row][old_column] = center               # then put the stones back and return False
-                self._board[old_row - 1][old_column] = north
-                self._board[old_row + 1][old_column] = south
-                self._board[old_row][old_column + 1] = east
-                self._board[old_row][old_column - 1] = west
-                self._board[old_row - 1][old_column + 1] = north_east
-                self._board[old_row - 1][old_column - 1] = north_west
-                self._board[old_row + 1][old_column + 1] = south_east
-                self._board[old_row + 1][old_column - 1] = south_west
+        return ':'.join((size, player, turn, '/'.join(rows))), symmetry
 
-                return False
 
-        self._board[new_row][new_column] = center                       # If everything else is good, then execute the
-        self._board[new_row - 1][new_column] = north                    # move, update the game status, pass the turn
-        self._board[new_row + 1][new_column] = south                    # to the next player, then return True.
-        self._board[new_row][new_column + 1] = east
-        self._board[new_row][new_column - 1] = west
-        self._board[new_row - 1][new_column + 1] = north_east
-        self._board[new_row - 1][new_column - 1] = north_west
-        self._board[new_row + 1][new_column + 1] = south_east
-        self._board[new_row + 1][new_column - 1] = south_west
 
-        self.clear_edges()
+    def get_stone_count(self, player):
+        '''
+        Returns the number of stones the player ("B" or "W") has on the board.
+        '''
 
-        self.update_game_status()
+        return self._stones[player]
 
-        self._player_turn += 1
 
-        for i in game._board:
-            print(i)
 
-        return True
+    def get_rings(self, player):
+        '''
+        Returns the set of centers of the player's intact rings. The set belongs to the game, so don't change it.
+        '''
+
+        return self._rings[player]
+
+
+
+    def get_row_masks(self, player):
+        '''
+        Returns a copy of the player's stones as one bitmask per row, with bit j set if there is a stone in column j.
+        '''
+
+        return self._masks[player][:]
+
+
+
+    def generate_moves(self, codes=False, captures_only=False):
+        '''
+        This method lists every valid move of the player whose turn it is, as (old_row, old_column, new_row, new_column)
+        tuples, without trying each move on the board (see find_center_moves).
+        With codes, the moves are listed as numbers from encode_move in an array instead (see generate_move_codes).
+        With captures_only, only the moves that capture stones or could break a ring are listed, and the quiet moves
+        are skipped before they are ever built (see generate_capture_codes).
+        '''
+
+        if codes:
+            moves = array(self._geometry.move_typecode)
+        else:
+            moves = []
+
+        if self._game_state != "UNFINISHED":
+            return moves
+
+        for row, column in self._geometry.ring_centers:
+            found = self.find_center_moves(row, column, codes, None, captures_only)
+            if found:
+                moves.extend(found)
+
+        return moves
+
+
+
+    def find_center_moves(self, row, column, codes=False, reads=None, captures_only=False):
+        '''
+        This method lists the valid moves of the footprint at the center for the player whose turn it is.
+        A footprint can only move if it has no opponent's stones and has a stone pointing to the direction, which is
+        one lookup in PATTERNS for the pattern of the player's stones around each center.
+        Then it walks the ray of each direction: one step is always fine, and after that, the blocks the footprint
+        sweeps over have to be empty, which covers both the obstacles ahead and the stones it can't catch.
+        Once a step is blocked every step after it is blocked too, so the walk stops there.
+        A footprint without a center stone stops after 3 blocks.
+        A piece that isn't a ring can't move at all if lifting it breaks the player's last ring, and a ring that is
+        the player's last one is only tried on the board when part of it would land on the edges (the reason of the
+        last refused move is put back afterwards).
+        Returns a list of move tuples, or of move numbers with codes, or None if the footprint can't move.
+        If a reads list is given, the blocks looked at on the rays are added to it, and so is RINGS if the answer
+        depended on the player's rings (see get_legal_moves).
+        With captures_only, a move is only listed if there is an opponent's stone under the footprint at the new
+        center, or the footprint covers the center of one of the opponent's rings (where placing a stone breaks it).
+        '''
+
+        player = self.get_player()
+
+        if player == 'B':
+            own = self._masks['B']
+            opponent = self._masks['W']
+        else:
+            own = self._masks['W']
+            opponent = self._masks['B']
+
+        shift = column - 1
+        if (((opponent[row - 1] >> shift) & 7) or ((opponent[row] >> shift) & 7) or
+                ((opponent[row + 1] >> shift) & 7)):                # if the footprint has an opponent's stone
+            return None
+
+        allowed, has_center, max_distance, is_ring = PATTERNS[
+            ((own[row - 1] >> shift) & 7) | (((own[row] >> shift) & 7) << 3) | (((own[row + 1] >> shift) & 7) << 6)
+        ]
+        if not allowed:                                             # no stone pointing to any direction
+            return None
+
+        if reads is not None:
+            reads.append(RINGS)
+
+        keeps_ring = False                                          # if the player still has a ring after lifting
+        for i, j in self._rings[player]:
+            if abs(i - row) > 2 or abs(j - column) > 2:
+                keeps_ring = True
+                break
+
+        if not is_ring and not keeps_ring:
+            return None
+
+        board = self._board
+        geometry = self._geometry
+        opponent_rings = self._rings['W' if player == 'B' else 'B']
+        moves = []
+
+        for number, (direction, row_step, column_step) in enumerate(DIRECTIONS):
+            if not allowed & (1 << number):                         # no stone pointing to that direction
+                continue
+
+            ray = geometry.rays[(row, column, direction)]
+            limit = len(ray)
+            if limit > max_distance:
+                limit = max_distance
+
+            for step in range(limit):
+                new_row, new_column, cells = ray[step]
+
+                blocked = False
+                for i, j in cells:
+                    if reads is not None:
+                        reads.append((i, j))
+                    if board[i][j] != '-':
+                        blocked = True
+                        break
+                if blocked:
+                    break
+
+                if captures_only:
+                    target_shift = new_column - 1
+                    if not (((opponent[new_row - 1] >> target_shift) & 7) or
+                            ((opponent[new_row] >> target_shift) & 7) or
+                            ((opponent[new_row + 1] >> target_shift) & 7)):
+                        for i, j in opponent_rings:
+                            if abs(i - new_row) <= 1 and abs(j - new_column) <= 1:
+                                break
+                        else:
+                            continue
+
+                if is_ring and not keeps_ring and (new_row, new_column) in geometry.edge_footprints:
+                    move_error = self._move_error                   # trying the move mustn't change the reason of
+                    delta = self.apply_move(row, column, new_row, new_column)   # the last move really refused
+                    if delta is not None:
+                        self.undo_move(delta)
+                    self._move_error = move_error
+                    if delta is None:
+                        continue
+
+                if codes:
+                    moves.append(geometry.ray_codes[(row, column, direction)][step])
+                else:
+                    moves.append((row, column, new_row, new_column))
+
+        return moves
+
+
+
+    def generate_move_codes(self):
+        '''
+        Returns every valid move of the player whose turn it is as an array of 16-bit numbers from encode_move
+        (32-bit on boards bigger than 22x22), which takes much less memory than a list of tuples and makes no new
+        objects for the moves. decode_move turns a number back into the move.
+        '''
+
+        return self.generate_moves(True)
+
+
+
+    def generate_capture_codes(self):
+        '''
+        Returns only the valid moves that capture stones or could break one of the opponent's rings, as an array of
+        numbers from encode_move, for searches that only look at the captures (like a quiescence search).
+        '''
+
+        return self.generate_moves(True, True)
+
+
+
+    def get_legal_moves(self, check=False):
+        '''
+        Returns the same moves as generate_move_codes, but keeps the moves of each center between calls, so after a
+        move only the centers whose moves could have changed are listed again. Those are the centers whose footprint
+        covers a changed block, and the ones whose rays looked at a changed block the last time they were listed
+        (find_center_moves says which blocks it looked at). A ray stops at the first block in the way, so a change
+        behind it doesn't matter, which keeps the number of centers listed again about the same however full the
+        board is.
+        Each player's moves are kept separately, since they are listed on that player's turn. When a move makes or
+        breaks one of the player's rings, the centers that depended on the rings (RINGS) are listed again too, and
+        the player's ring centers are always listed again, since a last ring may be tried on the board.
+        With check, the list is also compared with a full generate_move_codes, and a RuntimeError is raised if they
+        differ, which is meant for debugging.
+        '''
+
+        geometry = self._geometry
+        player = self.get_player()
+        moves = array(geometry.move_typecode)
+
+        if self._game_state == "UNFINISHED":
+            if self._move_lists is None:
+                self._move_lists = {'B': None, 'W': None}
+                self._move_changes = {'B': set(), 'W': set()}
+
+            changes = self._move_changes[player]
+            kept = self._move_lists[player]
+
+            if kept is None:
+                kept = ({}, {}, {})
+                self._move_lists[player] = kept
+                centers = geometry.ring_centers
+            elif changes:
+                readers = kept[2]
+                covering = geometry.covering_centers
+                centers = set(self._rings[player])
+                for cell in changes:
+                    centers.update(covering.get(cell, ()))
+                    found = readers.get(cell)
+                    if found:
+                        centers.update(found)
+            else:
+                centers = ()
+
+            saved, reads, readers = kept
+            for center in centers:
+                for cell in reads.get(center, ()):              # forget what it looked at last time
+                    readers[cell].discard(center)
+
+                looked_at = []
+                saved[center] = self.find_center_moves(center[0], center[1], True, looked_at)
+                reads[center] = looked_at
+                for cell in looked_at:
+                    found = readers.get(cell)
+                    if found is None:
+                        readers[cell] = set((center,))
+                    else:
+                        found.add(center)
+
+            changes.clear()
+
+            for center in geometry.ring_centers:
+                found = saved[center]
+                if found:
+                    moves.extend(found)
+
+        if check and moves != self.generate_move_codes():
+            raise RuntimeError("The kept move list doesn't match generate_move_codes in " + self.to_compact())
+
+        return moves
+
+
+
+    def note_move_changes(self, delta):
+        '''
+        This method is called after each move (and each move taken back) once the move lists are kept, to remember
+        which blocks changed for both players, and whose rings changed.
+        '''
+
+        changed = [(i, j) for i, j, stone, placed in delta.changed]
+        self._move_changes['B'].update(changed)
+        self._move_changes['W'].update(changed)
+
+        for player, center in delta.rings_created:
+            self._move_changes[player].add(RINGS)
+        for player, center in delta.rings_destroyed:
+            self._move_changes[player].add(RINGS)
+
+
+
+    def get_capture_counts(self, moves):
+        '''
+        Returns a list with the number of opponent's stones each move (as a number from encode_move) would capture,
+        which is what check_if_can_capture looks at: the opponent's stones under the footprint at the new center.
+        A footprint that can move never has an opponent's stone itself, so they are all captured.
+        '''
+
+        targets = self._geometry.get_move_targets()
+        opponent = self._masks['W' if self._player_turn % 2 == 0 else 'B']
+        counts = []
+
+        for code in moves:
+            row, column = targets[code]
+            shift = column - 1
+            counts.append(STONE_COUNTS[(opponent[row - 1] >> shift) & 7] + STONE_COUNTS[(opponent[row] >> shift) & 7] +
+                          STONE_COUNTS[(opponent[row + 1] >> shift) & 7])
+
+        return counts
+
+
+
+    def get_move_code(self, old_position, new_position):
+        '''
+        Returns the number of a move written with coordinates like the ones make_move takes, like ('e14', 'g14').
+        '''
+
+        return encode_move(self.get_row(old_position), self.get_column(old_position),
+                           self.get_row(new_position), self.get_column(new_position), self._geometry.size)
+
+
+
+    def get_move_positions(self, code):
+        '''
+        Returns the coordinates of a move number, like ('e14', 'g14'), as make_move takes them.
+        '''
+
+        old_row, old_column, new_row, new_column = decode_move(code, self._geometry.size)
+
+        return self.get_coordinates(old_row, old_column), self.get_coordinates(new_row, new_column)
+
+
+
+    def get_move_error(self):
+        '''
+        Returns the reason code of the last move that was refused, or None if the last move was made.
+        The reason codes are the keys of MOVE_ERRORS, which also holds the message shown for each of them.
+        '''
+
+        return self._move_error
+
+
+
+    def apply_move(self, old_row, old_column, new_row, new_column):
+        '''
+        This method does everything make_move does, but with row and column coordinates and without printing anything,
+        so it can be used by engines, bots and tools that play many moves.
+        It checks the restrictions in the same order as make_move:
+        if the game is over,
+        if the current center or the next center is placed on the off-bound edges of the board,
+        if the footprint only contains the player's stones and not the opponent's,
+        if the desired direction is valid,
+        if the capturing move is valid,
+        if a footprint without a center stays within 3 blocks,
+        and then lets move_footprint check the obstacles ahead and the rings.
+        Returns the MoveDelta of the move if it was made. If it was invalid, returns None and the reason can be found
+        with get_move_error.
+        '''
+
+        if self._game_state != "UNFINISHED":
+            self._move_error = "GAME_OVER"
+
+        elif self.check_boundary(old_row, old_column, new_row, new_column) is False:
+            self._move_error = "OUT_OF_BOUNDS"
+
+        elif self.check_stones(old_row, old_column) is False:
+            self._move_error = "OPPONENT_STONE"
+
+        elif self.check_directions(old_row, old_column, new_row, new_column) is False:
+            self._move_error = "WRONG_DIRECTION"
+
+        elif self.check_if_can_capture(old_row, old_column, new_row, new_column) is False:
+            self._move_error = "CANNOT_CAPTURE"
+
+        elif (
+            self.check_empty_center(old_row, old_column) is True and    # If the piece doesn't have a center stone,
+            (abs(new_row - old_row) > 3 or abs(new_column - old_column) > 3)    # it can only move up to 3 blocks.
+        ):
+            self._move_error = "OUT_OF_RANGE"
+
+        else:
+            return self.move_footprint(old_row, old_column, new_row, new_column)
+
+        return None
 
 
 
@@ -1060,19 +1872,19 @@ class GessGame:
         This is pretty much the main method, which takes the current and the new location as paramaters.
         Then it converts those parameters into row and column coordinates for easier navigation throughout the board.
         So this method mainly just checks and gives restrictions before a move is executed. Upon making a move,
-        this method calls other functions to:
+        this method calls apply_move to:
 
         check if current center or next center is placed on the off-bound edges of the board,
         checks if it only contains the player's stones and not the opponent's,
         checks whether desired direction is valid,
         checks whether the capturing move is valid,
         checks whether the footprint has a center or not to determine the allowance of the distance it can cover,
-        check the rings if they have been broke through move_footprint and check_own_rings,
+        check the rings if they have been broke through move_footprint,
         checks whether the game has been over and somebody has already one, etc.
 
         After checking all the restrictions and if it passes all of that then it can move depending on the restrictions.
-        If the player successfully makes the move after passing all restrictions, returns True.
-        If the move didn't pass, then it's an illegal move and returns False.
+        If the player successfully makes the move after passing all restrictions, prints the board and returns True.
+        If the move didn't pass, then it's an illegal move, so it prints the reason and returns False.
         More details about the mechanics of checking rings and checking obstacles ahead at the move_footprint function.
         '''
 
@@ -1082,53 +1894,342 @@ class GessGame:
         new_row = self.get_row(new_position)          # converts the next coordinates into row and column coordinates
         new_column = self.get_column(new_position)
 
+        if self.apply_move(old_row, old_column, new_row, new_column) is None:
+            print(MOVE_ERRORS[self._move_error])
+            return False
 
-        horizontal_distance = new_column - old_column
-        vertical_distance = new_row - old_row         # calculates distance for matching with the center's existence
+        for i in self._board:
+            print(i)
 
-        if self.get_game_state() != "UNFINISHED":     # check if game over
-            print("Game was over")
-            return False
+        return True
 
-        elif self.check_boundary(old_row, old_column, new_row, new_column) is False:
-            print("Center can't be out of bounds. Try again!")
-            return False                              # check if center is placed outside of 18x18 board
 
-        elif self.check_stones(old_row, old_column) is False:
-            print("Your 3x3 footprint contains an opponent's stone. Try again!")
-            return False                              # check if the footprint only has one's stones
 
-        elif self.check_directions(old_row, old_column, new_row, new_column) is False:
-            print("Check your stones for directions and try again!")
-            return False                              # check if the direction going to is valid
 
-        elif self.check_if_can_capture(old_row, old_column, new_row, new_column) is False:
-            print("Can't catch further.")             # check how far a footprint can capture stones
-            return False
 
-        elif self.check_empty_center(old_row, old_column) is True:
-            if abs(vertical_distance) <= 3:           # If the piece doesn't have a center stone, it can only move up to
-                if abs(horizontal_distance) <= 3:     # 3 blocks
+    def pack(self):
+        '''
+        Returns the game packed into bytes, which take much less memory than a GessGame while the game is waiting
+        for its next move. Each row is written as the bitmask of each player's stones, and the game state as its
+        STATE_CODES number. The history of positions is only kept if the game has a repetition_limit, because it
+        isn't needed otherwise. unpack_game turns the bytes back into a game (without its last move).
+        '''
 
-                    if self.move_footprint(old_row, old_column, new_row, new_column) == False:
-                        return False
-                    else:                             # this is a move for piece without a center stone
-                        return True                   # If one's rings are still intact and there are no obstacles ahead
-                                                      # execute move and return True, otherwise False.
-                else:
-                    print("Out of range. Try again!")
-                    return False                      # The purpose of the vertical and horizontal distance checking
-            else:                                     # if they're equal is to check a strict diagonal move.
-                print("Out of range. Try again!")
-                return False
-        else:                                         # this is a move for piece with a center stone
-            if self.move_footprint(old_row, old_column, new_row, new_column) == False:
-                return False
+        size = self._geometry.size
+        row_bytes = (size + 7) // 8
+        history = self._history if self._repetition_limit is not None else {}
+
+        data = bytearray(PACKED_HEADER.pack(size, STATE_CODES[self._game_state], self._player_turn,
+                                            self._repetition_limit or 0, self._max_plies or 0, len(history)))
+        for i in range(size):
+            data += self._masks['B'][i].to_bytes(row_bytes, 'little')
+            data += self._masks['W'][i].to_bytes(row_bytes, 'little')
+        for position_hash, seen in history.items():
+            data += PACKED_HISTORY.pack(position_hash, seen)
+
+        return bytes(data)
+
+
+
+    def clone(self, copy_on_write=False):
+        '''
+        Returns a copy of the game that can be played on without changing this one, much faster than copy.deepcopy.
+        The board rows are copied with one slice each, the row bitmasks are numbers so the lists of them are copied
+        in one go, and the tables that only depend on the size are shared.
+        With copy_on_write, the rows aren't copied at all: both games share them until one of them makes a move,
+        and then only the rows that move touches are copied (see own_rows). This is the cheapest way to try a few
+        moves on a copy.
+        '''
+
+        copy = GessGame.__new__(GessGame)
+
+        copy._geometry = self._geometry
+        copy._game_state = self._game_state
+        copy._player_turn = self._player_turn
+        copy._last_move = self._last_move
+        copy._move_error = self._move_error
+        copy._masks = {'B': self._masks['B'][:], 'W': self._masks['W'][:]}
+        copy._rings = {'B': set(self._rings['B']), 'W': set(self._rings['W'])}
+        copy._stones = dict(self._stones)
+        copy._hashes = self._hashes[:]
+        copy._repetition_limit = self._repetition_limit
+        copy._max_plies = self._max_plies
+        copy._history = dict(self._history)
+
+        if copy_on_write:
+            copy._board = self._board[:]                    # the same row lists, so both games must copy a row
+            copy._shared = set(range(len(self._board)))     # before writing to it
+            self._shared = set(copy._shared)
+        else:
+            copy._board = [row[:] for row in self._board]
+            copy._shared = set()
+
+        copy._attacks = None                                # worked out again if the copy needs them
+        copy._attack_changes = None
+        copy._move_lists = None
+        copy._move_changes = None
+
+        return copy
+
+
+
+    def __deepcopy__(self, memo):
+        '''
+        Makes copy.deepcopy of a game use clone, which copies only what a game needs.
+        '''
+
+        return self.clone()
+
+
+
+    def own_rows(self, rows):
+        '''
+        This method is used by copy-on-write clones before writing to the board: each of the rows that is still
+        shared with another game is replaced by a copy of its own.
+        '''
+
+        shared = self._shared
+        board = self._board
+        for i in rows:
+            if i in shared:
+                board[i] = board[i][:]
+                shared.discard(i)
+
+
+
+    def find_center_attacks(self, row, column, player):
+        '''
+        Returns the bitmask (bit row * size + column) of every block the player's footprint at the center could
+        cover with a valid move, whoever's turn it is. Any opponent's stone on one of those blocks can be captured.
+        It walks the rays like generate_moves does. The only difference is a ring that is the player's last one
+        moving onto the edges, which generate_moves tries on the board: here it is left out, because the stones of
+        the ring that land on the edges are taken off and break it.
+        '''
+
+        geometry = self._geometry
+        board = self._board
+        own = self._masks[player]
+        opponent = self._masks['W' if player == 'B' else 'B']
+        shift = column - 1
+
+        if (((opponent[row - 1] >> shift) & 7) or ((opponent[row] >> shift) & 7) or
+                ((opponent[row + 1] >> shift) & 7)):
+            return 0
+
+        allowed, has_center, max_distance, is_ring = PATTERNS[
+            ((own[row - 1] >> shift) & 7) | (((own[row] >> shift) & 7) << 3) | (((own[row + 1] >> shift) & 7) << 6)
+        ]
+        if not allowed:
+            return 0
+
+        keeps_ring = False
+        for i, j in self._rings[player]:
+            if abs(i - row) > 2 or abs(j - column) > 2:
+                keeps_ring = True
+                break
+
+        if not is_ring and not keeps_ring:
+            return 0
+
+        footprint_bits = geometry.footprint_bits
+        attacks = 0
+
+        for number, (direction, row_step, column_step) in enumerate(DIRECTIONS):
+            if not allowed & (1 << number):
+                continue
+
+            ray = geometry.rays[(row, column, direction)]
+            limit = len(ray)
+            if limit > max_distance:
+                limit = max_distance
+
+            for step in range(limit):
+                new_row, new_column, cells = ray[step]
+
+                blocked = False
+                for i, j in cells:
+                    if board[i][j] != '-':
+                        blocked = True
+                        break
+                if blocked:
+                    break
+
+                if is_ring and not keeps_ring and (new_row, new_column) in geometry.edge_footprints:
+                    continue
+
+                attacks |= footprint_bits[(new_row, new_column)]
+
+        return attacks
+
+
+
+    def note_attack_changes(self, delta):
+        '''
+        This method is called after each move (and each move taken back) once the attack maps are kept, to remember
+        which blocks changed. A move that made or broke a ring can change the moves of any piece (because of the
+        last ring rule), so then the attack maps are simply worked out again from scratch.
+        '''
+
+        if delta.rings_created or delta.rings_destroyed:
+            self._attacks = None
+            self._attack_changes = None
+            return
+
+        changes = self._attack_changes
+        for i, j, stone, placed in delta.changed:
+            changes.add((i, j))
+
+
+
+    def get_attack_map(self, player):
+        '''
+        Returns the bitmask (bit row * size + column) of every block that one of the player's footprints could
+        cover with its next move, whoever's turn it is. Any opponent's stone on those blocks is under attack.
+        The attacks of each center are saved, so after a move only the centers whose moves the changed blocks could
+        affect are worked out again (see BoardGeometry.get_attack_dependents).
+        '''
+
+        geometry = self._geometry
+
+        if self._attacks is None:
+            self._attacks = {}
+            for color in ('B', 'W'):
+                centers = {}
+                for row, column in geometry.ring_centers:
+                    centers[(row, column)] = self.find_center_attacks(row, column, color)
+                self._attacks[color] = centers
+            self._attack_changes = set()
+
+        elif self._attack_changes:
+            dependents = geometry.get_attack_dependents()
+            centers = set()
+            for cell in self._attack_changes:
+                centers.update(dependents.get(cell, ()))
+            for color in ('B', 'W'):
+                saved = self._attacks[color]
+                for row, column in centers:
+                    saved[(row, column)] = self.find_center_attacks(row, column, color)
+            self._attack_changes = set()
+
+        attacks = 0
+        for bits in self._attacks[player].values():
+            attacks |= bits
+
+        return attacks
+
+
+
+    def is_attacked(self, row, column, player):
+        '''
+        Returns True if one of the opponent's footprints can cover the block at the row and column next move.
+        The player is the one being attacked.
+        '''
+
+        attacker = 'W' if player == 'B' else 'B'
+
+        return bool(self.get_attack_map(attacker) >> (row * self._geometry.size + column) & 1)
+
+
+
+    def get_threatened_rings(self, player):
+        '''
+        Returns the sorted list of the centers of the player's rings that one of the opponent's footprints can hit
+        next move, which breaks the ring.
+        '''
+
+        attacks = self.get_attack_map('W' if player == 'B' else 'B')
+        footprint_bits = self._geometry.footprint_bits
+
+        return sorted(center for center in self._rings[player] if attacks & footprint_bits[center])
+
+
+def mirror_compact_row(row):
+    '''
+    Returns a row of a compact position read from right to left. The runs of empty blocks are numbers that can have
+    more than one digit, so they are kept together.
+    '''
+
+    parts = []
+    for block in row:
+        if block.isdigit() and parts and parts[-1].isdigit():
+            parts[-1] += block
+        else:
+            parts.append(block)
+
+    return ''.join(reversed(parts))
+
+
+
+def load_compact(text):
+    '''
+    Turns a position written by GessGame.to_compact back into a game.
+    The game is over if the player who just moved took the last ring of the player to move.
+    '''
+
+    parts = text.strip().split(':')
+    if len(parts) != 4:
+        raise ValueError("A compact position has 4 parts separated by colons.")
+
+    size = int(parts[0])
+    layout = []
+    for text_row in parts[3].split('/'):
+        row = ''
+        count = ''
+        for block in text_row:
+            if block.isdigit():
+                count += block
             else:
-                return True                           # If one's rings are still intact and there are no obstacles ahead
-                                                      # execute move and return True, otherwise False.
+                row += '-' * int(count or 0) + block
+                count = ''
+        layout.append(row + '-' * int(count or 0))
+
+    game = GessGame(size, layout)
+    game._player_turn = int(parts[2])
+    if game.get_player().lower() != parts[1]:
+        raise ValueError("The player to move doesn't match the player turn counter.")
+    game._hashes = [game.compute_hash(symmetry) for symmetry in SYMMETRIES]
+    game._history = {game._hashes[0]: 1}
 
+    player = game.get_player()
+    opponent = 'W' if player == 'B' else 'B'
+    if not game.get_rings(player) and game.get_rings(opponent):
+        game._game_state = "BLACK_WON" if opponent == 'B' else "WHITE_WON"
+
+    return game
+
+
+
+
+def unpack_game(data):
+    '''
+    Turns the bytes written by GessGame.pack back into a game.
+    '''
 
+    size, state, turn, repetition_limit, max_plies, entries = PACKED_HEADER.unpack_from(data, 0)
+    row_bytes = (size + 7) // 8
+    offset = PACKED_HEADER.size
+
+    layout = []
+    for i in range(size):
+        black = int.from_bytes(data[offset:offset + row_bytes], 'little')
+        white = int.from_bytes(data[offset + row_bytes:offset + 2 * row_bytes], 'little')
+        offset += 2 * row_bytes
+        layout.append(''.join('B' if black >> j & 1 else 'W' if white >> j & 1 else '-' for j in range(size)))
+
+    game = GessGame(size, layout, repetition_limit or None, max_plies or None)
+    game._game_state = STATE_NAMES[state]
+    game._player_turn = turn
+    game._hashes = [game.compute_hash(symmetry) for symmetry in SYMMETRIES]
+    game._history = {game._hashes[0]: 1}
+
+    if entries:
+        game._history = {}
+        for number in range(entries):
+            position_hash, seen = PACKED_HISTORY.unpack_from(data, offset)
+            offset += PACKED_HISTORY.size
+            game._history[position_hash] = seen
+
+    return game
 
 
 game = GessGame()
@@ -0,0 +1,249 @@
+# Description: This is an importer for archives of games written as text, with one game per line and each move
+# written as a pair of coordinates, like "j6 g9 i15 i13" (the same coordinates make_move takes).
+# The archive is read a chunk of games at a time and each chunk is checked by a pool of worker processes with
+# GessGame.apply_move, which doesn't print anything. The games that are valid are written to a compact binary store,
+# and the games that aren't are reported with the move that failed and the reason code. A game on a board of a size
+# GessGame doesn't have, or with more moves than the store can count, is reported the same way.
+# Only a few chunks are sent to the workers at a time, so the memory used stays the same however big the archive is.
+# The games are appended to the store, numbered on from the last game already in it, so several archives can be
+# imported into one store and every game keeps its own number.
+# For example: python GessImport.py games.txt games.bin --rejects rejected.jsonl
+
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import struct
+import sys
+
+from GessGame import COLUMN_LETTERS, GessGame, MIN_BOARD_SIZE, MOVE_ERRORS, STATE_CODES, STATE_NAMES
+
+
+
+GAME_HEADER = struct.Struct('<QBBH')            # game number, board size, game state, number of moves
+MOVE = struct.Struct('<BBBB')                   # old row, old column, new row, new column
+MAX_MOVES = 2 ** 16 - 1                         # the most moves the game header can count
+
+UNREADABLE_MOVE = "UNREADABLE_MOVE"             # the reason code of a move that isn't a pair of coordinates
+INVALID_SIZE = "INVALID_SIZE"                   # the reason code of a game after a size line that isn't a board size
+TOO_MANY_MOVES = "TOO_MANY_MOVES"               # the reason code of a game longer than MAX_MOVES
+
+
+
+def check_game(game_number, text, size=20):
+    '''
+    Plays the game written on one line of the archive and returns (game_number, record, rejection).
+    If every move is valid, the record is the game packed for the store and the rejection is None.
+    Otherwise the record is None and the rejection is a dictionary with the game number, the number of the move that
+    failed (counting from 1), the move and the reason code.
+    The size is the board size from the archive, or the text of its size line if that isn't a number. A game with a
+    size that isn't a number from MIN_BOARD_SIZE to 26 is rejected with INVALID_SIZE (and the size), before any move,
+    and a game with more than MAX_MOVES moves with TOO_MANY_MOVES at the first move past it.
+    '''
+
+    if not isinstance(size, int) or size < MIN_BOARD_SIZE or size > len(COLUMN_LETTERS):
+        return game_number, None, {
+            "game": game_number,
+            "move_number": 0,
+            "move": "",
+            "reason": INVALID_SIZE,
+            "size": size,
+        }
+
+    squares = text.replace(',', ' ').split()
+    if len(squares) > 2 * MAX_MOVES:
+        return game_number, None, {
+            "game": game_number,
+            "move_number": MAX_MOVES + 1,
+            "move": ' '.join(squares[2 * MAX_MOVES:2 * MAX_MOVES + 2]),
+            "reason": TOO_MANY_MOVES,
+        }
+
+    game = GessGame(size)
+    moves = []
+
+    for number in range(0, len(squares), 2):
+        written = squares[number:number + 2]
+        reason = None
+
+        try:
+            if len(written) != 2:
+                raise ValueError(written)
+            move = (game.get_row(written[0]), game.get_column(written[0]),
+                    game.get_row(written[1]), game.get_column(written[1]))
+        except ValueError:
+            reason = UNREADABLE_MOVE
+        else:
+            if game.apply_move(move[0], move[1], move[2], move[3]) is None:
+                reason = game.get_move_error()
+
+        if reason is not None:
+            return game_number, None, {
+                "game": game_number,
+                "move_number": number // 2 + 1,
+                "move": ' '.join(written),
+                "reason": reason,
+            }
+
+        moves.append(move)
+
+    record = GAME_HEADER.pack(game_number, size, STATE_CODES[game.get_game_state()], len(moves))
+    record += b''.join(MOVE.pack(*move) for move in moves)
+
+    return game_number, record, None
+
+
+
+def check_chunk(chunk):
+    '''
+    Checks a chunk of (game_number, text, size) games inside a worker process and returns the list of results.
+    '''
+
+    return [check_game(game_number, text, size) for game_number, text, size in chunk]
+
+
+
+def read_chunks(path, chunk_size, first_number=0):
+    '''
+    Yields the games of an archive as chunks of (game_number, text, size) tuples. The game number is the line number
+    in the archive, counting from 1, plus first_number. Empty lines and lines starting with # are skipped, and a line
+    like "size 14" changes the board size for the games after it. If the size isn't a number, its text is given as
+    the size instead, so each game after it is rejected by check_game rather than the whole import stopping.
+    '''
+
+    size = 20
+    chunk = []
+
+    with open(path) as archive:
+        for line_number, line in enumerate(archive, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('size '):
+                try:
+                    size = int(line[5:])
+                except ValueError:
+                    size = line[5:].strip()
+                continue
+
+            chunk.append((first_number + line_number, line, size))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+
+    if chunk:
+        yield chunk
+
+
+
+def import_archive(archive_path, store_path, rejects=None, workers=None, chunk_size=1000):
+    '''
+    Checks every game of the archive with a pool of workers and appends the valid ones to the store. The games are
+    numbered on from the last game number already in the store (see read_last_game_number).
+    The rejections are written to the rejects file object as JSON lines, if one is given, each with the line of the
+    game in the archive as well as its number.
+    At most two chunks per worker are waiting at any time, and the results are written in the order of the archive.
+    Returns a dictionary with the number of games accepted and rejected, and the count of each reason code.
+    '''
+
+    if workers is None:
+        workers = os.cpu_count()
+
+    summary = {"accepted": 0, "rejected": 0, "reasons": {}}
+    waiting = collections.deque()
+    first_number = read_last_game_number(store_path)
+
+    def write(results):
+        for game_number, record, rejection in results:
+            if record is not None:
+                store.write(record)
+                summary["accepted"] += 1
+            else:
+                summary["rejected"] += 1
+                summary["reasons"][rejection["reason"]] = summary["reasons"].get(rejection["reason"], 0) + 1
+                if rejects is not None:
+                    rejection["line"] = game_number - first_number
+                    rejects.write(json.dumps(rejection) + '\n')
+
+    with open(store_path, 'ab') as store, multiprocessing.Pool(workers) as pool:
+        for chunk in read_chunks(archive_path, chunk_size, first_number):
+            waiting.append(pool.apply_async(check_chunk, (chunk,)))
+            if len(waiting) >= workers * 2:
+                write(waiting.popleft().get())
+
+        while waiting:
+            write(waiting.popleft().get())
+
+    return summary
+
+
+
+def read_last_game_number(path):
+    '''
+    Returns the number of the last game in the store, or 0 if the store is empty or doesn't exist yet. Only the
+    game headers are read.
+    '''
+
+    last = 0
+    if not os.path.exists(path):
+        return last
+
+    with open(path, 'rb') as store:
+        while True:
+            header = store.read(GAME_HEADER.size)
+            if len(header) < GAME_HEADER.size:
+                return last
+            game_number, size, state, count = GAME_HEADER.unpack(header)
+            last = max(last, game_number)
+            store.seek(MOVE.size * count, os.SEEK_CUR)
+
+
+
+def read_store(path):
+    '''
+    Yields the games of a store one at a time as (game_number, size, game_state, moves), where the moves are
+    (old_row, old_column, new_row, new_column) tuples that can be given to GessGame.apply_trusted_move.
+    '''
+
+    with open(path, 'rb') as store:
+        while True:
+            header = store.read(GAME_HEADER.size)
+            if len(header) < GAME_HEADER.size:
+                return
+            game_number, size, state, count = GAME_HEADER.unpack(header)
+            data = store.read(MOVE.size * count)
+            moves = [MOVE.unpack_from(data, MOVE.size * number) for number in range(count)]
+            yield game_number, size, STATE_NAMES[state], moves
+
+
+
+def main(arguments=None):
+    '''
+    Reads the command line, imports the archive and prints the summary as JSON.
+    Returns 0 if every game was accepted, otherwise 1.
+    '''
+
+    parser = argparse.ArgumentParser(prog="gess-import", description="Check and import an archive of Gess games.")
+    parser.add_argument("archive", help="the text archive, one game per line")
+    parser.add_argument("store", help="the binary store the valid games are appended to")
+    parser.add_argument("--rejects", help="the file the rejected games are written to as JSON lines")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="games sent to a worker at a time")
+    options = parser.parse_args(arguments)
+
+    rejects = open(options.rejects, 'w') if options.rejects else None
+    try:
+        summary = import_archive(options.archive, options.store, rejects, options.workers, options.chunk_size)
+    finally:
+        if rejects is not None:
+            rejects.close()
+
+    print(json.dumps(summary))
+
+    return 1 if summary["rejected"] else 0
+
+
+
+if __name__ == '__main__':
+    sys.exit(main())
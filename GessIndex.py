@@ -0,0 +1,302 @@
+# Description: This is an index of which archived games went through which positions, so finding every game that
+# reached a position doesn't need replaying all of them.
+# The games are replayed once with GessGame.apply_trusted_move, and for each position the hash of the position
+# (GessGame.get_position_hash) is saved with the game number and the move number, as a posting.
+# The postings are written to segment files: a table of hashes sorted so it can be binary searched, followed by the
+# postings of each hash, compressed as variable-length numbers. The segments are read through mmap, so a query only
+# touches the few pages it needs. New games are added as a new segment, and merge puts all the segments together.
+# For example, PositionIndex('index').find(game.get_position_hash()) gives [(game_number, move_number), ...].
+
+import mmap
+import os
+import struct
+
+from GessGame import GessGame
+
+
+
+MAGIC = b'GESSIDX1'
+HEADER = struct.Struct('<8sQ')          # the magic bytes and the number of hashes in the segment
+ENTRY = struct.Struct('<QQI')           # a hash, where its postings start and how many there are
+
+
+
+def write_number(output, number):
+    '''
+    Writes a number that is 0 or more as a variable-length number: 7 bits per byte, with the top bit set on every byte
+    but the last, so small numbers only take one byte.
+    '''
+
+    while number >= 0x80:
+        output.append((number & 0x7f) | 0x80)
+        number >>= 7
+    output.append(number)
+
+
+
+def read_number(data, offset):
+    '''
+    Reads a variable-length number written by write_number. Returns the number and the offset right after it.
+    '''
+
+    number = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        number |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return number, offset
+        shift += 7
+
+
+
+def collect_postings(games, postings=None):
+    '''
+    Replays the games and returns a dictionary of position hash -> list of (game_number, move_number).
+    The games are (game_number, size, moves) tuples, like the ones from GessImport.read_store without the state.
+    The starting position is left out, because every game goes through it.
+    '''
+
+    if postings is None:
+        postings = {}
+
+    for game_number, size, moves in games:
+        game = GessGame(size)
+        for move_number, move in enumerate(moves, 1):
+            game.apply_trusted_move(move[0], move[1], move[2], move[3])
+            position_hash = game.get_position_hash()
+            found = postings.get(position_hash)
+            if found is None:
+                postings[position_hash] = [(game_number, move_number)]
+            else:
+                found.append((game_number, move_number))
+
+    return postings
+
+
+
+def write_segment(path, postings):
+    '''
+    Writes a segment file for a dictionary of position hash -> list of (game_number, move_number).
+    The postings of each hash are sorted, and each game number is written as the difference from the one before.
+    The file is written under a temporary name first, so a half written segment is never read.
+    '''
+
+    hashes = sorted(postings)
+    data = bytearray()
+    entries = []
+
+    for position_hash in hashes:
+        start = len(data)
+        previous_game = 0
+        found = sorted(postings[position_hash])
+        for game_number, move_number in found:
+            write_number(data, game_number - previous_game)
+            write_number(data, move_number)
+            previous_game = game_number
+        entries.append((position_hash, start, len(found)))
+
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as segment:
+        segment.write(HEADER.pack(MAGIC, len(entries)))
+        for entry in entries:
+            segment.write(ENTRY.pack(*entry))
+        segment.write(data)
+    os.replace(temporary, path)
+
+
+
+class Segment:
+    '''
+    This is a class that contains one segment file opened through mmap, and finds the postings of a hash in it.
+    '''
+
+
+
+    def __init__(self, path):
+        '''
+        Opens the segment file and reads its header.
+        '''
+
+        self.path = path
+        self._file = open(path, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._count = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ValueError(path + " is not a position index segment.")
+        self._postings_start = HEADER.size + ENTRY.size * self._count
+
+
+
+    def close(self):
+        '''
+        Closes the mmap and the file.
+        '''
+
+        self._data.close()
+        self._file.close()
+
+
+
+    def find(self, position_hash):
+        '''
+        Returns the list of (game_number, move_number) for the hash, using a binary search on the sorted hashes.
+        '''
+
+        low = 0
+        high = self._count
+
+        while low < high:
+            middle = (low + high) // 2
+            found_hash, start, count = ENTRY.unpack_from(self._data, HEADER.size + ENTRY.size * middle)
+            if found_hash < position_hash:
+                low = middle + 1
+            elif found_hash > position_hash:
+                high = middle
+            else:
+                postings = []
+                offset = self._postings_start + start
+                game_number = 0
+                for number in range(count):
+                    difference, offset = read_number(self._data, offset)
+                    move_number, offset = read_number(self._data, offset)
+                    game_number += difference
+                    postings.append((game_number, move_number))
+                return postings
+
+        return []
+
+
+
+    def read_all(self):
+        '''
+        Returns every posting in the segment as a dictionary of position hash -> list of (game_number, move_number).
+        '''
+
+        postings = {}
+        for number in range(self._count):
+            position_hash = ENTRY.unpack_from(self._data, HEADER.size + ENTRY.size * number)[0]
+            postings[position_hash] = self.find(position_hash)
+
+        return postings
+
+
+
+class PositionIndex:
+    '''
+    This is a class that contains the index kept in a directory of segment files.
+    The methods contained in this class are:
+    an init method
+    close
+    add_games
+    find
+    find_game
+    merge
+    '''
+
+
+
+    def __init__(self, directory):
+        '''
+        Opens every segment in the directory, creating the directory if it doesn't exist yet.
+        '''
+
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        self._segments = [
+            Segment(os.path.join(directory, name)) for name in sorted(os.listdir(directory))
+            if name.startswith('segment-') and name.endswith('.idx')
+        ]
+
+
+
+    def close(self):
+        '''
+        Closes every segment.
+        '''
+
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+
+
+
+    def _next_path(self):
+        '''
+        Returns the path for a new segment, numbered after the last one.
+        '''
+
+        number = 1
+        if self._segments:
+            number = int(os.path.basename(self._segments[-1].path)[8:-4]) + 1
+
+        return os.path.join(self._directory, 'segment-%06d.idx' % number)
+
+
+
+    def add_games(self, games):
+        '''
+        Replays the new games and adds their positions to the index as a new segment, without touching the
+        segments already there. The games are (game_number, size, moves) tuples.
+        Returns the number of different positions in the new segment.
+        '''
+
+        postings = collect_postings(games)
+        if not postings:
+            return 0
+
+        path = self._next_path()
+        write_segment(path, postings)
+        self._segments.append(Segment(path))
+
+        return len(postings)
+
+
+
+    def find(self, position_hash):
+        '''
+        Returns the sorted list of (game_number, move_number) of every indexed game that reached the position with
+        the given hash. The move number is how many moves had been made when the position came up.
+        '''
+
+        postings = []
+        for segment in self._segments:
+            postings.extend(segment.find(position_hash))
+
+        postings.sort()
+        return postings
+
+
+
+    def find_game(self, game):
+        '''
+        Returns the postings for the current position of a GessGame.
+        '''
+
+        return self.find(game.get_position_hash())
+
+
+
+    def merge(self):
+        '''
+        Puts all the segments together into one, which makes queries faster after many small additions.
+        '''
+
+        if len(self._segments) < 2:
+            return
+
+        postings = {}
+        for segment in self._segments:
+            for position_hash, found in segment.read_all().items():
+                postings.setdefault(position_hash, []).extend(found)
+
+        path = self._next_path()
+        write_segment(path, postings)
+
+        for segment in self._segments:
+            segment.close()
+            os.remove(segment.path)
+        self._segments = [Segment(path)]
@@ -0,0 +1,523 @@
+# Description: This is a Monte Carlo tree search for the game in GessGame.py that scores its leaves with a learned
+# evaluator, like a small neural network, instead of playing random games to the end.
+# Calling the evaluator once per leaf wastes most of the time on the call itself, so the leaves go through an
+# EvaluationQueue: the tree is searched by several threads at once, each one sends its leaf position to the queue and
+# waits, and one evaluator thread scores the waiting leaves together, as soon as batch_size of them are waiting or
+# the oldest has waited max_wait seconds.
+# While a leaf is waiting, every node on its path has a virtual loss, so the other threads look like they lost games
+# through it and go down other paths instead of all waiting on the same leaf.
+# The evaluator is any function that takes a batch of planes from GessExport.planes_from_stones and returns the value
+# of each position for the player to move, from -1 to 1. MLPEvaluator runs a small network from a .npz file with
+# numpy, and material_evaluator counts the stones and rings.
+# For example: with EvaluationQueue(load_mlp('weights.npz')) as evaluations:
+#                  MonteCarloSearch(evaluations).search(game, playouts=800).best_move
+
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from GessExport import PLANES, numpy, planes_from_stones, require_numpy, stones_from_masks
+from GessGame import decode_move
+
+
+
+MATERIAL_SCALE = 20.0           # how many stones ahead material_evaluator counts as about three quarters of a win
+RING_WEIGHT = 10                # how many stones an intact ring is worth to material_evaluator
+
+
+
+def material_evaluator(planes):
+    '''
+    Returns the value of each position of a batch of planes from the stones and rings alone, for trying the search
+    out without a trained network.
+    '''
+
+    counts = planes[:, :4].sum(axis=(2, 3), dtype=numpy.int32)     # stones and rings of each side
+    own = counts[:, 0] + RING_WEIGHT * counts[:, 2]
+    opponent = counts[:, 1] + RING_WEIGHT * counts[:, 3]
+
+    return numpy.tanh((own - opponent) / MATERIAL_SCALE)
+
+
+
+class MLPEvaluator:
+    '''
+    This is a class that contains the layers of a small fully connected network, which takes the planes of a position
+    flattened into one row of numbers and returns its value for the player to move.
+    Every layer but the last is followed by a ReLU, and the last one has one output, put through tanh.
+    The methods contained in this class are:
+    an init method
+    a call method
+    save
+    '''
+
+
+
+    def __init__(self, layers):
+        '''
+        Initializes the network with a list of (weights, bias) arrays, the weights of each layer having one row per
+        input and one column per output.
+        '''
+
+        require_numpy()
+
+        self.layers = [(numpy.asarray(weights, numpy.float32), numpy.asarray(bias, numpy.float32))
+                       for weights, bias in layers]
+
+
+
+    def __call__(self, planes):
+        '''
+        Returns the values of a batch of planes as an array of one number per position.
+        '''
+
+        values = planes.reshape(len(planes), -1).astype(numpy.float32)
+
+        for number, (weights, bias) in enumerate(self.layers):
+            values = values @ weights + bias
+            if number < len(self.layers) - 1:
+                numpy.maximum(values, 0, out=values)
+
+        return numpy.tanh(values[:, 0])
+
+
+
+    def save(self, path):
+        '''
+        Saves the layers to a .npz file that load_mlp reads back, as weights_0, bias_0, weights_1 and so on.
+        '''
+
+        arrays = {}
+        for number, (weights, bias) in enumerate(self.layers):
+            arrays['weights_' + str(number)] = weights
+            arrays['bias_' + str(number)] = bias
+
+        numpy.savez(path, **arrays)
+
+
+
+def load_mlp(path):
+    '''
+    Returns the MLPEvaluator saved in a .npz file with the arrays weights_0, bias_0, weights_1, bias_1 and so on.
+    '''
+
+    require_numpy()
+
+    with numpy.load(path) as arrays:
+        layers = []
+        while 'weights_' + str(len(layers)) in arrays:
+            number = str(len(layers))
+            layers.append((arrays['weights_' + number], arrays['bias_' + number]))
+
+    if not layers:
+        raise ValueError(path + " has no weights_0 array.")
+
+    return MLPEvaluator(layers)
+
+
+
+def random_mlp(size=20, hidden=(64,), seed=None):
+    '''
+    Returns an MLPEvaluator with random weights for a board of the given size, useful to measure the speed of the
+    search before a network is trained.
+    '''
+
+    require_numpy()
+
+    generator = numpy.random.default_rng(seed)
+    widths = [len(PLANES) * size * size] + list(hidden) + [1]
+
+    return MLPEvaluator([(generator.normal(0, 1 / math.sqrt(widths[i]), (widths[i], widths[i + 1])),
+                          numpy.zeros(widths[i + 1])) for i in range(len(widths) - 1)])
+
+
+
+class EvaluationQueue:
+    '''
+    This is a class that contains the queue of leaf positions waiting to be scored and the thread that scores them in
+    batches.
+    The methods contained in this class are:
+    an init method
+    start
+    close
+    submit
+    run
+    evaluate_batch
+    get_average_batch
+    '''
+
+
+
+    def __init__(self, evaluator, batch_size=32, max_wait=0.001):
+        '''
+        Initializes the queue for an evaluator function. A batch is scored once batch_size positions are waiting,
+        or once the first of them has waited max_wait seconds.
+        '''
+
+        require_numpy()
+
+        self._evaluator = evaluator
+        self._batch_size = batch_size
+        self._max_wait = max_wait
+        self._requests = queue.Queue()
+        self._thread = None
+
+        self.batches = 0
+        self.positions = 0
+
+
+
+    def __enter__(self):
+        '''
+        Starts the evaluator thread for a with block.
+        '''
+
+        self.start()
+        return self
+
+
+
+    def __exit__(self, kind, error, trace):
+        '''
+        Stops the evaluator thread at the end of a with block.
+        '''
+
+        self.close()
+
+
+
+    def start(self):
+        '''
+        Starts the evaluator thread, if it isn't running already.
+        '''
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="gess-evaluator", daemon=True)
+            self._thread.start()
+
+
+
+    def close(self):
+        '''
+        Scores the positions still waiting and stops the evaluator thread.
+        '''
+
+        if self._thread is not None:
+            self._requests.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+
+    def submit(self, game):
+        '''
+        Sends the position of a game to be scored and returns a Future whose result is its value for the player to
+        move. Only the row bitmasks are taken, so the game can be changed right after.
+        '''
+
+        future = Future()
+        self._requests.put((game.get_row_masks('B'), game.get_row_masks('W'), game.get_player() == 'W', future))
+
+        return future
+
+
+
+    def run(self):
+        '''
+        This is the loop of the evaluator thread: it waits for a first position, collects more until the batch is
+        full or the time is up, and scores them together.
+        '''
+
+        running = True
+        while running:
+            request = self._requests.get()
+            if request is None:
+                return
+
+            batch = [request]
+            deadline = time.perf_counter() + self._max_wait
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    running = False
+                    break
+                batch.append(request)
+
+            self.evaluate_batch(batch)
+
+
+
+    def evaluate_batch(self, batch):
+        '''
+        Turns the waiting positions into planes all at once, scores them with one call to the evaluator and gives
+        each one its value. If the evaluator fails, each of them gets the error instead.
+        '''
+
+        size = len(batch[0][0])
+        black = stones_from_masks([request[0] for request in batch], size)
+        white = stones_from_masks([request[1] for request in batch], size)
+        white_to_move = numpy.array([request[2] for request in batch], numpy.uint8)
+
+        try:
+            values = self._evaluator(planes_from_stones(black, white, white_to_move))
+        except Exception as error:
+            for request in batch:
+                request[3].set_exception(error)
+            return
+
+        self.batches += 1
+        self.positions += len(batch)
+        for request, value in zip(batch, values):
+            request[3].set_result(float(value))
+
+
+
+    def get_average_batch(self):
+        '''
+        Returns the average number of positions scored per call to the evaluator.
+        '''
+
+        if self.batches == 0:
+            return 0.0
+
+        return self.positions / self.batches
+
+
+
+class Node:
+    '''
+    This is a class that contains one position of the tree: the move that led to it, its children once it has been
+    expanded, and the visits and values that went through it. The values are from the point of view of the player
+    who made the move, so the player choosing between the children wants the highest one.
+    '''
+
+    __slots__ = ('move', 'children', 'visits', 'value_sum', 'virtual_loss')
+
+
+
+    def __init__(self, move=None):
+        '''
+        Initializes a node that hasn't been visited yet, for the move number (see GessGame.encode_move) that led to it.
+        '''
+
+        self.move = move
+        self.children = None            # None until the moves of the position are listed
+        self.visits = 0
+        self.value_sum = 0.0
+        self.virtual_loss = 0           # the visits still waiting for their leaf to be scored
+
+
+
+class MonteCarloResult:
+    '''
+    This is a class that contains what a Monte Carlo search found. The best move is the most visited one, as a
+    (old_row, old_column, new_row, new_column) tuple, and the visits are a dictionary of move -> visits.
+    The value is the average value of the position for the player to move, from -1 to 1.
+    '''
+
+
+
+    def __init__(self):
+        '''
+        Initializes an empty result.
+        '''
+
+        self.best_move = None
+        self.visits = {}
+        self.value = 0.0
+        self.playouts = 0
+        self.elapsed = 0.0
+        self.average_batch = 0.0
+
+
+
+class MonteCarloSearch:
+    '''
+    This is a class that contains the settings of the search and the threads that go down the tree.
+    The methods contained in this class are:
+    an init method
+    search
+    run_playouts
+    playout
+    select_child
+    get_terminal_value
+    '''
+
+
+
+    def __init__(self, evaluations, threads=8, exploration=1.5, virtual_loss=1):
+        '''
+        Initializes the search with a started EvaluationQueue. The threads are how many leaves can wait to be scored
+        at once, the exploration is how much less visited moves are preferred, and the virtual_loss is how many lost
+        visits a waiting leaf adds to each node on its path.
+        '''
+
+        self._evaluations = evaluations
+        self._threads = threads
+        self._exploration = exploration
+        self._virtual_loss = virtual_loss
+
+        self._lock = threading.Lock()       # the tree is only changed while holding it
+        self._root = None
+        self._game = None
+        self._remaining = 0
+        self._deadline = None
+        self._error = None
+
+
+
+    def search(self, game, playouts=800, time_limit=None):
+        '''
+        Searches the position of the game with the given number of playouts, or until the time limit in seconds runs
+        out, and returns a MonteCarloResult. The game is left as it was.
+        '''
+
+        result = MonteCarloResult()
+        start = time.perf_counter()
+        batches = self._evaluations.batches
+        positions = self._evaluations.positions
+
+        self._root = Node()
+        self._game = game.clone()           # each playout clones this copy, so the caller's rows are never shared
+        self._remaining = playouts
+        self._deadline = start + time_limit if time_limit is not None else None
+        self._error = None
+
+        if game.get_game_state() == "UNFINISHED":
+            workers = [threading.Thread(target=self.run_playouts, name="gess-mcts-" + str(number))
+                       for number in range(self._threads)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            if self._error is not None:
+                raise self._error
+
+        root = self._root
+        size = game.get_size()
+        for child in root.children or ():
+            if child.visits:
+                result.visits[decode_move(child.move, size)] = child.visits
+        if result.visits:
+            result.best_move = max(result.visits, key=result.visits.get)
+        if root.visits:
+            result.value = -root.value_sum / root.visits
+
+        result.playouts = root.visits
+        result.elapsed = time.perf_counter() - start
+        if self._evaluations.batches > batches:
+            result.average_batch = (self._evaluations.positions - positions) / (self._evaluations.batches - batches)
+        self._game = None
+
+        return result
+
+
+
+    def run_playouts(self):
+        '''
+        This is the loop of each search thread: it makes playouts until there are none left or the time is up.
+        '''
+
+        try:
+            while self._error is None:
+                with self._lock:
+                    if self._remaining <= 0:
+                        return
+                    self._remaining -= 1
+                if self._deadline is not None and time.perf_counter() > self._deadline:
+                    return
+                self.playout()
+        except Exception as error:
+            self._error = error
+
+
+
+    def playout(self):
+        '''
+        Goes down the tree from the root to a leaf, adding a virtual loss to each node on the way, gets the value of
+        the leaf (from the queue, unless the game is over there) and adds it to every node on the path.
+        Only going down and adding the values hold the lock, so the other threads go on while this one waits.
+        '''
+
+        virtual_loss = self._virtual_loss
+
+        with self._lock:
+            node = self._root
+            node.virtual_loss += virtual_loss
+            path = [node]
+            game = self._game.clone(copy_on_write=True)
+            size = game.get_size()
+
+            while node.children:
+                node = self.select_child(node)
+                old_row, old_column, new_row, new_column = decode_move(node.move, size)
+                game.apply_trusted_move(old_row, old_column, new_row, new_column)
+                node.virtual_loss += virtual_loss
+                path.append(node)
+
+        value = self.get_terminal_value(game)
+        moves = None
+        if value is None:
+            moves = game.generate_move_codes()
+            if moves:
+                value = self._evaluations.submit(game).result()
+            else:
+                value = 0.0                 # a player who can't move doesn't lose any more stones
+
+        with self._lock:
+            if moves and node.children is None:
+                node.children = [Node(move) for move in moves]
+            for node in reversed(path):
+                value = -value              # each node's value is for the player who moved into it
+                node.virtual_loss -= virtual_loss
+                node.visits += 1
+                node.value_sum += value
+
+
+
+    def select_child(self, node):
+        '''
+        Returns the child with the best upper confidence bound. A child with no visits, real or virtual, is always
+        tried first, and each virtual visit counts as a loss.
+        '''
+
+        parent_visits = math.sqrt(node.visits + node.virtual_loss)
+        best = None
+        best_score = -math.inf
+
+        for child in node.children:
+            visits = child.visits + child.virtual_loss
+            if visits == 0:
+                return child
+            score = (child.value_sum - child.virtual_loss) / visits + self._exploration * parent_visits / (1 + visits)
+            if score > best_score:
+                best = child
+                best_score = score
+
+        return best
+
+
+
+    def get_terminal_value(self, game):
+        '''
+        Returns the value of a finished game for the player to move (1, -1, or 0 for a draw), or None if the game
+        isn't finished.
+        '''
+
+        state = game.get_game_state()
+        if state == "UNFINISHED":
+            return None
+        if state == "DRAW":
+            return 0.0
+        if (state == "BLACK_WON") == (game.get_player() == 'B'):
+            return 1.0
+
+        return -1.0
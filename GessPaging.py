@@ -0,0 +1,180 @@
+# Description: This keeps a very large number of games that are waiting for their next move, like correspondence
+# games on a server, without holding all of them in memory as GessGame objects.
+# Only the games used most recently stay in memory. The others are packed with GessGame.pack and written to a table
+# on disk, and a game that was paged out is read back and unpacked the next time it is asked for or moved. Its copy
+# on disk stays there until the game is paged out again and is written over.
+# Running this file measures how many bytes a game takes in memory when it is a GessGame and when it is packed.
+# For example, GamePager('games.db').make_move(42, 'j6', 'g9') makes a move in game 42 wherever it is kept.
+
+import collections
+import dbm
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from GessGame import GessGame, unpack_game
+
+
+
+class GamePager:
+    '''
+    This is a class that contains the games kept in memory and the table of games paged out to disk.
+    The methods contained in this class are:
+    an init method
+    close
+    add_game
+    get_game
+    make_move
+    page_out
+    page_out_idle
+    '''
+
+
+
+    def __init__(self, path, max_resident=10000):
+        '''
+        Opens (or creates) the table of paged out games at the path. At most max_resident games are kept in
+        memory, and the one that was used the longest ago is paged out when there are too many.
+        '''
+
+        self._disk = dbm.open(path, 'c')
+        self._max_resident = max_resident
+        self._resident = collections.OrderedDict()      # game id -> (game, when it was last used), oldest first
+
+
+
+    def close(self):
+        '''
+        Pages out every game still in memory and closes the table on disk.
+        '''
+
+        for game_id in list(self._resident):
+            self.page_out(game_id)
+        self._disk.close()
+
+
+
+    def add_game(self, game_id, game=None):
+        '''
+        Starts keeping a game under the given id (a new game if none is given) and returns it.
+        '''
+
+        if game is None:
+            game = GessGame()
+
+        self._resident[game_id] = (game, time.monotonic())
+        self._resident.move_to_end(game_id)
+        while len(self._resident) > self._max_resident:
+            self.page_out(next(iter(self._resident)))
+
+        return game
+
+
+
+    def get_game(self, game_id):
+        '''
+        Returns the game with the given id, reading it back from disk if it was paged out. The copy on disk is kept
+        until the game is paged out again, so a crash before then loses only the moves made since it was read.
+        Raises KeyError if there is no such game.
+        '''
+
+        found = self._resident.get(game_id)
+        if found is not None:
+            self._resident[game_id] = (found[0], time.monotonic())
+            self._resident.move_to_end(game_id)
+            return found[0]
+
+        data = self._disk[str(game_id)]                 # raises KeyError for an unknown game
+        game = unpack_game(data)
+
+        return self.add_game(game_id, game)
+
+
+
+    def make_move(self, game_id, old_position, new_position):
+        '''
+        Makes a move in the game with the given id, with coordinates like the ones make_move takes.
+        Returns the MoveDelta of the move, or None if it was invalid (the reason is in the game's get_move_error).
+        '''
+
+        game = self.get_game(game_id)
+
+        return game.apply_move(game.get_row(old_position), game.get_column(old_position),
+                               game.get_row(new_position), game.get_column(new_position))
+
+
+
+    def page_out(self, game_id):
+        '''
+        Packs the game with the given id, writes it to disk over any older copy and forgets it in memory.
+        '''
+
+        game = self._resident.pop(game_id)[0]
+        self._disk[str(game_id)] = game.pack()
+
+
+
+    def page_out_idle(self, idle_seconds):
+        '''
+        Pages out every game in memory that hasn't been used for idle_seconds. Returns how many were paged out.
+        '''
+
+        oldest = time.monotonic() - idle_seconds
+        idle = [game_id for game_id, (game, used) in self._resident.items() if used < oldest]
+        for game_id in idle:
+            self.page_out(game_id)
+
+        return len(idle)
+
+
+
+def play_random_game(moves, random_source, repetition_limit=None):
+    '''
+    Returns a game after up to the given number of random moves, like a game somewhere in the middle.
+    '''
+
+    game = GessGame(repetition_limit=repetition_limit)
+    for number in range(moves):
+        legal = game.generate_moves()
+        if not legal:
+            break
+        move = random_source.choice(legal)
+        game.apply_trusted_move(move[0], move[1], move[2], move[3])
+
+    return game
+
+
+
+def measure_bytes_per_game(count=1000, moves=20, repetition_limit=3):
+    '''
+    Measures with tracemalloc how many bytes each of count games takes while it is waiting for a move, as a GessGame
+    and when packed, after the given number of random moves. Returns both as a dictionary.
+    '''
+
+    random_source = random.Random(0)
+    games = [play_random_game(moves, random_source, repetition_limit) for number in range(count)]
+    for game in games:
+        game._last_move = None                          # a waiting game doesn't need its last move
+
+    GessGame()                                          # the tables shared by every game aren't counted
+    tracemalloc.start()
+
+    started = tracemalloc.get_traced_memory()[0]
+    copies = [unpack_game(game.pack()) for game in games]
+    live = (tracemalloc.get_traced_memory()[0] - started) / count
+
+    started = tracemalloc.get_traced_memory()[0]
+    packed = [game.pack() for game in games]
+    packed_size = (tracemalloc.get_traced_memory()[0] - started) / count
+
+    tracemalloc.stop()
+
+    return {"games": count, "moves": moves, "live_bytes_per_game": round(live),
+            "packed_bytes_per_game": round(packed_size)}
+
+
+
+if __name__ == '__main__':
+    print(json.dumps(measure_bytes_per_game(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)))
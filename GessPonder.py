@@ -0,0 +1,137 @@
+# Description: This is a player that keeps the engine in GessEngine.py thinking while the opponent thinks
+# (pondering), so the time between moves isn't wasted.
+# After the player moves, a background thread searches on a copy of the game: either the position after the reply
+# the engine expects (the second move of its best line), or, if there is no expected reply or ponder="all", the
+# opponent's position itself, which searches every reply in the engine's move order.
+# Everything the pondering search finds stays in the engine's transposition table. When the opponent's move comes
+# (made on the game with make_move as usual), the next choose_move stops the pondering within about a millisecond
+# and searches again with the same engine: if the reply was the expected one, the first depths are answered straight
+# from the table, and otherwise the entries for the replies that were searched are still used.
+# For example: player = PonderingPlayer(); result = player.choose_move(game, time_limit=5)
+#              game.make_move(...); player.start_pondering(game); ...; game.make_move(opponent's move)
+#              player.choose_move(game, time_limit=5)
+
+import threading
+
+from GessClock import CancelToken
+from GessEngine import GessEngine
+
+
+
+class PonderingPlayer:
+    '''
+    This is a class that contains the engine of a player and the pondering thread that uses it between moves.
+    The methods contained in this class are:
+    an init method
+    choose_move
+    start_pondering
+    stop_pondering
+    ponder
+    '''
+
+
+
+    def __init__(self, engine=None, ponder="predicted", ponder_depth=64):
+        '''
+        Initializes the player with an engine (a new GessEngine if none is given). The ponder setting is
+        "predicted" to search the position after the expected reply, or "all" to search every reply. The pondering
+        goes up to ponder_depth, or until it is stopped.
+        '''
+
+        if ponder not in ("predicted", "all"):
+            raise ValueError('ponder must be "predicted" or "all".')
+
+        self.engine = engine if engine is not None else GessEngine()
+        self._ponder = ponder
+        self._ponder_depth = ponder_depth
+
+        self._thread = None
+        self._cancel = CancelToken()
+        self._expected_hash = None          # the hash of the position after the expected reply, if there is one
+        self._line = []                     # the best line of the last search
+        self._ponder_result = None
+
+        self.ponder_hits = 0                # how many times the opponent played the expected reply
+        self.ponder_misses = 0
+        self.ponder_nodes = 0               # the positions searched while pondering
+
+
+
+    def choose_move(self, game, depth=64, time_limit=None, clock=None, cancel=None):
+        '''
+        Stops the pondering, searches the position of the game and returns the SearchResult, like GessEngine.search.
+        The move isn't made on the game.
+        '''
+
+        self.stop_pondering()
+
+        if self._expected_hash is not None:
+            if game.get_position_hash() == self._expected_hash:
+                self.ponder_hits += 1
+            else:
+                self.ponder_misses += 1
+            self._expected_hash = None
+
+        result = self.engine.search(game, depth, time_limit, clock, cancel)
+        self._line = result.line
+
+        return result
+
+
+
+    def start_pondering(self, game):
+        '''
+        Starts pondering on a copy of the game, which should be the position right after the player's move, so the
+        game can go on being played while the thread runs.
+        '''
+
+        self.stop_pondering()
+        if game.get_game_state() != "UNFINISHED":
+            return
+
+        position = game.clone()
+        self._expected_hash = None
+
+        if self._ponder == "predicted" and len(self._line) > 1:
+            reply = self._line[1]
+            if position.apply_move(reply[0], reply[1], reply[2], reply[3]) is None:
+                position = game.clone()     # the line doesn't follow from this position after all
+            else:
+                self._expected_hash = position.get_position_hash()
+                if position.get_game_state() != "UNFINISHED":
+                    return
+
+        self._cancel.reset()
+        self._ponder_result = None
+        self._thread = threading.Thread(target=self.ponder, args=(position,), name="gess-ponder", daemon=True)
+        self._thread.start()
+
+
+
+    def stop_pondering(self):
+        '''
+        Stops the pondering thread, if one is running, and waits for it. Returns the SearchResult of the pondering,
+        or None if there was none.
+        '''
+
+        if self._thread is None:
+            return None
+
+        self._cancel.cancel()
+        self._thread.join()
+        self._thread = None
+
+        result = self._ponder_result
+        if result is not None:
+            self.ponder_nodes += result.nodes
+
+        return result
+
+
+
+    def ponder(self, position):
+        '''
+        This is the pondering thread: it searches the position with the player's engine until it is cancelled.
+        '''
+
+        self._ponder_result = self.engine.search(position, self._ponder_depth, cancel=self._cancel)
@@ -0,0 +1,84 @@
+# Description: This is a replayer for games that were already checked, like archived games, so they can be played
+# through again quickly to rebuild statistics.
+# The moves are made with GessGame.apply_trusted_move, which skips all the checks and the printing of make_move.
+# To still catch a bad archive, a random sample of the moves can be checked fully with apply_move instead.
+# The replayer is a generator, so it only makes each move when the next result is asked for.
+# For example, for delta in replay([('j6', 'g9'), ('i15', 'i13')]): print(delta.captured)
+
+import random
+
+from GessGame import GessGame, MOVE_ERRORS
+
+
+
+class ReplayError(Exception):
+    '''
+    This is raised when a move that was spot-checked turns out to be invalid.
+    It has the number of the move (counting from 1) and the reason code from GessGame.get_move_error.
+    '''
+
+    def __init__(self, move_number, move, reason):
+        super().__init__("Move " + str(move_number) + " " + str(move) + " is invalid: " + reason +
+                         " (" + MOVE_ERRORS[reason] + ")")
+        self.move_number = move_number
+        self.move = move
+        self.reason = reason
+
+
+
+def read_move(game, move):
+    '''
+    Returns the move as (old_row, old_column, new_row, new_column). A move can already be written that way, or be a
+    pair of string coordinates like ('e14', 'g14'), which are read with the game's get_row and get_column.
+    '''
+
+    if len(move) == 2:
+        return (game.get_row(move[0]), game.get_column(move[0]), game.get_row(move[1]), game.get_column(move[1]))
+
+    return move
+
+
+
+def replay(moves, size=20, positions=False, spot_check_rate=0.0, random_source=None, game=None):
+    '''
+    Makes the moves one at a time from the starting position (or from the given game) and yields the MoveDelta of
+    each move, or the compact position after each move if positions is True.
+    Each move is checked fully with probability spot_check_rate, and a ReplayError is raised if it is invalid.
+    The random_source can be a random.Random, so the same moves are checked every time.
+    '''
+
+    if game is None:
+        game = GessGame(size)
+
+    if spot_check_rate > 0 and random_source is None:
+        random_source = random.Random()
+
+    for number, move in enumerate(moves, 1):
+        old_row, old_column, new_row, new_column = read_move(game, move)
+
+        if spot_check_rate > 0 and random_source.random() < spot_check_rate:
+            delta = game.apply_move(old_row, old_column, new_row, new_column)
+            if delta is None:
+                raise ReplayError(number, move, game.get_move_error())
+        else:
+            delta = game.apply_trusted_move(old_row, old_column, new_row, new_column)
+
+        if positions:
+            yield game.to_compact()
+        else:
+            yield delta
+
+
+
+def replay_games(games, size=20, spot_check_rate=0.0, random_source=None):
+    '''
+    Replays many games one after the other and yields (game_number, game) for each finished replay, where the game
+    is the GessGame at the end of the moves. The games can be any iterable of move lists, like a generator reading
+    an archive, so only one game is in memory at a time.
+    '''
+
+    for number, moves in enumerate(games):
+        game = GessGame(size)
+        for delta in replay(moves, size, False, spot_check_rate, random_source, game):
+            pass
+        yield number, game
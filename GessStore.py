@@ -0,0 +1,321 @@
+# Description: This is a store for the games of a server in an SQLite database, so a game doesn't have to be saved
+# whole after every move.
+# Each game is kept as its list of moves (one number per move, see GessGame.encode_move), with a snapshot of the
+# whole game (GessGame.pack) every snapshot_interval moves. Loading a game unpacks its latest snapshot and replays
+# only the moves after it with apply_trusted_move.
+# The moves wait in memory and are written batch_size at a time in one transaction, and the database is in WAL mode,
+# so readers aren't blocked while a batch is written. The games are indexed by player, by state and by the hash of
+# their current position (the final position once the game is over).
+# For example: store = GameStore('games.sqlite'); game_id = store.create_game('alice', 'bob')
+#              store.record_move(game_id, game, (17, 3, 16, 3)); store.load_game(game_id)
+
+import sqlite3
+import time
+
+from GessGame import GessGame, encode_move, decode_move, unpack_game
+
+
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS games (
+           id INTEGER PRIMARY KEY,
+           black TEXT,
+           white TEXT,
+           size INTEGER NOT NULL,
+           state TEXT NOT NULL,
+           moves INTEGER NOT NULL,
+           position_hash INTEGER NOT NULL,
+           created REAL NOT NULL,
+           updated REAL NOT NULL)""",
+    """CREATE TABLE IF NOT EXISTS moves (
+           game_id INTEGER NOT NULL,
+           number INTEGER NOT NULL,
+           move INTEGER NOT NULL,
+           PRIMARY KEY (game_id, number)) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS snapshots (
+           game_id INTEGER NOT NULL,
+           number INTEGER NOT NULL,
+           data BLOB NOT NULL,
+           PRIMARY KEY (game_id, number)) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS games_black ON games (black)",
+    "CREATE INDEX IF NOT EXISTS games_white ON games (white)",
+    "CREATE INDEX IF NOT EXISTS games_state ON games (state)",
+    "CREATE INDEX IF NOT EXISTS games_position_hash ON games (position_hash)",
+)
+
+
+
+def to_signed(position_hash):
+    '''
+    Returns a 64-bit hash as the signed number SQLite can keep in an INTEGER column.
+    '''
+
+    if position_hash >= 1 << 63:
+        return position_hash - (1 << 64)
+
+    return position_hash
+
+
+
+class GameStore:
+    '''
+    This is a class that contains the connection to the database and the writes waiting to be written to it.
+    The methods contained in this class are:
+    an init method
+    close
+    create_game
+    record_move
+    count_write
+    flush
+    record_result
+    load_game
+    get_moves
+    find_games
+    '''
+
+
+
+    def __init__(self, path, snapshot_interval=20, batch_size=100):
+        '''
+        Opens (or creates) the database at the path. A snapshot of a game is saved every snapshot_interval moves,
+        and the waiting writes are written once there are batch_size of them.
+        '''
+
+        self._connection = sqlite3.connect(path, isolation_level=None)      # the transactions are started by hand
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")  # a crash can lose the last batch, but never corrupts
+        for statement in SCHEMA:
+            self._connection.execute(statement)
+
+        self._snapshot_interval = snapshot_interval
+        self._batch_size = batch_size
+
+        self._counts = {}               # game id -> number of moves stored, for the games written to this session
+        self._moves = []                # the rows waiting to be written to each table
+        self._snapshots = []
+        self._updates = {}              # game id -> its latest state, move count and position hash
+        self._waiting = 0
+
+
+
+    def close(self):
+        '''
+        Writes everything still waiting and closes the database.
+        '''
+
+        self.flush()
+        self._connection.close()
+
+
+
+    def create_game(self, black=None, white=None, game=None):
+        '''
+        Starts storing a game between the two players and returns its id. The game is a new GessGame unless one is
+        given, and a snapshot of it is saved right away, so a game that didn't start from the usual position can
+        still be loaded.
+        The game is written at once in its own transaction, not with the batch, so the id comes from SQLite and two
+        stores open on the same database never hand out the same id.
+        '''
+
+        if game is None:
+            game = GessGame()
+
+        now = time.time()
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            game_id = connection.execute(
+                "INSERT INTO games (black, white, size, state, moves, position_hash, created, updated) "
+                "VALUES (?, ?, ?, ?, 0, ?, ?, ?)",
+                (black, white, game.get_size(), game.get_game_state(), to_signed(game.get_position_hash()), now,
+                 now)).lastrowid
+            connection.execute("INSERT INTO snapshots VALUES (?, 0, ?)", (game_id, game.pack()))
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+        self._counts[game_id] = 0
+
+        return game_id
+
+
+
+    def record_move(self, game_id, game, move):
+        '''
+        Stores a move that was just made in the game, as (old_row, old_column, new_row, new_column), with the game
+        as it is after the move. Every snapshot_interval moves, a snapshot of the game is saved too.
+        Returns the number of the move.
+        '''
+
+        count = self._counts.get(game_id)
+        if count is None:
+            self.flush()
+            found = self._connection.execute("SELECT moves FROM games WHERE id = ?", (game_id,)).fetchone()
+            if found is None:
+                raise KeyError(game_id)
+            count = found[0]
+
+        number = count + 1
+        self._counts[game_id] = number
+        self._moves.append((game_id, number, encode_move(move[0], move[1], move[2], move[3], game.get_size())))
+        writes = 1
+        if number % self._snapshot_interval == 0:
+            self._snapshots.append((game_id, number, game.pack()))
+            writes += 1
+        self._updates[game_id] = (game.get_game_state(), number, to_signed(game.get_position_hash()), time.time())
+        self.count_write(writes)
+
+        return number
+
+
+
+    def count_write(self, writes):
+        '''
+        Counts new waiting writes, and writes the batch once it is big enough.
+        '''
+
+        self._waiting += writes
+        if self._waiting >= self._batch_size:
+            self.flush()
+
+
+
+    def flush(self):
+        '''
+        Writes every waiting row in one transaction. The updates of a game made several times in the batch are
+        written once, with its latest values.
+        If the transaction fails, it is rolled back and the waiting rows are thrown away before the error is
+        raised, so the store can go on being used (the move counts are read again from the database). The moves of
+        that batch are lost, and the games they belong to load as they were before it.
+        '''
+
+        if not self._waiting:
+            return
+
+        moves, snapshots, updates = self._moves, self._snapshots, self._updates
+        self._moves = []
+        self._snapshots = []
+        self._updates = {}
+        self._waiting = 0
+
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany("INSERT INTO moves VALUES (?, ?, ?)", moves)
+            connection.executemany("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)", snapshots)
+            connection.executemany(
+                "UPDATE games SET state = ?, moves = ?, position_hash = ?, updated = ? WHERE id = ?",
+                [update + (game_id,) for game_id, update in updates.items()])
+        except BaseException:
+            connection.execute("ROLLBACK")
+            self._counts = {}
+            raise
+        connection.execute("COMMIT")
+
+
+
+    def record_result(self, game_id, state):
+        '''
+        Stores a result the moves of the game don't reach: a resignation, an adjudication or a time-out, as
+        "BLACK_WON", "WHITE_WON" or "DRAW". The waiting writes are written first, and the result is written at once
+        in its own transaction. Raises KeyError if there is no such game.
+        '''
+
+        if state not in ("BLACK_WON", "WHITE_WON", "DRAW"):
+            raise ValueError("A result can only be BLACK_WON, WHITE_WON or DRAW.")
+
+        self.flush()
+
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            changed = connection.execute("UPDATE games SET state = ?, updated = ? WHERE id = ?",
+                                         (state, time.time(), game_id)).rowcount
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+        if not changed:
+            raise KeyError(game_id)
+
+
+
+    def load_game(self, game_id):
+        '''
+        Returns the game with the given id as it is now: its latest snapshot with the moves made after it replayed.
+        If a result was stored with record_result, the game has that result even though its moves don't reach it.
+        Raises KeyError if there is no such game.
+        '''
+
+        self.flush()
+
+        found = self._connection.execute("SELECT state FROM games WHERE id = ?", (game_id,)).fetchone()
+        if found is None:
+            raise KeyError(game_id)
+
+        snapshot = self._connection.execute(
+            "SELECT number, data FROM snapshots WHERE game_id = ? ORDER BY number DESC LIMIT 1", (game_id,)).fetchone()
+        if snapshot is None:
+            raise KeyError(game_id)
+
+        game = unpack_game(snapshot[1])
+        size = game.get_size()
+        for (code,) in self._connection.execute(
+                "SELECT move FROM moves WHERE game_id = ? AND number > ? ORDER BY number", (game_id, snapshot[0])):
+            old_row, old_column, new_row, new_column = decode_move(code, size)
+            game.apply_trusted_move(old_row, old_column, new_row, new_column)
+
+        if found[0] != "UNFINISHED":
+            game.adjudicate_game(found[0])      # only changes a game the moves didn't finish
+
+        return game
+
+
+
+    def get_moves(self, game_id):
+        '''
+        Returns every move of the game as (old_row, old_column, new_row, new_column) tuples, in order.
+        '''
+
+        self.flush()
+
+        found = self._connection.execute("SELECT size FROM games WHERE id = ?", (game_id,)).fetchone()
+        if found is None:
+            raise KeyError(game_id)
+
+        return [decode_move(code, found[0]) for (code,) in self._connection.execute(
+            "SELECT move FROM moves WHERE game_id = ? ORDER BY number", (game_id,))]
+
+
+
+    def find_games(self, player=None, state=None, position_hash=None, limit=None):
+        '''
+        Returns the ids of the games matching everything given: a player (as black or white), a game state like
+        "UNFINISHED", and the hash of the current position (GessGame.get_position_hash), newest first.
+        '''
+
+        self.flush()
+
+        conditions = []
+        parameters = []
+        if player is not None:
+            conditions.append("(black = ? OR white = ?)")
+            parameters += [player, player]
+        if state is not None:
+            conditions.append("state = ?")
+            parameters.append(state)
+        if position_hash is not None:
+            conditions.append("position_hash = ?")
+            parameters.append(to_signed(position_hash))
+
+        query = "SELECT id FROM games"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+
+        return [game_id for (game_id,) in self._connection.execute(query, parameters)]
@@ -0,0 +1,351 @@
+# Description: This is a tournament between two settings of the engine in GessEngine.py, for checking that a change
+# to the engine (or to the rules code under it) didn't make it weaker or slower.
+# The games are played by a pool of worker processes. Each opening is a few random moves from the start, and it is
+# played twice, once with each engine as black, so neither engine is helped by a lucky opening.
+# After each game a sequential probability ratio test (SPRT) compares "the first engine is elo0 stronger" with "it is
+# elo1 stronger", and the tournament stops as soon as one of them is accepted, so a clear result doesn't need all the
+# games. The test uses the wins, draws and losses themselves (a trinomial generalized SPRT), so a run of the same
+# result is judged by how likely it is under each hypothesis, not by a variance it doesn't have.
+# Each side's nodes per second and time per move are reported with the score.
+# An engine is written as JSON: the search depth, the time limit per move and any GessEngine settings, for example
+# python GessTournament.py --first '{"depth": 2}' --second '{"depth": 2, "move_ordering": false}' --games 200
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from GessEngine import GessEngine
+from GessGame import GessGame, decode_move
+
+
+
+ENGINE_SEARCH_SETTINGS = ("depth", "time")      # the settings of an engine that go to search, not to GessEngine
+
+PSEUDO_COUNT = 0.001            # added to the count of each result, so a result that hasn't happened yet is unlikely
+                                # rather than impossible
+
+
+
+def make_openings(count, plies, seed=None, size=20):
+    '''
+    Returns count openings on a board of the given size, each a list of plies random moves from the start as
+    (old_row, old_column, new_row, new_column) tuples. A move that would end the game is never chosen, so every
+    opening can still be played.
+    '''
+
+    random_source = random.Random(seed)
+    openings = []
+
+    for number in range(count):
+        game = GessGame(size)
+        moves = []
+        for ply in range(plies):
+            legal = list(game.generate_move_codes())
+            random_source.shuffle(legal)
+            for code in legal:
+                move = decode_move(code, size)
+                delta = game.apply_trusted_move(move[0], move[1], move[2], move[3])
+                if game.get_game_state() == "UNFINISHED":
+                    moves.append(move)
+                    break
+                game.undo_move(delta)
+            else:
+                break
+        openings.append(moves)
+
+    return openings
+
+
+
+def play_game(task):
+    '''
+    Plays one game of the tournament inside a worker process. The task is (game_number, opening, first, second,
+    first_is_black, max_plies, size), where first and second are the engine settings.
+    Returns a dictionary with the result for the first engine (1 for a win, 0.5 for a draw, 0 for a loss) and, for
+    each engine, the moves it made, the positions it searched and the time it took.
+    '''
+
+    game_number, opening, first, second, first_is_black, max_plies, size = task
+
+    game = GessGame(size, repetition_limit=3, max_plies=max_plies)
+    for move in opening:
+        game.apply_trusted_move(move[0], move[1], move[2], move[3])
+
+    sides = {}
+    for name, settings, color in (("first", first, 'B' if first_is_black else 'W'),
+                                  ("second", second, 'W' if first_is_black else 'B')):
+        options = {key: value for key, value in settings.items() if key not in ENGINE_SEARCH_SETTINGS}
+        sides[color] = {"name": name, "engine": GessEngine(**options), "depth": settings.get("depth", 3),
+                        "time_limit": settings.get("time"), "moves": 0, "nodes": 0, "seconds": 0.0}
+
+    while game.get_game_state() == "UNFINISHED":
+        side = sides[game.get_player()]
+        started = time.perf_counter()
+        result = side["engine"].search(game, side["depth"], side["time_limit"])
+        side["seconds"] += time.perf_counter() - started
+        side["moves"] += 1
+        side["nodes"] += result.nodes
+
+        if result.best_move is None:            # a player who can't move can't change the game any more
+            game.adjudicate_game("DRAW")
+            break
+        move = result.best_move
+        game.apply_trusted_move(move[0], move[1], move[2], move[3])
+
+    state = game.get_game_state()
+    if state == "DRAW":
+        score = 0.5
+    elif (state == "BLACK_WON") == first_is_black:
+        score = 1.0
+    else:
+        score = 0.0
+
+    report = {"game": game_number, "first_is_black": first_is_black, "state": state, "score": score}
+    for side in sides.values():
+        report[side["name"]] = {"moves": side["moves"], "nodes": side["nodes"], "seconds": side["seconds"]}
+
+    return report
+
+
+
+def get_expected_score(elo):
+    '''
+    Returns the expected score of a player the given number of Elo points stronger, from 0 to 1.
+    '''
+
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+
+def get_most_likely(frequencies, score):
+    '''
+    Returns the chances of each result, closest to the frequencies (as (score of the result, share of the games)
+    pairs) whose expected score is the given score. These are frequency / (1 + x * (result - score)), where x is
+    the number that makes the expected score come out right, found by bisection.
+    '''
+
+    low = -1 / (max(result for result, frequency in frequencies) - score)
+    high = 1 / (score - min(result for result, frequency in frequencies))
+
+    for step in range(200):                 # the expected score of the chances goes down as x goes up
+        middle = (low + high) / 2
+        if sum(frequency * (result - score) / (1 + middle * (result - score))
+               for result, frequency in frequencies) > 0:
+            low = middle
+        else:
+            high = middle
+
+    return [frequency / (1 + low * (result - score)) for result, frequency in frequencies]
+
+
+
+def get_log_likelihood_ratio(wins, draws, losses, elo0, elo1):
+    '''
+    Returns the log-likelihood ratio of "the first engine is elo1 stronger" against "it is elo0 stronger" for the
+    results so far. Under each hypothesis the chances of a win, a draw and a loss are the ones closest to the results
+    so far with that hypothesis's expected score (see get_most_likely), and the ratio compares how likely the results
+    are with each.
+    A run of the same result is decided slowly: n straight wins give about n * log(score1 / score0), so the default
+    10 Elo needs about 100 of them.
+    '''
+
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0
+
+    total = games + 3 * PSEUDO_COUNT
+    frequencies = [(0.0, (losses + PSEUDO_COUNT) / total), (0.5, (draws + PSEUDO_COUNT) / total),
+                   (1.0, (wins + PSEUDO_COUNT) / total)]
+
+    chances0 = get_most_likely(frequencies, get_expected_score(elo0))
+    chances1 = get_most_likely(frequencies, get_expected_score(elo1))
+
+    return games * sum(frequency * math.log(chance1 / chance0)
+                       for (result, frequency), chance0, chance1 in zip(frequencies, chances0, chances1))
+
+
+
+def get_elo(wins, draws, losses):
+    '''
+    Returns the Elo difference that matches the score of the first engine, or None if it won or lost every game.
+    '''
+
+    games = wins + draws + losses
+    score = (wins + draws / 2) / games if games else 0.5
+    if score <= 0 or score >= 1:
+        return None
+
+    return -400 * math.log10(1 / score - 1)
+
+
+
+class Tournament:
+    '''
+    This is a class that contains the results of a tournament between two engines as the games come in, and the
+    sequential probability ratio test that decides when to stop.
+    The methods contained in this class are:
+    an init method
+    add_result
+    get_decision
+    get_summary
+    '''
+
+
+
+    def __init__(self, elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05):
+        '''
+        Initializes an empty tournament. The test accepts "the first engine is elo0 stronger" (H0) or "it is elo1
+        stronger" (H1), wrongly accepting H1 with probability alpha and H0 with probability beta.
+        '''
+
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower_bound = math.log(beta / (1 - alpha))
+        self.upper_bound = math.log((1 - beta) / alpha)
+
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.totals = {"first": {"moves": 0, "nodes": 0, "seconds": 0.0},
+                       "second": {"moves": 0, "nodes": 0, "seconds": 0.0}}
+
+
+
+    def add_result(self, report):
+        '''
+        Adds the report of one game from play_game.
+        '''
+
+        if report["score"] == 1:
+            self.wins += 1
+        elif report["score"] == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+
+        for name, totals in self.totals.items():
+            for key in totals:
+                totals[key] += report[name][key]
+
+
+
+    def get_decision(self):
+        '''
+        Returns "H1" if the first engine is shown to be elo1 stronger, "H0" if it is shown to be at most elo0
+        stronger, or None if more games are needed.
+        '''
+
+        ratio = get_log_likelihood_ratio(self.wins, self.draws, self.losses, self.elo0, self.elo1)
+        if ratio >= self.upper_bound:
+            return "H1"
+        if ratio <= self.lower_bound:
+            return "H0"
+
+        return None
+
+
+
+    def get_summary(self):
+        '''
+        Returns the results so far as a dictionary that can be written as JSON.
+        '''
+
+        elo = get_elo(self.wins, self.draws, self.losses)
+        summary = {
+            "games": self.wins + self.draws + self.losses,
+            "wins": self.wins,
+            "draws": self.draws,
+            "losses": self.losses,
+            "elo": round(elo, 1) if elo is not None else None,
+            "llr": round(get_log_likelihood_ratio(self.wins, self.draws, self.losses, self.elo0, self.elo1), 3),
+            "llr_bounds": [round(self.lower_bound, 3), round(self.upper_bound, 3)],
+            "decision": self.get_decision(),
+        }
+
+        for name, totals in self.totals.items():
+            summary[name] = {
+                "nodes_per_second": round(totals["nodes"] / totals["seconds"]) if totals["seconds"] else 0,
+                "seconds_per_move": round(totals["seconds"] / totals["moves"], 4) if totals["moves"] else 0,
+            }
+
+        return summary
+
+
+
+def run_tournament(first, second, games=100, openings=None, opening_plies=4, max_plies=200, workers=None,
+                   tournament=None, seed=None, report=None, size=20):
+    '''
+    Plays up to games games between the two engine settings on a board of the given size with a pool of worker
+    processes, and returns the Tournament with the results. The games come in pairs on the same opening with the
+    colors swapped, and the pool is stopped as soon as the test is decided. Each finished game's report is given to
+    the report function, if any.
+    '''
+
+    if workers is None:
+        workers = os.cpu_count()
+    if tournament is None:
+        tournament = Tournament()
+    if openings is None:
+        openings = make_openings((games + 1) // 2, opening_plies, seed, size)
+
+    tasks = [(number, openings[number // 2 % len(openings)], first, second, number % 2 == 0, max_plies, size)
+             for number in range(games)]
+
+    with multiprocessing.Pool(workers) as pool:
+        for game_report in pool.imap_unordered(play_game, tasks):
+            tournament.add_result(game_report)
+            if report is not None:
+                report(game_report)
+            if tournament.get_decision() is not None:
+                pool.terminate()                # the games still running don't matter any more
+                break
+
+    return tournament
+
+
+
+def main(arguments=None):
+    '''
+    Reads the command line, runs the tournament and prints each game and then the summary as JSON lines.
+    Returns 0 unless the first engine was shown to be weaker than elo1 (H0), then 1.
+    '''
+
+    parser = argparse.ArgumentParser(prog="gess-tournament", description="Play two Gess engine settings against "
+                                                                         "each other until the result is clear.")
+    parser.add_argument("--first", default='{}', help="the settings of the first engine as JSON (default {})")
+    parser.add_argument("--second", default='{}', help="the settings of the second engine as JSON (default {})")
+    parser.add_argument("--games", type=int, default=100, help="the most games to play (default 100)")
+    parser.add_argument("--size", type=int, default=20, help="the size of the board (default 20)")
+    parser.add_argument("--opening-plies", type=int, default=4, help="random moves in each opening (default 4)")
+    parser.add_argument("--max-plies", type=int, default=200, help="moves before a game is a draw (default 200)")
+    parser.add_argument("--elo0", type=float, default=0.0, help="the Elo difference of H0 (default 0)")
+    parser.add_argument("--elo1", type=float, default=10.0, help="the Elo difference of H1 (default 10)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="the false positive rate (default 0.05)")
+    parser.add_argument("--beta", type=float, default=0.05, help="the false negative rate (default 0.05)")
+    parser.add_argument("--seed", type=int, default=None, help="the seed of the random openings")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    options = parser.parse_args(arguments)
+
+    tournament = Tournament(options.elo0, options.elo1, options.alpha, options.beta)
+
+    def report(game_report):
+        print(json.dumps(game_report))
+        sys.stdout.flush()
+
+    run_tournament(json.loads(options.first), json.loads(options.second), options.games, None,
+                   options.opening_plies, options.max_plies, options.workers, tournament, options.seed, report,
+                   options.size)
+    summary = tournament.get_summary()
+    print(json.dumps(summary))
+
+    return 1 if summary["decision"] == "H0" else 0
+
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# Description: These are the fixtures shared by the tests. The modules of the game are at the top of the repository,
+# so it is put on the path first, which lets the tests run with plain pytest from anywhere.
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GessGame import GessGame
+
+
+
+def make_layout(size, black, white):
+    '''
+    Returns the layout of a board of the given size with black stones at the black (row, column) blocks and white
+    stones at the white ones.
+    '''
+
+    rows = [['-'] * size for i in range(size)]
+    for i, j in black:
+        rows[i][j] = 'B'
+    for i, j in white:
+        rows[i][j] = 'W'
+
+    return [''.join(row) for row in rows]
+
+
+
+def make_ring(row, column):
+    '''
+    Returns the blocks of a ring around the center.
+    '''
+
+    return [(row + i, column + j) for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j]
+
+
+
+@pytest.fixture
+def mate_in_one():
+    '''
+    A position where black, to move, breaks white's only ring by moving the stone at (14, 12) one step east.
+    '''
+
+    return GessGame(20, make_layout(20, make_ring(5, 5) + [(14, 12)], make_ring(14, 15)))
+
+
+
+@pytest.fixture
+def sparse_position():
+    '''
+    A position with 40 stones in four rings and a few loose stones, which has close to 300 moves, so an exhaustive
+    endgame solve of it takes minutes.
+    '''
+
+    black = make_ring(4, 4) + make_ring(4, 14) + [(8, 8), (8, 11), (9, 3), (9, 16)]
+    white = make_ring(15, 4) + make_ring(15, 14) + [(11, 8), (11, 11), (10, 3), (10, 16)]
+
+    return GessGame(20, make_layout(20, black, white))
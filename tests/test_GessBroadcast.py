@@ -0,0 +1,129 @@
+# Description: These are the tests of the spectator broadcast in GessBroadcast.py: a spectator rebuilds the board
+# from the frames whenever they join, a spectator who falls behind is dropped, and a refused move can't be published.
+
+import random
+
+import pytest
+
+from GessBroadcast import Broadcaster, SpectatorBoard
+from GessGame import GessGame
+
+
+
+def read_frames(frames, spectator):
+    '''
+    Applies every frame waiting in the queue to the spectator's board. Returns False if the queue ended with None.
+    '''
+
+    while not frames.empty():
+        frame = frames.get_nowait()
+        if frame is None:
+            return False
+        spectator.apply_frame(frame)
+
+    return True
+
+
+
+def get_rows(game):
+    '''
+    Returns the board of the game as a list of strings, like SpectatorBoard.get_rows.
+    '''
+
+    return [''.join(row) for row in game._board]
+
+
+
+def test_spectators_see_the_board_whenever_they_join():
+    '''
+    A spectator from the start and one who joins after several keyframes both end up with the board of the game.
+    '''
+
+    random_source = random.Random(1)
+    game = GessGame(14)
+    broadcaster = Broadcaster(game, keyframe_interval=5, queue_size=100)
+    early_frames = broadcaster.subscribe()
+    early = SpectatorBoard()
+    late_frames = None
+    late = SpectatorBoard()
+
+    for ply in range(30):
+        move = random_source.choice(game.generate_moves())
+        delta = game.apply_move(move[0], move[1], move[2], move[3])
+        broadcaster.publish(delta)
+        if ply == 12:
+            late_frames = broadcaster.subscribe()
+        assert read_frames(early_frames, early)
+        assert early.get_rows() == get_rows(game)
+        if late_frames is not None:
+            assert read_frames(late_frames, late)
+            assert late.get_rows() == get_rows(game)
+        if game.get_game_state() != "UNFINISHED":
+            break
+
+    assert early.game_state == game.get_game_state()
+
+
+
+def test_slow_spectator_is_dropped():
+    '''
+    A spectator whose queue fills up is dropped with None, and the others keep getting frames.
+    '''
+
+    game = GessGame()
+    broadcaster = Broadcaster(game, queue_size=4)
+    slow = broadcaster.subscribe()
+    fast = broadcaster.subscribe()
+    spectator = SpectatorBoard()
+
+    for ply in range(6):
+        move = game.generate_moves()[0]
+        broadcaster.publish(game.apply_move(move[0], move[1], move[2], move[3]))
+        assert read_frames(fast, spectator)
+
+    assert broadcaster.dropped == 1
+    assert slow.get_nowait() is None
+    assert spectator.get_rows() == get_rows(game)
+
+
+
+def test_refused_move_is_not_published():
+    '''
+    Publishing what apply_move returns for a refused move raises ValueError and sends nothing.
+    '''
+
+    game = GessGame()
+    broadcaster = Broadcaster(game)
+    frames = broadcaster.subscribe()
+    frames.get_nowait()                         # the first keyframe
+
+    with pytest.raises(ValueError):
+        broadcaster.publish(game.apply_move(1, 1, 1, 1))
+    assert frames.empty()
+    assert broadcaster.frames_sent == 0
+
+
+
+def test_late_spectator_with_a_long_catch_up_is_kept():
+    '''
+    A spectator who joins when more moves have been made since the last keyframe than fit in queue_size gets all of
+    them and still has room for the next queue_size frames.
+    '''
+
+    game = GessGame()
+    broadcaster = Broadcaster(game, keyframe_interval=100, queue_size=4)
+
+    for ply in range(10):
+        move = game.generate_moves()[0]
+        broadcaster.publish(game.apply_move(move[0], move[1], move[2], move[3]))
+
+    frames = broadcaster.subscribe()
+    spectator = SpectatorBoard()
+    for ply in range(4):
+        move = game.generate_moves()[0]
+        broadcaster.publish(game.apply_move(move[0], move[1], move[2], move[3]))
+
+    assert broadcaster.dropped == 0
+    assert read_frames(frames, spectator)
+    assert spectator.sequence == 14
+    assert spectator.get_rows() == get_rows(game)
@@ -0,0 +1,104 @@
+# Description: These are the tests of the exact endgame solver in GessEndgame.py: it proves wins, keeps draws as
+# draws, gives up (UNKNOWN) when it has searched node_limit positions, stops for a deadline or a cancel token, and
+# keeps what it proved in its table on disk.
+
+import time
+
+import pytest
+
+from GessClock import CancelToken, SearchTimeout
+from GessEndgame import DRAW, UNKNOWN, WIN, EndgameSolver
+from GessGame import GessGame
+
+
+
+def test_solver_proves_a_win_in_one(mate_in_one):
+    '''
+    The solver finds the move that breaks the opponent's last ring, and leaves the game as it was.
+    '''
+
+    compact = mate_in_one.to_compact()
+    outcome, distance, move = EndgameSolver().solve(mate_in_one)
+
+    assert (outcome, distance) == (WIN, 1)
+    assert mate_in_one.to_compact() == compact
+    mate_in_one.apply_move(move[0], move[1], move[2], move[3])
+    assert mate_in_one.get_game_state() == "BLACK_WON"
+
+
+
+def test_solved_positions_are_kept_on_disk(mate_in_one, tmp_path):
+    '''
+    A position proved once is found in the table on disk by another solver, even a read-only one.
+    '''
+
+    path = str(tmp_path / "endgame")
+    solver = EndgameSolver(path)
+    result = solver.solve(mate_in_one)
+    solver.close()
+
+    solver = EndgameSolver(path, read_only=True)
+    key, symmetry = solver.get_key(mate_in_one)
+    assert solver.lookup(key) == result
+    assert solver.solve(mate_in_one) == result
+    assert solver.nodes == 1
+    solver.close()
+
+
+
+def test_solver_gives_up_at_the_node_limit(sparse_position):
+    '''
+    A position with hundreds of moves would take minutes to search 3 moves deep, so the solve stops at node_limit
+    positions with UNKNOWN and the game as it was.
+    '''
+
+    compact = sparse_position.to_compact()
+    solver = EndgameSolver(node_limit=2000)
+
+    started = time.perf_counter()
+    assert solver.solve(sparse_position, max_depth=3)[0] == UNKNOWN
+    assert time.perf_counter() - started < 5
+    assert solver.nodes <= 2001
+    assert sparse_position.to_compact() == compact
+
+
+
+def test_draws_are_their_own_outcome(sparse_position):
+    '''
+    When the move limit ends the game after any move that doesn't win, the position is a draw, not UNKNOWN, and
+    the result isn't kept once the solve is over, because it depends on the move number.
+    '''
+
+    game = GessGame(20, sparse_position._board, max_plies=1)
+    solver = EndgameSolver()
+
+    outcome, distance, move = solver.solve(game, max_depth=1)
+    assert (outcome, distance) == (DRAW, 1)
+    assert move is not None
+    assert solver.lookup(solver.get_key(game)[0]) is None
+
+
+
+@pytest.mark.parametrize("stop", ["deadline", "cancel"])
+def test_solver_stops_for_the_deadline_and_the_cancel_token(sparse_position, stop):
+    '''
+    A solve without a node limit still stops with SearchTimeout once the deadline has passed or the token is
+    cancelled, and leaves the game as it was.
+    '''
+
+    compact = sparse_position.to_compact()
+    last_move = sparse_position.get_last_move()
+    solver = EndgameSolver(max_depth=5, node_limit=10 ** 9)
+    deadline, cancel = None, None
+    if stop == "deadline":
+        deadline = time.perf_counter() + 0.2
+    else:
+        cancel = CancelToken()
+        cancel.cancel()
+
+    started = time.perf_counter()
+    with pytest.raises(SearchTimeout):
+        solver.solve(sparse_position, deadline=deadline, cancel=cancel)
+    assert time.perf_counter() - started < 2
+    assert sparse_position.to_compact() == compact
+    assert sparse_position.get_last_move() is last_move
@@ -0,0 +1,159 @@
+# Description: These are the tests of the search in GessEngine.py, with and without the endgame solver: it finds
+# a win, leaves the game as it was, and stops on time (for a time limit, a clock or a cancel token) even while the
+# endgame solver is still working. The quiescence search never prunes away the capture of a last ring, and the move
+# ordering changes how many positions are searched but not the move found.
+
+import threading
+import time
+
+import pytest
+
+from GessClock import CancelToken, TimeManager
+from GessEndgame import EndgameSolver
+from GessEngine import WIN_SCORE, GessEngine
+from GessGame import GessGame
+from conftest import make_layout, make_ring
+
+
+
+def make_engine(with_endgame):
+    '''
+    Returns an engine, with an endgame solver for every position that would search for minutes unless it is stopped.
+    '''
+
+    if with_endgame:
+        return GessEngine(endgame=EndgameSolver(stone_limit=40, max_depth=5, node_limit=10 ** 9))
+
+    return GessEngine()
+
+
+
+def is_valid(game, move):
+    '''
+    Returns True if the move can be made in the game.
+    '''
+
+    return move is not None and game.clone().apply_move(move[0], move[1], move[2], move[3]) is not None
+
+
+
+def test_search_leaves_the_game_as_it_was():
+    '''
+    A search of the start gives a valid move and a line, and the game is the same afterwards, including its last move
+    and the reason of its last refused move.
+    '''
+
+    game = GessGame()
+    move = game.generate_moves()[0]
+    game.apply_move(move[0], move[1], move[2], move[3])
+    game.apply_move(1, 1, 1, 1)                 # refused, so there is a move error to keep
+    compact = game.to_compact()
+    last_move = game.get_last_move()
+    move_error = game.get_move_error()
+
+    result = GessEngine().search(game, 2)
+
+    assert is_valid(game, result.best_move)
+    assert result.line[0] == result.best_move
+    assert result.depth == 2
+    assert game.to_compact() == compact
+    assert game.get_last_move() is last_move
+    assert game.get_move_error() == move_error
+
+
+
+@pytest.mark.parametrize("with_endgame", [False, True])
+def test_search_finds_a_win_in_one(mate_in_one, with_endgame):
+    '''
+    The move that breaks the opponent's last ring is found, with the score of a win in one move.
+    '''
+
+    result = GessEngine(endgame=EndgameSolver() if with_endgame else None).search(mate_in_one, 2)
+
+    mate_in_one.apply_move(result.best_move[0], result.best_move[1], result.best_move[2], result.best_move[3])
+    assert mate_in_one.get_game_state() == "BLACK_WON"
+    assert result.score == WIN_SCORE - 1
+
+
+
+@pytest.mark.parametrize("with_endgame", [False, True])
+def test_search_stops_at_the_time_limit(sparse_position, with_endgame):
+    '''
+    A search that would take minutes stops at its time limit with a valid move, even while the endgame solver runs.
+    '''
+
+    started = time.perf_counter()
+    result = make_engine(with_endgame).search(sparse_position, 4, time_limit=0.5)
+
+    assert time.perf_counter() - started < 2
+    assert is_valid(sparse_position, result.best_move)
+
+
+
+@pytest.mark.parametrize("with_endgame", [False, True])
+def test_search_stops_when_cancelled(sparse_position, with_endgame):
+    '''
+    Cancelling the token from another thread stops the search within about a position, with a valid move.
+    '''
+
+    cancel = CancelToken()
+    timer = threading.Timer(0.3, cancel.cancel)
+    timer.start()
+
+    started = time.perf_counter()
+    result = make_engine(with_endgame).search(sparse_position, 4, time_limit=60, cancel=cancel)
+    timer.join()
+
+    assert time.perf_counter() - started < 2
+    assert is_valid(sparse_position, result.best_move)
+
+
+
+@pytest.mark.parametrize("with_endgame", [False, True])
+def test_search_keeps_to_the_clock(sparse_position, with_endgame):
+    '''
+    On a clock, the search never goes over the most time the clock gives the move.
+    '''
+
+    clock = TimeManager(remaining=4)
+    started = time.perf_counter()
+    result = make_engine(with_endgame).search(sparse_position, 64, clock=clock)
+
+    assert time.perf_counter() - started < clock.maximum + 1
+    assert is_valid(sparse_position, result.best_move)
+
+
+
+def test_quiescence_finds_the_capture_of_the_last_ring():
+    '''
+    A capture that breaks the opponent's last ring wins, so it is found even when alpha is already far above what a
+    few stones and a ring are worth (as after a bigger capture was searched first), where delta pruning would skip
+    any other capture. Here black can take 3 loose stones, or take 2 or 3 stones of white's only ring.
+    '''
+
+    black = make_ring(5, 5) + [(14, 12), (10, 10), (10, 11)]
+    white = make_ring(14, 15) + [(9, 12), (10, 12), (11, 12), (9, 13), (11, 13)]
+    game = GessGame(20, make_layout(20, black, white))
+    engine = GessEngine()
+    standing = engine.evaluate(game)
+
+    assert engine.quiescence(game, standing + 60, WIN_SCORE + 1, 0, 4) == WIN_SCORE - 1
+
+    result = engine.search(game, 1)
+    game.apply_move(result.best_move[0], result.best_move[1], result.best_move[2], result.best_move[3])
+    assert game.get_game_state() == "BLACK_WON"
+
+
+
+def test_move_ordering_only_saves_work(sparse_position):
+    '''
+    Trying the captures, killer moves and history moves first finds the same best move and score as trying the moves
+    in the order they are generated, in far fewer positions.
+    '''
+
+    ordered = GessEngine().search(sparse_position.clone(), 2)
+    unordered = GessEngine(move_ordering=False).search(sparse_position.clone(), 2)
+
+    assert ordered.best_move == unordered.best_move
+    assert ordered.score == unordered.score
+    assert ordered.nodes * 2 < unordered.nodes
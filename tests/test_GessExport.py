@@ -0,0 +1,127 @@
+# Description: These are the tests of the training data export in GessExport.py, which only run when numpy is
+# installed: the planes of a position match the game (its stones, rings, the centers generate_moves moves from and
+# whose turn it is), positions roll over into new shards, and every position is read back with its row of the table.
+
+import random
+
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+from GessExport import PLANES, TrainingData, TrainingExporter, decode_packed
+from GessGame import GessGame, STATE_CODES, encode_move
+
+
+
+def play_game(count, seed, size=20):
+    '''
+    Returns the positions (as games) before each of up to count random moves, and the moves.
+    '''
+
+    random_source = random.Random(seed)
+    game = GessGame(size)
+    positions = []
+    moves = []
+    for number in range(count):
+        legal = game.generate_moves()
+        if not legal or game.get_game_state() != "UNFINISHED":
+            break
+        positions.append(game.clone())
+        move = random_source.choice(legal)
+        game.apply_trusted_move(move[0], move[1], move[2], move[3])
+        moves.append(move)
+
+    return positions, moves
+
+
+
+def get_plane(game, blocks):
+    '''
+    Returns a plane of the board with 1 on the given blocks.
+    '''
+
+    size = game.get_size()
+    plane = numpy.zeros((size, size), numpy.uint8)
+    for row, column in blocks:
+        plane[row, column] = 1
+
+    return plane
+
+
+
+def check_planes(game, planes):
+    '''
+    Checks each plane of one position against the game, seen from the player to move.
+    '''
+
+    own = game.get_player()
+    opponent = 'W' if own == 'B' else 'B'
+    size = game.get_size()
+
+    for index, player in ((0, own), (1, opponent)):
+        stones = [(row, column) for row in range(size) for column in range(size) if game._board[row][column] == player]
+        assert (planes[index] == get_plane(game, stones)).all()
+    assert (planes[2] == get_plane(game, game.get_rings(own))).all()
+    assert (planes[3] == get_plane(game, game.get_rings(opponent))).all()
+    movable = {(move[0], move[1]) for move in game.generate_moves()}
+    assert (planes[4] == get_plane(game, movable)).all()
+    assert (planes[5] == (own == 'W')).all()
+
+
+
+def test_planes_match_the_game():
+    '''
+    The planes decoded straight from packed games are the stones, the rings, the centers with a valid move and the
+    turn of each position, and the states come back with them.
+    '''
+
+    positions, moves = play_game(40, 3)
+    planes, states = decode_packed([game.pack() for game in positions])
+
+    assert planes.shape == (len(positions), len(PLANES), 20, 20)
+    assert list(states) == [STATE_CODES[game.get_game_state()] for game in positions]
+    for game, position_planes in zip(positions, planes):
+        check_planes(game, position_planes)
+
+
+
+def test_positions_roll_over_into_shards(tmp_path):
+    '''
+    Positions written a few at a time fill shards of shard_size and start new ones, and every position is read back,
+    by number or in batches, with the planes of its game and its row of the table.
+    '''
+
+    first_positions, first_moves = play_game(9, 3)
+    second_positions, second_moves = play_game(6, 4)
+
+    exporter = TrainingExporter(str(tmp_path), shard_size=4, buffer_size=3)
+    assert exporter.add_game(first_moves, "WHITE_WON") == len(first_moves)
+    assert exporter.add_game(second_moves, game_number=7) == len(second_moves)
+    exporter.close()
+
+    positions = first_positions + second_positions
+    data = TrainingData(str(tmp_path))
+    assert data.get_count() == len(positions) == 15
+    assert [shard["positions"] for shard in data.index["shards"]] == [4, 4, 4, 3]
+
+    expected = []
+    for game_number, result, games, moves in ((0, "WHITE_WON", first_positions, first_moves),
+                                              (7, "UNFINISHED", second_positions, second_moves)):
+        for number, (game, move) in enumerate(zip(games, moves), 1):
+            outcome = 0 if result == "UNFINISHED" else 1 if game.get_player() == 'W' else -1
+            expected.append([game_number, number, encode_move(move[0], move[1], move[2], move[3], 20), outcome])
+
+    planes, table = data.get_batch([14, 0, 5, 3, 4])
+    assert table.tolist() == [expected[14], expected[0], expected[5], expected[3], expected[4]]
+    check_planes(positions[14], planes[0])
+    check_planes(positions[4], planes[4])
+
+    batches = list(data.batches(6))
+    assert [len(table) for planes, table in batches] == [6, 6, 3]
+    assert numpy.concatenate([table for planes, table in batches]).tolist() == expected
+    for game, position_planes in zip(positions, numpy.concatenate([planes for planes, table in batches])):
+        check_planes(game, position_planes)
+
+    shuffled = numpy.concatenate([table for planes, table in data.batches(4, shuffle=True, seed=5)]).tolist()
+    assert shuffled != expected
+    assert sorted(shuffled) == sorted(expected)
@@ -0,0 +1,373 @@
+# Description: These are the tests of the rules in GessGame.py. The rules were rewritten for speed (bitmasks, the
+# pattern table, MoveDelta and undo_move), so random games are played against baseline_GessGame.py, the rules as they
+# were before, and every move tried has to be valid or invalid in both and leave the same board. At sampled plies,
+# every move along a line is tried on the baseline, and generate_moves has to give exactly the moves it accepts.
+# The rest checks that the shortcuts give back exactly what they were given: undo_move, pack and unpack_game, the
+# move numbers, the move lists and attack maps kept between moves, and the hashes of the position seen through each
+# symmetry.
+
+import contextlib
+import copy
+import io
+import random
+
+import pytest
+
+import baseline_GessGame
+from GessGame import (COLOR_FLIP, COLUMN_LETTERS, DIRECTIONS, MIN_BOARD_SIZE, MIRROR, SWAPPED_STONES, SYMMETRIES,
+                      GessGame, decode_move, encode_move, load_compact, transform_move, unpack_game)
+
+
+
+def get_state(game):
+    '''
+    Returns everything a move can change in the game, copied, so it can be compared after the move is taken back.
+    '''
+
+    return (
+        [list(row) for row in game._board],
+        {player: list(game.get_row_masks(player)) for player in ('B', 'W')},
+        {player: set(game.get_rings(player)) for player in ('B', 'W')},
+        {player: game.get_stone_count(player) for player in ('B', 'W')},
+        list(game._hashes),
+        dict(game._history),
+        game.get_game_state(),
+        game.get_player(),
+        game.to_compact(),
+        game.get_last_move(),
+    )
+
+
+
+def play_random_moves(game, plies, random_source):
+    '''
+    Yields the game after each of up to plies random valid moves, stopping when the game is over or the player to
+    move has no moves.
+    '''
+
+    for ply in range(plies):
+        if game.get_game_state() != "UNFINISHED":
+            return
+        moves = game.generate_moves()
+        if not moves:
+            return
+        move = random_source.choice(moves)
+        assert game.apply_move(move[0], move[1], move[2], move[3]) is not None
+        yield game
+
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_rules_match_the_baseline(seed):
+    '''
+    Every move tried in a random game (some valid, some random and mostly invalid) is valid in the new rules exactly
+    when it is valid in the baseline, and leaves the same board and game state.
+    '''
+
+    random_source = random.Random(seed)
+    game = GessGame()
+    baseline = baseline_GessGame.GessGame()
+
+    for ply in range(40):
+        if game.get_game_state() != "UNFINISHED":
+            break
+
+        valid = game.generate_moves()
+        tried = random_source.sample(valid, min(len(valid), 8))
+        tried += [tuple(random_source.randrange(20) for i in range(4)) for j in range(12)]
+
+        for move in tried:
+            trial = game.clone()
+            baseline_trial = copy.deepcopy(baseline)
+            with contextlib.redirect_stdout(io.StringIO()):     # the baseline prints the board or the reason
+                baseline_valid = baseline_trial.make_move(game.get_coordinates(move[0], move[1]),
+                                                          game.get_coordinates(move[2], move[3]))
+            assert (trial.apply_move(move[0], move[1], move[2], move[3]) is not None) == baseline_valid, move
+            assert trial._board == baseline_trial._board
+            assert trial.get_game_state() == baseline_trial.get_game_state()
+
+        if not valid:
+            break
+        move = random_source.choice(valid)
+        game.apply_move(move[0], move[1], move[2], move[3])
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert baseline.make_move(game.get_coordinates(move[0], move[1]), game.get_coordinates(move[2], move[3]))
+
+        assert game._board == baseline._board
+        assert game.get_game_state() == baseline.get_game_state()
+
+
+
+def find_baseline_moves(game):
+    '''
+    Returns the set of moves the baseline accepts in the position of the game: every move along a line (the only
+    moves the rules allow) from every center to every center, each tried on its own copy of the baseline.
+    '''
+
+    moves = set()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for old_row in range(1, 19):
+            for old_column in range(1, 19):
+                for name, row_step, column_step in DIRECTIONS:
+                    new_row, new_column = old_row + row_step, old_column + column_step
+                    while 1 <= new_row <= 18 and 1 <= new_column <= 18:
+                        baseline = baseline_GessGame.GessGame.__new__(baseline_GessGame.GessGame)
+                        baseline._board = [list(row) for row in game._board]
+                        baseline._player_turn = 0 if game.get_player() == 'B' else 1
+                        baseline._game_state = game.get_game_state()
+                        if baseline.make_move(game.get_coordinates(old_row, old_column),
+                                              game.get_coordinates(new_row, new_column)):
+                            moves.add((old_row, old_column, new_row, new_column))
+                        new_row, new_column = new_row + row_step, new_column + column_step
+
+    return moves
+
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_generated_moves_are_every_baseline_move(seed):
+    '''
+    At sampled plies of a random game, generate_moves gives exactly the moves the baseline accepts, none missing.
+    '''
+
+    random_source = random.Random(seed)
+    game = GessGame()
+    sampled = set(random_source.sample(range(40), 6))
+    checked = 0
+
+    for ply, position in enumerate(play_random_moves(game, 40, random_source)):
+        if ply in sampled:
+            assert set(position.generate_moves()) == find_baseline_moves(position), ply
+            checked += 1
+
+    assert checked > 0
+
+
+
+@pytest.mark.parametrize("size", [10, 13, 20])
+def test_undo_move_puts_everything_back(size):
+    '''
+    Making any valid move and taking it back leaves the board, the bitmasks, the rings, the stone counts, the hashes,
+    the history of positions and the last move as they were.
+    '''
+
+    random_source = random.Random(size)
+    game = GessGame(size, repetition_limit=3, max_plies=60)
+
+    for position in play_random_moves(game, 30, random_source):
+        before = get_state(game)
+        for move in game.generate_moves():
+            delta = game.apply_move(move[0], move[1], move[2], move[3])
+            game.undo_move(delta)
+            assert get_state(game) == before, move
+
+
+
+@pytest.mark.parametrize("size", [10, 20, 26])
+def test_pack_and_unpack_give_back_the_game(size):
+    '''
+    A game packed and unpacked has the same position, player, hashes, history of positions and moves.
+    '''
+
+    random_source = random.Random(size)
+    game = GessGame(size, repetition_limit=3, max_plies=200)
+
+    for position in play_random_moves(game, 20, random_source):
+        copy_of_game = unpack_game(game.pack())
+        assert copy_of_game.to_compact() == game.to_compact()
+        assert copy_of_game.get_game_state() == game.get_game_state()
+        assert copy_of_game.get_position_hash() == game.get_position_hash()
+        assert copy_of_game._history == game._history
+        assert list(copy_of_game.generate_move_codes()) == list(game.generate_move_codes())
+        assert copy_of_game.pack() == game.pack()
+
+
+
+@pytest.mark.parametrize("size", [10, 20, 22, 23, 26])
+def test_move_numbers_give_back_the_move(size):
+    '''
+    decode_move turns every move number from encode_move back into the same move, on boards using 16-bit and 32-bit
+    numbers.
+    '''
+
+    random_source = random.Random(size)
+    count = 0
+    while count < 2000:
+        row, column = random_source.randrange(1, size - 1), random_source.randrange(1, size - 1)
+        direction, row_step, column_step = random_source.choice(DIRECTIONS)
+        distance = random_source.randrange(1, size)
+        new_row, new_column = row + row_step * distance, column + column_step * distance
+        if not (1 <= new_row < size - 1 and 1 <= new_column < size - 1):
+            continue
+        count += 1
+        assert decode_move(encode_move(row, column, new_row, new_column, size), size) == (row, column, new_row,
+                                                                                          new_column)
+
+
+
+@pytest.mark.parametrize("size", range(MIN_BOARD_SIZE, len(COLUMN_LETTERS) + 1))
+def test_starting_layout_is_the_same_for_both_colors(size):
+    '''
+    On every size of board, turning the starting position upside down and swapping the colors gives it back, so both
+    players start with the same stones and rings.
+    '''
+
+    game = GessGame(size)
+    board = game._board
+
+    for i in range(size):
+        for j in range(size):
+            assert board[i][j] == SWAPPED_STONES[board[size - 1 - i][j]]
+    assert game.get_stone_count('B') == game.get_stone_count('W')
+    assert len(game.get_rings('B')) == len(game.get_rings('W')) >= 1
+
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_listing_moves_keeps_the_last_move(seed):
+    '''
+    Listing the moves doesn't change the last move or the reason of the last refused move, even when a player's last
+    ring is tried on the board. The 10x10 board starts with one ring each, so that comes up all the time.
+    '''
+
+    random_source = random.Random(seed)
+    game = GessGame(10)
+    game.apply_move(1, 1, 1, 1)                 # refused, so there is a move error to keep
+
+    for position in play_random_moves(game, 40, random_source):
+        last_move = game.get_last_move()
+        move_error = game.get_move_error()
+        game.generate_moves()
+        game.get_legal_moves()
+        assert game.get_last_move() is last_move
+        assert game.get_move_error() == move_error
+
+
+
+@pytest.mark.parametrize("size", [10, 20])
+def test_kept_move_lists_match_a_full_listing(size):
+    '''
+    The move lists get_legal_moves keeps between moves are the same as listing every move again, after moves and
+    after moves taken back.
+    '''
+
+    random_source = random.Random(size)
+    game = GessGame(size)
+
+    for position in play_random_moves(game, 40, random_source):
+        game.get_legal_moves(check=True)
+        moves = game.generate_moves()
+        if moves:
+            move = random_source.choice(moves)
+            delta = game.apply_move(move[0], move[1], move[2], move[3])
+            game.get_legal_moves(check=True)
+            game.undo_move(delta)
+            game.get_legal_moves(check=True)
+
+
+
+@pytest.mark.parametrize("size", [10, 20])
+def test_capture_moves_are_the_moves_that_capture(size):
+    '''
+    generate_capture_codes lists exactly the valid moves that land on an opponent's stone or on the center of one of
+    the opponent's rings, and get_capture_counts counts the stones each takes.
+    '''
+
+    random_source = random.Random(size)
+    game = GessGame(size)
+
+    for position in play_random_moves(game, 40, random_source):
+        opponent = 'W' if game.get_player() == 'B' else 'B'
+        rings = game.get_rings(opponent)
+        expected = {}
+        for code in game.generate_move_codes():
+            old_row, old_column, new_row, new_column = decode_move(code, size)
+            taken = sum(game._board[new_row + i][new_column + j] == opponent for i in (-1, 0, 1) for j in (-1, 0, 1))
+            if taken or any(abs(i - new_row) <= 1 and abs(j - new_column) <= 1 for i, j in rings):
+                expected[code] = taken
+
+        captures = game.generate_capture_codes()
+        assert dict(zip(captures, game.get_capture_counts(captures))) == expected
+
+
+
+@pytest.mark.parametrize("size", [10, 20])
+def test_kept_attack_maps_match_fresh_ones(size):
+    '''
+    The attack maps kept between moves, and worked out again only around the blocks a move changed, are the same as
+    the attack maps of a copy of the game worked out from scratch, after moves and after moves taken back.
+    '''
+
+    random_source = random.Random(size)
+    game = GessGame(size)
+
+    def check():
+        fresh = game.clone()
+        for player in ('B', 'W'):
+            assert game.get_attack_map(player) == fresh.get_attack_map(player)
+            assert game.get_threatened_rings(player) == fresh.get_threatened_rings(player)
+
+    for position in play_random_moves(game, 40, random_source):
+        check()
+        moves = game.generate_moves()
+        for move in random_source.sample(moves, min(len(moves), 5)):
+            delta = game.apply_move(move[0], move[1], move[2], move[3])
+            check()
+            game.undo_move(delta)
+            check()
+
+
+
+def turn_position(game, symmetry):
+    '''
+    Returns a new game with the position of the game seen through the symmetry, built from its board by hand:
+    mirrored by reading each row backwards, and color flipped by turning the board upside down, swapping the stones
+    and giving the turn to the other player.
+    '''
+
+    size = game.get_size()
+    rows = [''.join(row) for row in game._board]
+    turn = game._player_turn
+    if symmetry & MIRROR:
+        rows = [row[::-1] for row in rows]
+    if symmetry & COLOR_FLIP:
+        rows = [''.join(SWAPPED_STONES[stone] for stone in row) for row in reversed(rows)]
+        turn += 1
+
+    compact_rows = GessGame(size, rows).to_compact().split(':')[3]
+
+    return load_compact(':'.join((str(size), 'w' if turn % 2 else 'b', str(turn), compact_rows)))
+
+
+
+def without_turn(compact):
+    '''
+    Returns a compact position without its player turn counter, which isn't part of the position.
+    '''
+
+    size, player, turn, rows = compact.split(':')
+
+    return size, player, rows
+
+
+
+@pytest.mark.parametrize("size", [10, 20])
+def test_symmetric_positions_share_a_canonical_hash(size):
+    '''
+    A position, its mirror image and its color flip (worked out from scratch) have the hashes the game kept for each
+    symmetry while it was played, the same canonical hash and canonical compact position, and the same moves turned
+    by transform_move.
+    '''
+
+    random_source = random.Random(size)
+    game = GessGame(size)
+
+    for position in play_random_moves(game, 30, random_source):
+        canonical = game.get_canonical_hash()[0]
+        moves = game.generate_moves()
+        for symmetry in SYMMETRIES:
+            turned = turn_position(game, symmetry)
+            assert turned.get_position_hash() == game._hashes[symmetry]
+            assert turned.get_canonical_hash()[0] == canonical
+            assert without_turn(turned.to_canonical_compact()[0]) == without_turn(game.to_canonical_compact()[0])
+            assert set(turned.generate_moves()) == {transform_move(move, symmetry, size) for move in moves}
@@ -0,0 +1,102 @@
+# Description: These are the tests of the archive importer in GessImport.py: valid games are written to the store
+# and read back, and every kind of bad game (a refused move, a bad board size, too many moves) is reported as a
+# rejection without stopping the import. Archives imported one after another into the same store keep their own
+# game numbers.
+
+import json
+
+from GessGame import GessGame
+from GessImport import (INVALID_SIZE, MAX_MOVES, TOO_MANY_MOVES, UNREADABLE_MOVE, check_game, import_archive,
+                        read_last_game_number, read_store)
+
+
+
+def write_game(size, count):
+    '''
+    Returns the text of a game of count moves on a board of the given size (the first valid move each time), and
+    the moves.
+    '''
+
+    game = GessGame(size)
+    moves = []
+    for number in range(count):
+        move = game.generate_moves()[0]
+        game.apply_move(move[0], move[1], move[2], move[3])
+        moves.append(move)
+
+    text = ' '.join(game.get_coordinates(move[0], move[1]) + ' ' + game.get_coordinates(move[2], move[3])
+                    for move in moves)
+
+    return text, moves
+
+
+
+def test_check_game_gives_a_reason_for_each_bad_game():
+    '''
+    A valid game gives a record, and each bad game gives a rejection with the move that failed and its reason.
+    '''
+
+    text, moves = write_game(20, 4)
+    assert check_game(1, text)[2] is None
+
+    assert check_game(2, "j6 g9 j6")[2]["reason"] == UNREADABLE_MOVE
+    assert check_game(3, "j6 j7")[2]["reason"] == "WRONG_DIRECTION"
+    assert check_game(4, text, "x")[2]["reason"] == INVALID_SIZE
+    assert check_game(5, text, 9)[2]["reason"] == INVALID_SIZE
+    assert check_game(6, text, 27)[2]["reason"] == INVALID_SIZE
+
+    rejection = check_game(7, "j6 g9 " * (MAX_MOVES + 1))[2]
+    assert rejection["reason"] == TOO_MANY_MOVES
+    assert rejection["move_number"] == MAX_MOVES + 1
+
+
+
+def test_bad_size_lines_only_reject_their_games(tmp_path):
+    '''
+    The games after a size line that isn't a board size are rejected, and the import goes on with the games after
+    the next good size line, which are read back from the store as they were written.
+    '''
+
+    small, small_moves = write_game(14, 3)
+    usual, usual_moves = write_game(20, 5)
+    archive = tmp_path / "games.txt"
+    archive.write_text('\n'.join(["size fourteen", small, "size 8", small, "# a comment", "size 14", small,
+                                  "size 20", usual]) + '\n')
+
+    rejects = (tmp_path / "rejected.jsonl").open('w')
+    summary = import_archive(str(archive), str(tmp_path / "games.bin"), rejects, workers=2, chunk_size=1)
+    rejects.close()
+
+    assert summary == {"accepted": 2, "rejected": 2, "reasons": {INVALID_SIZE: 2}}
+    rejections = [json.loads(line) for line in (tmp_path / "rejected.jsonl").read_text().splitlines()]
+    assert [(rejection["game"], rejection["line"], rejection["size"]) for rejection in rejections] == [
+        (2, 2, "fourteen"), (4, 4, 8)]
+
+    stored = list(read_store(str(tmp_path / "games.bin")))
+    assert [(game_number, size, moves) for game_number, size, state, moves in stored] == [
+        (7, 14, small_moves), (9, 20, usual_moves)]
+
+
+
+def test_second_archive_continues_the_numbers(tmp_path):
+    '''
+    Importing a second archive into the same store numbers its games after the ones already there, so every game in
+    the store has its own number.
+    '''
+
+    text, moves = write_game(20, 3)
+    archive = tmp_path / "games.txt"
+    archive.write_text(text + '\n' + text + '\n')
+    store_path = str(tmp_path / "games.bin")
+
+    import_archive(str(archive), store_path, workers=1)
+    rejects = (tmp_path / "rejected.jsonl").open('w')
+    archive.write_text(text + '\n' + "j6 j7" + '\n' + text + '\n')
+    summary = import_archive(str(archive), store_path, rejects, workers=1)
+    rejects.close()
+
+    assert summary["accepted"] == 2
+    assert [game_number for game_number, size, state, moves in read_store(store_path)] == [1, 2, 3, 5]
+    assert read_last_game_number(store_path) == 5
+    rejection = json.loads((tmp_path / "rejected.jsonl").read_text())
+    assert (rejection["game"], rejection["line"]) == (4, 2)
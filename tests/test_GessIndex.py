@@ -0,0 +1,91 @@
+# Description: These are the tests of the position index in GessIndex.py: every position of every indexed game is
+# found with its game and move numbers, from several segments, after they are merged into one, and after the index
+# is opened again.
+
+import os
+import random
+
+from GessGame import GessGame
+from GessIndex import PositionIndex
+
+
+
+def play_game(game_number, count, seed):
+    '''
+    Returns a (game_number, size, moves) tuple of up to count random moves.
+    '''
+
+    random_source = random.Random(seed)
+    game = GessGame()
+    moves = []
+    for number in range(count):
+        legal = game.generate_moves()
+        if not legal or game.get_game_state() != "UNFINISHED":
+            break
+        move = random_source.choice(legal)
+        game.apply_trusted_move(move[0], move[1], move[2], move[3])
+        moves.append(move)
+
+    return game_number, 20, moves
+
+
+
+def find_positions(games):
+    '''
+    Returns, for every position the games reach after a move, its hash and the sorted (game_number, move_number) of
+    every time one of the games reached it.
+    '''
+
+    positions = {}
+    for game_number, size, moves in games:
+        game = GessGame(size)
+        for move_number, move in enumerate(moves, 1):
+            game.apply_move(move[0], move[1], move[2], move[3])
+            positions.setdefault(game.get_position_hash(), []).append((game_number, move_number))
+
+    return {position_hash: sorted(found) for position_hash, found in positions.items()}
+
+
+
+def check_index(index, positions):
+    '''
+    Checks that the index finds every position with exactly its postings, and nothing for a position it never saw.
+    '''
+
+    for position_hash, found in positions.items():
+        assert index.find(position_hash) == found
+    assert index.find(GessGame().get_position_hash()) == []
+
+
+
+def test_positions_are_found_before_and_after_a_merge(tmp_path):
+    '''
+    Games added in two batches (one of them twice, under far apart numbers, so positions are shared and the numbers
+    take several bytes) are found from both segments, from the merged segment and from the index opened again.
+    '''
+
+    first = [play_game(1, 30, 1), play_game(2, 30, 2)]
+    second = [play_game(300, 30, 3), play_game(100000, 30, 1)]
+    positions = find_positions(first + second)
+    directory = str(tmp_path / "index")
+
+    index = PositionIndex(directory)
+    assert index.add_games(first) == len(find_positions(first))
+    index.add_games(second)
+    assert len(os.listdir(directory)) == 2
+    check_index(index, positions)
+    first_position = next(iter(find_positions([first[0]])))        # game 100000 replays game 1
+    assert index.find(first_position) == [(1, 1), (100000, 1)]
+
+    index.merge()
+    assert len(os.listdir(directory)) == 1
+    check_index(index, positions)
+    index.close()
+
+    index = PositionIndex(directory)
+    check_index(index, positions)
+    game = GessGame()
+    move = first[1][2][0]
+    game.apply_move(move[0], move[1], move[2], move[3])
+    assert index.find_game(game) == [(2, 1)]
+    index.close()
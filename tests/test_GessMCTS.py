@@ -0,0 +1,139 @@
+# Description: These are the tests of the Monte Carlo search in GessMCTS.py, which only run when numpy is installed:
+# the evaluation queue scores positions in batches and never holds one longer than max_wait, a virtual loss sends the
+# next thread down another path and is taken back afterwards, a saved network loads back the same, and a search
+# leaves the caller's game as it was, with none of its rows shared.
+
+import time
+
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+from GessExport import decode_packed
+from GessGame import GessGame
+from GessMCTS import EvaluationQueue, MonteCarloSearch, Node, load_mlp, material_evaluator, random_mlp
+
+
+
+def play_moves(count):
+    '''
+    Returns the games after each of the first count moves of a game (the first valid move each time).
+    '''
+
+    game = GessGame()
+    games = []
+    for number in range(count):
+        move = game.generate_moves()[0]
+        game.apply_move(move[0], move[1], move[2], move[3])
+        games.append(game.clone())
+
+    return games
+
+
+
+def test_waiting_positions_are_scored_together():
+    '''
+    Positions already waiting when the evaluator thread starts are scored batch_size at a time, and each one gets
+    its own value.
+    '''
+
+    sizes = []
+
+    def evaluator(planes):
+        sizes.append(len(planes))
+        return material_evaluator(planes)
+
+    games = play_moves(10)
+    evaluations = EvaluationQueue(evaluator, batch_size=4, max_wait=1)
+    futures = [evaluations.submit(game) for game in games]
+    with evaluations:
+        values = [future.result(timeout=5) for future in futures]
+
+    assert sizes == [4, 4, 2]
+    assert evaluations.get_average_batch() == 10 / 3
+    expected = material_evaluator(decode_packed([game.pack() for game in games])[0])
+    assert values == pytest.approx(expected.tolist())
+
+
+
+def test_lone_position_waits_at_most_max_wait():
+    '''
+    A position with no others coming is scored once it has waited max_wait seconds, not when a batch would be full.
+    '''
+
+    with EvaluationQueue(material_evaluator, batch_size=100, max_wait=0.05) as evaluations:
+        started = time.perf_counter()
+        evaluations.submit(GessGame()).result(timeout=5)
+        waited = time.perf_counter() - started
+
+    assert 0.05 <= waited < 1
+    assert (evaluations.batches, evaluations.positions) == (1, 1)
+
+
+
+def test_virtual_loss_sends_the_next_playout_elsewhere():
+    '''
+    The better child is chosen until a playout waiting on it adds a virtual loss, and after a search every virtual
+    loss has been taken back.
+    '''
+
+    with EvaluationQueue(material_evaluator) as evaluations:
+        search = MonteCarloSearch(evaluations)
+
+        parent = Node()
+        parent.visits = 2
+        better, worse = Node(1), Node(2)
+        better.visits, better.value_sum = 1, 1.0
+        worse.visits, worse.value_sum = 1, 0.5
+        parent.children = [better, worse]
+        assert search.select_child(parent) is better
+
+        parent.virtual_loss = better.virtual_loss = 1
+        assert search.select_child(parent) is worse
+
+        search.search(GessGame(), playouts=60)
+
+    nodes = [search._root]
+    while nodes:
+        node = nodes.pop()
+        assert node.virtual_loss == 0
+        nodes.extend(node.children or ())
+    assert search._root.visits == 60
+
+
+
+def test_saved_network_loads_back_the_same(tmp_path):
+    '''
+    A network saved with MLPEvaluator.save gives the same values when it is loaded with load_mlp, and a file with no
+    layers is refused.
+    '''
+
+    network = random_mlp(size=20, hidden=(8, 4), seed=1)
+    network.save(str(tmp_path / "weights.npz"))
+    loaded = load_mlp(str(tmp_path / "weights.npz"))
+
+    planes = decode_packed([game.pack() for game in play_moves(5)])[0]
+    assert len(loaded.layers) == 3
+    assert (loaded(planes) == network(planes)).all()
+
+    numpy.savez(str(tmp_path / "empty.npz"), bias_0=numpy.zeros(1))
+    with pytest.raises(ValueError):
+        load_mlp(str(tmp_path / "empty.npz"))
+
+
+
+def test_search_leaves_the_game_unshared():
+    '''
+    A search with several threads gives a valid move and leaves the caller's game as it was, owning all its rows.
+    '''
+
+    game = play_moves(2)[-1]
+    compact = game.to_compact()
+
+    with EvaluationQueue(material_evaluator) as evaluations:
+        result = MonteCarloSearch(evaluations, threads=4).search(game, playouts=100)
+
+    assert result.playouts == 100
+    assert result.best_move in game.generate_moves()
+    assert game.to_compact() == compact
+    assert game._shared == set()
@@ -0,0 +1,72 @@
+# Description: These are the tests of the game pager in GessPaging.py: a game paged out and read back is the same
+# game, the game used the longest ago is the one paged out, and a game read back keeps its copy on disk until it is
+# paged out again.
+
+import pytest
+
+from GessGame import GessGame
+from GessPaging import GamePager, measure_bytes_per_game
+
+
+
+def test_paged_out_game_comes_back_the_same(tmp_path):
+    '''
+    A game with moves made in it is paged out when a newer one doesn't fit, and is read back packing the same.
+    Its copy on disk is kept after it is read back.
+    '''
+
+    pager = GamePager(str(tmp_path / "games"), max_resident=2)
+    game = pager.add_game(1)
+    for number in range(4):
+        move = game.generate_moves()[0]
+        assert pager.make_move(1, game.get_coordinates(move[0], move[1]),
+                               game.get_coordinates(move[2], move[3])) is not None
+    packed = game.pack()
+
+    pager.add_game(2)
+    pager.add_game(3)
+    assert list(pager._resident) == [2, 3]
+
+    assert pager.get_game(1).pack() == packed
+    assert list(pager._resident) == [3, 1]
+    assert pager._disk["1"] == packed
+
+    with pytest.raises(KeyError):
+        pager.get_game(4)
+    pager.close()
+
+
+
+def test_game_used_the_longest_ago_is_paged_out(tmp_path):
+    '''
+    Asking for a game or moving in it makes it the newest, so the one left untouched the longest is paged out.
+    '''
+
+    pager = GamePager(str(tmp_path / "games"), max_resident=3)
+    for game_id in range(3):
+        pager.add_game(game_id)
+
+    pager.get_game(0)
+    game = GessGame()                           # the same position as game 1, which stays where it is
+    move = game.generate_moves()[0]
+    assert pager.make_move(1, game.get_coordinates(move[0], move[1]),
+                           game.get_coordinates(move[2], move[3])) is not None
+    pager.add_game(3)
+    assert list(pager._resident) == [0, 1, 3]
+
+    pager.add_game(4)
+    assert list(pager._resident) == [1, 3, 4]
+    assert pager.get_game(2).pack() == GessGame().pack()
+    assert list(pager._resident) == [3, 4, 2]
+    pager.close()
+
+
+
+def test_packed_game_is_smaller():
+    '''
+    A packed game takes fewer bytes than the same game as a GessGame.
+    '''
+
+    measured = measure_bytes_per_game(count=20, moves=10)
+
+    assert 0 < measured["packed_bytes_per_game"] < measured["live_bytes_per_game"]
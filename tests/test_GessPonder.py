@@ -0,0 +1,62 @@
+# Description: These are the tests of the pondering player in GessPonder.py: when the opponent plays the expected
+# reply, the next search is answered from what the pondering left in the transposition table, and any other reply is
+# counted as a miss.
+
+from GessEngine import GessEngine
+from GessGame import GessGame
+from GessPonder import PonderingPlayer
+
+
+
+def ponder_after_a_move(depth):
+    '''
+    Returns a player who searched the start of a 12x12 game, and the game after the player's move, once a pondering
+    search to the given depth has finished.
+    '''
+
+    player = PonderingPlayer(ponder_depth=depth)
+    game = GessGame(12)
+    move = player.choose_move(game, depth).best_move
+    game.apply_move(move[0], move[1], move[2], move[3])
+
+    player.start_pondering(game)
+    player._thread.join()                       # let the pondering finish its depth instead of cancelling it
+    assert player.stop_pondering().nodes > 0
+
+    return player, game
+
+
+
+def test_ponder_hit_reuses_the_table():
+    '''
+    After the expected reply, the search to the pondered depth takes far fewer positions than the same search with
+    an empty table, and finds a move as good.
+    '''
+
+    player, game = ponder_after_a_move(2)
+    reply = player._line[1]
+    game.apply_move(reply[0], reply[1], reply[2], reply[3])
+
+    result = player.choose_move(game, 2)
+    fresh = GessEngine().search(game, 2)
+
+    assert (player.ponder_hits, player.ponder_misses) == (1, 0)
+    assert result.table_hits > 0
+    assert result.nodes * 4 < fresh.nodes
+    assert result.score == fresh.score
+
+
+
+def test_other_reply_is_a_miss():
+    '''
+    A reply other than the expected one is counted as a miss, and the search still gives a valid move.
+    '''
+
+    player, game = ponder_after_a_move(2)
+    reply = next(move for move in game.generate_moves() if move != player._line[1])
+    game.apply_move(reply[0], reply[1], reply[2], reply[3])
+
+    move = player.choose_move(game, 2).best_move
+
+    assert (player.ponder_hits, player.ponder_misses) == (0, 1)
+    assert game.clone().apply_move(move[0], move[1], move[2], move[3]) is not None
@@ -0,0 +1,71 @@
+# Description: These are the tests of the replayer in GessReplay.py: a replay ends in the same position as the game
+# played with apply_move, and a corrupted move is caught whenever the spot check picks it.
+
+import random
+
+import pytest
+
+from GessGame import GessGame
+from GessReplay import ReplayError, replay, replay_games
+
+
+
+def play_moves(count, seed):
+    '''
+    Returns up to count random valid moves from the start, as string coordinates, and the game after them.
+    '''
+
+    random_source = random.Random(seed)
+    game = GessGame()
+    moves = []
+    for number in range(count):
+        legal = game.generate_moves()
+        if not legal or game.get_game_state() != "UNFINISHED":
+            break
+        move = random_source.choice(legal)
+        moves.append((game.get_coordinates(move[0], move[1]), game.get_coordinates(move[2], move[3])))
+        game.apply_move(move[0], move[1], move[2], move[3])
+
+    return moves, game
+
+
+
+def test_replay_ends_in_the_played_position():
+    '''
+    Replaying the moves, checked or not, gives the position after each move and ends where the game did.
+    '''
+
+    moves, game = play_moves(20, 4)
+
+    positions = list(replay(moves, positions=True))
+    assert len(positions) == len(moves)
+    assert positions[-1] == game.to_compact()
+    assert list(replay(moves, positions=True, spot_check_rate=1.0)) == positions
+
+    number, replayed = next(replay_games([moves]))
+    assert (number, replayed.to_compact()) == (0, game.to_compact())
+
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_spot_check_catches_a_corrupted_move(seed):
+    '''
+    A move that can't be made ("j6 j7" points the wrong way) is reported with its number and reason when every move
+    is checked, and with a sampled check exactly when the draw for its move picks it.
+    '''
+
+    moves, game = play_moves(6, 4)
+    moves = moves[:4] + [('j6', 'j7')]
+
+    with pytest.raises(ReplayError) as caught:
+        list(replay(moves, spot_check_rate=1.0))
+    assert (caught.value.move_number, caught.value.move, caught.value.reason) == (5, ('j6', 'j7'), "WRONG_DIRECTION")
+
+    draws = random.Random(seed)
+    picked = [draws.random() < 0.5 for move in moves][-1]
+    try:
+        list(replay(moves, spot_check_rate=0.5, random_source=random.Random(seed)))
+        reported = False
+    except ReplayError as error:
+        reported = error.move_number == 5
+    assert reported == picked
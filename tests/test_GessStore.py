@@ -0,0 +1,138 @@
+# Description: These are the tests of the SQLite game store in GessStore.py: games come back as they were stored,
+# results included, two stores open on the same database never hand out the same id, and a batch that fails to be
+# written doesn't stop the store from being used.
+
+import sqlite3
+
+import pytest
+
+from GessGame import GessGame
+from GessStore import GameStore
+
+
+
+def play(store, game_id, game, count):
+    '''
+    Makes and stores count valid moves in the game (the first valid move each time).
+    '''
+
+    for number in range(count):
+        move = game.generate_moves()[0]
+        game.apply_move(move[0], move[1], move[2], move[3])
+        store.record_move(game_id, game, move)
+
+
+
+def test_loaded_game_is_the_stored_game(tmp_path):
+    '''
+    A game loads as it was after its last move, from its latest snapshot and the moves after it, and its moves come
+    back in order.
+    '''
+
+    store = GameStore(str(tmp_path / "games.sqlite"), snapshot_interval=5, batch_size=7)
+    game = GessGame()
+    game_id = store.create_game("alice", "bob", game)
+
+    moves = []
+    for number in range(12):
+        move = game.generate_moves()[0]
+        game.apply_move(move[0], move[1], move[2], move[3])
+        assert store.record_move(game_id, game, move) == number + 1
+        moves.append(move)
+
+    assert store.load_game(game_id).to_compact() == game.to_compact()
+    assert store.get_moves(game_id) == moves
+    assert store.find_games(player="alice") == [game_id]
+    assert store.find_games(position_hash=game.get_position_hash()) == [game_id]
+    store.close()
+
+    store = GameStore(str(tmp_path / "games.sqlite"))
+    assert store.load_game(game_id).to_compact() == game.to_compact()
+    with pytest.raises(KeyError):
+        store.load_game(game_id + 1)
+    store.close()
+
+
+
+def test_two_stores_never_share_an_id(tmp_path):
+    '''
+    Games created by two stores open on the same database get different ids, and both stores' moves are kept.
+    '''
+
+    path = str(tmp_path / "games.sqlite")
+    first = GameStore(path)
+    second = GameStore(path)
+
+    first_game, second_game = GessGame(), GessGame()
+    first_id = first.create_game("alice", "bob", first_game)
+    second_id = second.create_game("carol", "dave", second_game)
+    assert first_id != second_id
+
+    play(first, first_id, first_game, 3)
+    play(second, second_id, second_game, 4)
+    first.flush()
+    second.flush()
+
+    assert second.load_game(first_id).to_compact() == first_game.to_compact()
+    assert first.load_game(second_id).to_compact() == second_game.to_compact()
+    first.close()
+    second.close()
+
+
+
+def test_store_recovers_from_a_failed_batch(tmp_path):
+    '''
+    When a batch can't be written (here because another store already wrote the same move numbers of the game), it
+    is rolled back and thrown away, and the store goes on working from what is in the database.
+    '''
+
+    path = str(tmp_path / "games.sqlite")
+    first = GameStore(path)
+    second = GameStore(path)
+
+    game_id = first.create_game("alice", "bob")
+    first_game = first.load_game(game_id)
+    second_game = second.load_game(game_id)
+
+    play(second, game_id, second_game, 1)           # the second store now counts the game's moves itself
+    play(first, game_id, first_game, 2)
+    first.flush()
+
+    with pytest.raises(sqlite3.IntegrityError):
+        second.flush()                              # its move 1 is already in the database
+
+    assert second.load_game(game_id).to_compact() == first_game.to_compact()
+    play(second, game_id, first_game, 1)            # the count is read again, so this is move 3
+    second.flush()
+    assert len(first.get_moves(game_id)) == 3
+    assert first.load_game(game_id).to_compact() == first_game.to_compact()
+    first.close()
+    second.close()
+
+
+
+def test_stored_result_is_kept(tmp_path):
+    '''
+    A result the moves don't reach (here an adjudication) is stored, found by state, and given to the loaded game.
+    '''
+
+    path = str(tmp_path / "games.sqlite")
+    store = GameStore(path)
+    game = GessGame()
+    game_id = store.create_game("alice", "bob", game)
+    play(store, game_id, game, 3)
+
+    game.adjudicate_game("WHITE_WON")
+    store.record_result(game_id, game.get_game_state())
+    store.close()
+
+    store = GameStore(path)
+    loaded = store.load_game(game_id)
+    assert loaded.get_game_state() == "WHITE_WON"
+    assert loaded.to_compact() == game.to_compact()
+    assert store.find_games(state="WHITE_WON") == [game_id]
+    with pytest.raises(KeyError):
+        store.record_result(game_id + 1, "DRAW")
+    with pytest.raises(ValueError):
+        store.record_result(game_id, "UNFINISHED")
+    store.close()
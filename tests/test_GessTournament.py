@@ -0,0 +1,97 @@
+# Description: These are the tests of the tournament runner in GessTournament.py: the SPRT stops once the results
+# are clear, including when every game has the same result, but not after a short lucky run, and the openings and
+# games are played on the size of board the tournament is for.
+
+import pytest
+
+from GessGame import GessGame
+from GessTournament import Tournament, get_log_likelihood_ratio, make_openings, play_game
+
+
+
+def add_games(tournament, scores):
+    '''
+    Adds a game with each of the scores to the tournament, and returns how many were added before the test was
+    decided (all of them if it never was).
+    '''
+
+    sides = {"moves": 1, "nodes": 1, "seconds": 0.01}
+    for number, score in enumerate(scores):
+        tournament.add_result({"score": score, "first": sides, "second": sides})
+        if tournament.get_decision() is not None:
+            return number + 1
+
+    return len(scores)
+
+
+
+def test_every_game_won_is_decided():
+    '''
+    An engine that wins every game is shown to be stronger, instead of the test waiting for a loss or a draw to have
+    any variance.
+    '''
+
+    tournament = Tournament()
+    assert add_games(tournament, [1.0] * 200) < 200
+    assert tournament.get_decision() == "H1"
+
+
+
+@pytest.mark.parametrize("elo1, wins", [(10, 20), (50, 5)])
+def test_short_run_of_wins_is_not_decided(elo1, wins):
+    '''
+    A few wins in a row happen by chance often enough that they don't decide the test, even when elo1 is large.
+    '''
+
+    tournament = Tournament(elo1=elo1)
+    assert add_games(tournament, [1.0] * wins) == wins
+    assert tournament.get_decision() is None
+
+
+
+def test_every_game_lost_or_drawn_is_decided():
+    '''
+    An engine that loses every game, or draws every game, is shown not to be elo1 stronger.
+    '''
+
+    tournament = Tournament()
+    assert add_games(tournament, [0.0] * 200) < 200
+    assert tournament.get_decision() == "H0"
+
+    tournament = Tournament()
+    assert add_games(tournament, [0.5] * 1000) < 1000
+    assert tournament.get_decision() == "H0"
+
+
+
+def test_even_results_keep_playing():
+    '''
+    While the engines win and lose about as often, the ratio stays between the bounds for a while.
+    '''
+
+    tournament = Tournament()
+    assert add_games(tournament, [1.0, 0.0] * 10) == 20
+    assert tournament.get_decision() is None
+    assert get_log_likelihood_ratio(0, 0, 0, 0, 10) == 0
+
+
+
+@pytest.mark.parametrize("size", [12, 20])
+def test_openings_are_played_on_the_board_size(size):
+    '''
+    The openings are valid moves on a board of the tournament's size, and a game from one is played to the end.
+    '''
+
+    openings = make_openings(3, 4, seed=1, size=size)
+    assert len(openings) == 3
+    for opening in openings:
+        game = GessGame(size)
+        for move in opening:
+            assert game.apply_move(move[0], move[1], move[2], move[3]) is not None
+        assert game.get_game_state() == "UNFINISHED"
+
+    engine = {"depth": 1, "quiescence_depth": 0}
+    report = play_game((0, openings[0], engine, engine, True, 12, size))
+    assert report["state"] in ("BLACK_WON", "WHITE_WON", "DRAW")
+    assert report["score"] in (0.0, 0.5, 1.0)
+    assert report["first"]["moves"] + report["second"]["moves"] > 0